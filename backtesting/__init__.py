@@ -1,3 +1,7 @@
 from .backtester import Backtester, Backtest
+from .profiler import BacktestProfiler
+from .market_window import MarketWindow
+from .metrics import PerformanceMetrics
+from .bootstrap import BootstrapIntervals
 from .experiments_manager import ExperimentManager
 from .multi_backtest import MultiBacktest
\ No newline at end of file
@@ -6,14 +6,21 @@ import numpy as np
 import pandas as pd
 import pandera as pa
 from tqdm import tqdm
-from typing import List
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from contextlib import ExitStack
 from pathlib import Path
 
 from data_manager import DataManager
 from strategies import Strategy
 from definitions import Memory, MarketData, PlotMode, Order
-from drawer import BacktestDrawer, IndicatorPlotManager
+from drawer import BacktestDrawer, BatchRenderer, IndicatorPlotManager
 from strategies.strategy import Action, ActionType
+from strategies.signals import StateMachine
+from validation import ValidationPolicy
+from backtesting.profiler import BacktestProfiler
+from backtesting.market_window import MarketWindow
+from backtesting.compiled import CompiledSimulation, ORDER_TYPES
 
 class Backtest(pa.DataFrameModel):
     date: pa.typing.Series[pd.Timestamp] = pa.Field()
@@ -38,49 +45,136 @@ class Backtest(pa.DataFrameModel):
     adjusted_b_balance: pa.typing.Series[np.float64] = pa.Field()
 
 class BacktestProcessor:
+    ORDER_COLUMNS = ['pair', 'type', 'price', 'amount', 'fee', 'total_value', 'balance_a', 'balance_b']
+
     @staticmethod
     def calculate_metrics(
             marketdata: MarketData, 
             memory: Memory, 
             initial_balance_a: float, 
-            initial_balance_b: float
+            initial_balance_b: float,
+            validate: bool = True
         ) -> Backtest:
-        memory_df = pd.DataFrame.from_records([vars(order) for order in memory.orders])
-        df = pd.merge(marketdata, memory_df, left_on='date', right_on='timestamp', how='left')
-        
-        df.loc[0, 'balance_a'] = initial_balance_a
-        df.loc[0, 'balance_b'] = initial_balance_b
-        
-        df = BacktestProcessor._fill_nan_with_bfill_ffill(df, ['balance_a', 'balance_b', 'total_value'])
-        
-        df['hold_value'] = df['balance_a'] * df['close']
-        df['total_value_a'] = df['balance_a'] + df['balance_b'] / df['close']
-        df['total_value_b'] = df['balance_b'] + df['hold_value']
-        df['adjusted_a_balance'] = df['balance_a'] - (df['balance_b'].iloc[0] - df['balance_b']) / df['close']
-        df['adjusted_b_balance'] = df['balance_b'] - (df['balance_a'].iloc[0] - df['balance_a']) * df['close']
-        
-        df = BacktestProcessor._fill_nan_values(df)
-
-        return Backtest(df)
-    
+        order_indices = BacktestProcessor._order_bar_indices(marketdata, memory.orders)
+        matched = order_indices >= 0
+        records = list(zip(*map(attrgetter(*BacktestProcessor.ORDER_COLUMNS), memory.orders))) or [()] * len(BacktestProcessor.ORDER_COLUMNS)
+        orders = {
+            column: np.array(values, dtype=object if column in ('pair', 'type') else np.float64)[matched]
+            for column, values in zip(BacktestProcessor.ORDER_COLUMNS, records)
+        }
+        return BacktestProcessor.calculate_metrics_from_arrays(
+            marketdata=marketdata,
+            order_indices=order_indices[matched],
+            orders=orders,
+            initial_balance_a=initial_balance_a,
+            initial_balance_b=initial_balance_b,
+            validate=validate
+        )
+
+    @staticmethod
+    def calculate_metrics_from_arrays(
+            marketdata: MarketData,
+            order_indices: np.ndarray,
+            orders: Dict[str, np.ndarray],
+            initial_balance_a: float,
+            initial_balance_b: float,
+            validate: bool = True
+        ) -> Backtest:
+        """
+        Build the Backtest frame from the bar index of each order and its columns.
+
+        Produces one row per bar, plus one extra row for every additional order executed
+        on the same bar, so the output matches a left merge of market data and orders.
+        Balances and order values are forward filled with index accumulation instead of
+        per-column pandas fills.
+
+        Args:
+            marketdata: Market data the orders were executed on
+            order_indices: Bar position (0-based) of each order in marketdata
+            orders: Arrays keyed by Order field (see ORDER_COLUMNS)
+            initial_balance_a: Balance of the first coin before the first bar
+            initial_balance_b: Balance of the second coin before the first bar
+            validate: Whether to validate the result against the Backtest schema,
+                subject to the global ValidationPolicy
+
+        Returns:
+            Backtest frame
+        """
+        n_bars = len(marketdata)
+        order_indices = np.asarray(order_indices, dtype=np.int64)
+        sort = np.argsort(order_indices, kind='stable')
+        order_indices = order_indices[sort]
+
+        repeats = np.maximum(np.bincount(order_indices, minlength=n_bars), 1)
+        row_bar = np.repeat(np.arange(n_bars), repeats)
+        first_row = np.cumsum(repeats) - repeats
+        rank = np.arange(len(order_indices)) - np.searchsorted(order_indices, order_indices, side='left')
+        order_rows = first_row[order_indices] + rank
+        n_rows = len(row_bar)
+
+        data = {column: marketdata[column].to_numpy()[row_bar] for column in marketdata.columns}
+        close = data['close']
+
+        def scatter(column: str, default) -> np.ndarray:
+            values = np.array(default, copy=True)
+            values[order_rows] = orders[column][sort]
+            return values
+
+        data['timestamp'] = data['date']
+        data['pair'] = scatter('pair', np.full(n_rows, 'A/B', dtype=object))
+        data['type'] = scatter('type', np.full(n_rows, 'wait', dtype=object))
+        data['price'] = scatter('price', close.astype(np.float64))
+        data['amount'] = scatter('amount', np.zeros(n_rows))
+        data['fee'] = scatter('fee', np.zeros(n_rows))
+
+        has_order = np.zeros(n_rows, dtype=bool)
+        has_order[order_rows] = True
+        total_value = scatter('total_value', np.zeros(n_rows))
+        data['total_value'] = BacktestProcessor._forward_fill(total_value, has_order)
+
+        has_balance = has_order.copy()
+        has_balance[0] = True
+        balance_a = scatter('balance_a', np.zeros(n_rows))
+        balance_b = scatter('balance_b', np.zeros(n_rows))
+        balance_a[0], balance_b[0] = initial_balance_a, initial_balance_b
+        balance_a = BacktestProcessor._forward_fill(balance_a, has_balance)
+        balance_b = BacktestProcessor._forward_fill(balance_b, has_balance)
+        data['balance_a'] = balance_a
+        data['balance_b'] = balance_b
+
+        data['hold_value'] = balance_a * close
+        data['total_value_a'] = balance_a + balance_b / close
+        data['total_value_b'] = balance_b + data['hold_value']
+        data['adjusted_a_balance'] = balance_a - (balance_b[0] - balance_b) / close
+        data['adjusted_b_balance'] = balance_b - (balance_a[0] - balance_a) * close
+
+        df = pd.DataFrame(data)
+        return ValidationPolicy.validate_frame(Backtest, df) if validate else df
+
     @staticmethod
-    def _fill_nan_values(df: pd.DataFrame) -> pd.DataFrame:
-        df['timestamp'] = df['timestamp'].fillna(df['date'])
-        df['pair'] = df['pair'].fillna('A/B')
-        df['type'] = df['type'].fillna('wait')
-        df['price'] = df['price'].fillna(df['close'])
-        df['amount'] = df['amount'].fillna(0)
-        df['fee'] = df['fee'].fillna(0)
-        return df
+    def _order_bar_indices(marketdata: MarketData, orders: List[Order]) -> np.ndarray:
+        """Position of the bar matching each order timestamp, -1 when there is none."""
+        if not orders:
+            return np.empty(0, dtype=np.int64)
+        dates = pd.DatetimeIndex(marketdata['date'])
+        timestamps = pd.DatetimeIndex([order.timestamp for order in orders])
+        if not dates.is_monotonic_increasing:
+            return dates.get_indexer(timestamps).astype(np.int64)
+        positions = dates.searchsorted(timestamps)
+        found = positions < len(dates)
+        found[found] = dates[positions[found]] == timestamps[found]
+        return np.where(found, positions, -1).astype(np.int64)
 
     @staticmethod
-    def _fill_nan_with_bfill_ffill(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
-        for column in columns:
-            df[column] = df[column].ffill()
-            first_valid_index = df[column].first_valid_index()
-            if first_valid_index is not None:
-                df[column] = df[column].fillna(df[column].iloc[first_valid_index])
-        return df
+    def _forward_fill(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+        """Forward fill values at invalid positions; leading ones take the first valid value."""
+        if not valid.any():
+            return values
+        last_valid = np.maximum.accumulate(np.where(valid, np.arange(len(values)), 0))
+        filled = values[last_valid]
+        first_valid = np.argmax(valid)
+        filled[:first_valid] = values[first_valid]
+        return filled
 
 class Backtester:
     def __init__(
@@ -90,8 +184,23 @@ class Backtester:
         initial_balance_b: float,
         fee: float = 0.001,
         verbose: bool = False,
+        validate: bool = True,
+        profile: bool = False,
+        window_size: Optional[int] = None,
+        skip_idle_bars: bool = False,
+        compiled: bool = False,
     ):
+        """
+        Args:
+            window_size: Bars of history passed to the strategy on every bar, which is also the
+                warm-up skipped at the start. Defaults to strategy.required_lookback.
+            skip_idle_bars: Only evaluate the strategy on the bars of its signal_mask, where it
+                can place an order; WAIT actions of the other bars are not recorded.
+            compiled: Simulate strategies that define a state_machine with CompiledSimulation
+                (numba when installed); others run bar by bar.
+        """
         self.strategy = strategy
+        self.window_size = window_size or strategy.required_lookback
         self.fee = np.float64(fee)
         self.initial_balance_a = initial_balance_a
         self.initial_balance_b = initial_balance_b
@@ -104,6 +213,12 @@ class Backtester:
         self.marketdata_metadata = None
         self.result: pd.DataFrame = None
         self.verbose = verbose
+        self.validate = validate
+        self.profile = profile
+        self.skip_idle_bars = skip_idle_bars
+        self.compiled = compiled
+        self.profiler: Optional[BacktestProfiler] = None
+        self._columns: Dict[str, np.ndarray] = {}
         self.indicator_plot_manager = IndicatorPlotManager()
 
     def run_backtest(
@@ -117,12 +232,16 @@ class Backtester:
             },
     ) -> Backtest:
         self.marketdata, self.marketdata_metadata = DataManager.get_marketdata_sample(**data_config)
-        self._simulate_real_time_execution()
+        if self.profile:
+            self._profile_real_time_execution()
+        else:
+            self._simulate_real_time_execution()
         self.result = BacktestProcessor.calculate_metrics(
             marketdata=self.marketdata,
             memory=self.memory,
             initial_balance_a=self.initial_balance_a,
-            initial_balance_b=self.initial_balance_b
+            initial_balance_b=self.initial_balance_b,
+            validate=self.validate
         )
         return self.result
     
@@ -134,36 +253,44 @@ class Backtester:
                 'show': False
             }
         ):
+        function, kwargs = self.plot_job(plot_config)
+        if kwargs.get('show', True):
+            function(**kwargs)
+        else:
+            # Saved figures are rendered like batched ones, and closed afterwards
+            BatchRenderer.render([(function, kwargs)], max_workers=1)
+
+    def plot_job(self, plot_config: dict) -> Tuple[Callable, Dict[str, Any]]:
+        """
+        BacktestDrawer job for the last backtest, to render it along other figures with
+        BatchRenderer.render. plot_config is passed to BacktestDrawer.draw.
+        """
         indicators = self.strategy.calculate_indicators(self.marketdata)
         extra_plots_price = self.indicator_plot_manager.create_price_plots(self.marketdata, indicators)
         extra_plot = self.indicator_plot_manager.create_technical_plots(self.marketdata, indicators)
-        
-        BacktestDrawer.draw(
-            df=self.result,
-            extra_plots_price=extra_plots_price,
-            extra_plot=extra_plot,
+        return BacktestDrawer.draw, {
+            'df': self.result,
+            'extra_plots_price': extra_plots_price,
+            'extra_plot': extra_plot,
             **plot_config
-        )
+        }
 
     def _execute_strategy(self, data: MarketData):
         actions = self.strategy.run(data, self.memory)
-        
+        self._record_actions(actions, data['date'].iloc[-1])
+
+    def _record_actions(self, actions: List[Action], timestamp: pd.Timestamp):
         for action in actions:
             if action.action_type is not None and action.price is not None:
                 total_value = action.price * action.amount
                 fee = action.amount * self.fee if action.action_type == ActionType.BUY_MARKET else total_value * self.fee if action.action_type == ActionType.SELL_MARKET else np.float64(0)
-                timestamp = data['date'].iloc[-1]
                 pair = 'A/B'
 
-                if action.action_type == ActionType.BUY_MARKET:
-                    self.memory.balance_a += action.amount * (1-self.fee)
-                    self.memory.balance_b = np.float64(0) if abs(self.memory.balance_b - total_value) < 1e-8 else self.memory.balance_b - total_value
-                elif action.action_type == ActionType.SELL_MARKET:
-                    self.memory.balance_a = np.float64(0) if abs(self.memory.balance_a - action.amount) < 1e-8 else self.memory.balance_a - action.amount
-                    self.memory.balance_b += total_value * (1-self.fee)
+                self._update_balances(action, total_value)
 
                 self.memory.orders.append(
-                    Order(
+                    ValidationPolicy.build_model(
+                        Order,
                         timestamp=timestamp,
                         pair=pair,
                         type=action.action_type.value,
@@ -175,10 +302,133 @@ class Backtester:
                         balance_b=self.memory.balance_b
                     )
                 )
+
+    def _update_balances(self, action: Action, total_value: np.float64):
+        if action.action_type == ActionType.BUY_MARKET:
+            self.memory.balance_a += action.amount * (1-self.fee)
+            self.memory.balance_b = np.float64(0) if abs(self.memory.balance_b - total_value) < 1e-8 else self.memory.balance_b - total_value
+        elif action.action_type == ActionType.SELL_MARKET:
+            self.memory.balance_a = np.float64(0) if abs(self.memory.balance_a - action.amount) < 1e-8 else self.memory.balance_a - action.amount
+            self.memory.balance_b += total_value * (1-self.fee)
     
-    def _simulate_real_time_execution(self, window_size: int = 200) -> List[Action]:
+    def _simulate_real_time_execution(self, window_size: Optional[int] = None) -> List[Action]:
+        window_size = window_size or self.window_size
+        self._columns = MarketWindow.extract_columns(self.marketdata)
+        if self.compiled:
+            self._check_lookback(window_size)
+            machine = self.strategy.state_machine(self.marketdata, window_size)
+            if machine is not None:
+                return self._simulate_compiled(window_size, machine)
+        if self.skip_idle_bars:
+            return self._simulate_signal_bars(window_size)
         iterator = tqdm(range(window_size, len(self.marketdata))) if self.verbose else range(window_size, len(self.marketdata))
         for i in iterator:
-            window_data = self.marketdata.iloc[i-window_size:i]
-            self._execute_strategy(window_data)
+            self._step(i, window_size)
+        return self.memory
+
+    def _simulate_signal_bars(self, window_size: int) -> Memory:
+        """
+        Run the strategy only on the bars of its signal mask and fast-forward its state over the rest.
+
+        Step i evaluates the window ending at bar i - 1, so bars window_size - 1 to len - 2 are
+        covered, as in the regular loop. Skipped bars where the strategy would have waited get
+        their WAIT order, so the orders and the Backtest frame match the regular loop.
+        """
+        self._check_lookback(window_size)
+        first, end = window_size - 1, len(self.marketdata) - 1
+        mask = self.strategy.signal_mask(self.marketdata, window_size)
+        rows = range(first, end) if mask is None else (np.flatnonzero(mask[first:end]) + first).tolist()
+        start = first
+        for row in (tqdm(rows) if self.verbose else rows):
+            if row > start:
+                self._skip(start, row, window_size)
+            self._step(row + 1, window_size)
+            start = row + 1
+        if end > start:
+            self._skip(start, end, window_size)
+        return self.memory
+
+    def _skip(self, start: int, stop: int, window_size: int):
+        close, dates = self._columns['close'], self.marketdata['date']
+        for row in self.strategy.wait_bars(self.marketdata, start, stop):
+            wait = ValidationPolicy.build_model(Action, action_type=ActionType.WAIT, price=close[row], amount=np.float64(0))
+            self._record_actions([wait], dates.iloc[row])
+        self.strategy.skip_bars(self.marketdata, start, stop, window_size)
+
+    def _simulate_compiled(self, window_size: int, machine: StateMachine) -> Memory:
+        """Simulate the bars of the regular loop with CompiledSimulation and record its orders."""
+        first, end = window_size - 1, len(self.marketdata) - 1
+        accumulation, distribution = machine.counters
+        orders, balance_a, balance_b, accumulation_length, distribution_length = CompiledSimulation.run(
+            machine,
+            close=self.marketdata['close'].to_numpy(),
+            first=first,
+            end=end,
+            balance_a=self.memory.balance_a,
+            balance_b=self.memory.balance_b,
+            fee=self.fee,
+            accumulation_length=getattr(self.strategy, accumulation),
+            distribution_length=getattr(self.strategy, distribution)
+        )
+        timestamps = self.marketdata['date'].iloc[orders['row']]
+        prices = self.marketdata['close'].to_numpy()[orders['row']]
+        for j, timestamp in enumerate(timestamps):
+            self.memory.orders.append(
+                ValidationPolicy.build_model(
+                    Order,
+                    timestamp=timestamp,
+                    pair='A/B',
+                    type=ORDER_TYPES[orders['type'][j]],
+                    price=prices[j],
+                    amount=orders['amount'][j],
+                    fee=orders['fee'][j],
+                    total_value=orders['total_value'][j],
+                    balance_a=orders['balance_a'][j],
+                    balance_b=orders['balance_b'][j]
+                )
+            )
+        self.memory.balance_a, self.memory.balance_b = balance_a, balance_b
+        setattr(self.strategy, accumulation, accumulation_length)
+        setattr(self.strategy, distribution, distribution_length)
+        if end > first:
+            self.strategy.skip_bars(self.marketdata, first, end, window_size)
+        return self.memory
+
+    def _check_lookback(self, window_size: int):
+        if window_size < self.strategy.required_lookback:
+            raise ValueError(
+                f"Precomputed signals need a window of at least {self.strategy.required_lookback} bars, got {window_size}"
+            )
+
+    def _step(self, i: int, window_size: int):
+        self._execute_strategy(self._window(i, window_size))
+
+    def _window(self, i: int, window_size: int) -> MarketData:
+        return MarketWindow(self._columns, self.marketdata.index, i-window_size, i)
+
+    def _profile_real_time_execution(self, window_size: Optional[int] = None) -> Memory:
+        """
+        Run the simulation with every phase of the bar loop timed by a BacktestProfiler.
+
+        The hooks are installed only for this run, so regular backtests are not slowed down.
+        The profiler is kept in self.profiler for its report and collapsed-stack trace.
+        """
+        self.profiler = BacktestProfiler(root=type(self.strategy).__name__)
+        hooks = [
+            (self, '_step', 'bar'),
+            (self, '_window', 'slice'),
+            (self, '_execute_strategy', 'execute'),
+            (self, '_update_balances', 'memory'),
+            (self.strategy, 'run', 'strategy.run'),
+            (self.strategy, 'calculate_indicators', 'indicators'),
+            (self.strategy, 'calculate_latest_indicators', 'indicators'),
+            (ValidationPolicy, 'build_model', lambda model_cls, *args, **kwargs: f"model.{model_cls.__name__}"),
+        ]
+        with ExitStack() as stack:
+            for target, attribute, name in hooks:
+                stack.enter_context(self.profiler.instrument(target, attribute, name))
+            self._simulate_real_time_execution(window_size)
+        self.profiler.bars = self.profiler.calls.get('bar', 0)
+        if self.verbose:
+            print(self.profiler.summary())
         return self.memory
@@ -0,0 +1,112 @@
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+class BootstrapIntervals:
+    """
+    Batched percentile bootstrap intervals for the results frame of MultiBacktest.
+
+    Instead of running one t-interval per metric, every group with the same number of tests is
+    stacked into a matrix and resampled at once: a (n_resamples x n) matrix of multinomial
+    counts turns the bootstrap means of all groups and value columns into a single matrix
+    product. Results are cached by frame content, so repeated summaries and plots of the same
+    experiment do not resample again.
+    """
+    VALUE_COLUMNS = ('Absolute Change', 'Percentage Change')
+    MAX_CACHE_SIZE = 256
+
+    _cache: 'OrderedDict[Tuple, pd.DataFrame]' = OrderedDict()
+
+    @classmethod
+    def calculate(
+        cls,
+        df: pd.DataFrame,
+        interval_type: str = 'Confidence',
+        confidence: float = 0.95,
+        n_resamples: int = 2000,
+        random_state: Optional[int] = 0,
+        group_columns: Sequence[str] = ('Metric',),
+        value_columns: Sequence[str] = VALUE_COLUMNS
+    ) -> pd.DataFrame:
+        """
+        Compute percentile intervals for every group of the results frame.
+
+        Args:
+            df: Results frame with one row per test and metric
+            interval_type: 'Confidence' for intervals of the mean, 'Prediction' for the
+                interval a single new test is expected to fall in
+            confidence: Confidence level of the intervals
+            n_resamples: Number of bootstrap resamples
+            random_state: Seed for the resampling matrix
+            group_columns: Columns identifying a group (e.g. Metric, or Strategy and Metric)
+            value_columns: Columns to compute intervals for
+
+        Returns:
+            DataFrame with the group columns and '<Prefix> Lower/Upper <interval_type>' columns,
+            where the prefix is the first word of the value column ('Absolute', 'Percentage')
+        """
+        if interval_type not in ('Confidence', 'Prediction'):
+            raise ValueError(f"Unknown interval type: {interval_type}")
+
+        group_columns, value_columns = list(group_columns), list(value_columns)
+        key = (
+            interval_type, confidence, n_resamples, random_state,
+            tuple(group_columns), tuple(value_columns),
+            int(pd.util.hash_pandas_object(df[group_columns + value_columns], index=False).sum())
+        )
+        if key in cls._cache:
+            cls._cache.move_to_end(key)
+            return cls._cache[key].copy()
+
+        intervals = cls._calculate(df, interval_type, confidence, n_resamples, random_state, group_columns, value_columns)
+
+        cls._cache[key] = intervals
+        if len(cls._cache) > cls.MAX_CACHE_SIZE:
+            cls._cache.popitem(last=False)
+        return intervals.copy()
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        cls._cache.clear()
+
+    @staticmethod
+    def _calculate(
+        df: pd.DataFrame,
+        interval_type: str,
+        confidence: float,
+        n_resamples: int,
+        random_state: Optional[int],
+        group_columns: List[str],
+        value_columns: List[str]
+    ) -> pd.DataFrame:
+        rng = np.random.default_rng(random_state)
+        alpha = (1 - confidence) / 2
+        quantiles = [alpha, 1 - alpha]
+
+        keys, samples = [], []
+        for name, group in df.groupby(group_columns, sort=False)[value_columns]:
+            keys.append(name if len(group_columns) > 1 else name[0])
+            samples.append(group.to_numpy(dtype=np.float64).T)  # (columns, n) per group
+        sizes = np.array([sample.shape[1] for sample in samples])
+
+        bounds = np.full((len(samples), len(value_columns), 2), np.nan)
+        for size in np.unique(sizes):
+            members = np.flatnonzero(sizes == size)
+            stacked = np.stack([samples[i] for i in members])  # (groups, columns, n)
+            if interval_type == 'Prediction':
+                bounds[members] = np.moveaxis(np.nanquantile(stacked, quantiles, axis=-1), 0, -1)
+                continue
+            # Each row of counts is one resample: how many times every test is drawn
+            counts = rng.multinomial(size, np.full(size, 1 / size), size=n_resamples).astype(np.float64)
+            means = stacked @ counts.T / size  # (groups, columns, resamples)
+            bounds[members] = np.moveaxis(np.quantile(means, quantiles, axis=-1), 0, -1)
+
+        index = pd.MultiIndex.from_tuples(keys, names=group_columns) if len(group_columns) > 1 else pd.Index(keys, name=group_columns[0])
+        result = pd.DataFrame(index=index)
+        for column_index, column in enumerate(value_columns):
+            prefix = column.split(' ')[0]
+            result[f'{prefix} Lower {interval_type}'] = bounds[:, column_index, 0]
+            result[f'{prefix} Upper {interval_type}'] = bounds[:, column_index, 1]
+        return result.reset_index()
@@ -0,0 +1,142 @@
+from typing import Dict, Tuple
+
+import numpy as np
+
+from strategies.signals import StateMachine
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Run the kernel as plain Python when numba is not installed."""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+WAIT, BUY_MARKET, SELL_MARKET = 0, 1, 2
+# Plain globals, which numba freezes as compile-time constants
+SELL, BUY = StateMachine.SELL, StateMachine.BUY
+NEUTRAL, ACCUMULATION = StateMachine.NEUTRAL, StateMachine.ACCUMULATION
+ORDER_TYPES = {WAIT: 'wait', BUY_MARKET: 'buy_market', SELL_MARKET: 'sell_market'}
+
+class CompiledSimulation:
+    """
+    Bar loop of the Backtester for a StateMachine, compiled with numba when it is installed.
+
+    The kernel follows the strategies' run (order size, can_buy/can_sell, counters) and
+    Backtester._execute_strategy (fees, balances, order records) operation by operation in
+    float64, so its orders and balances are identical to the Python path. Without numba the
+    same kernel runs in the interpreter, which still avoids building models per bar.
+    """
+
+    @staticmethod
+    def run(
+            machine: StateMachine,
+            close: np.ndarray,
+            first: int,
+            end: int,
+            balance_a: float,
+            balance_b: float,
+            fee: float,
+            accumulation_length: int,
+            distribution_length: int
+        ) -> Tuple[Dict[str, np.ndarray], float, float, int, int]:
+        """
+        Simulate the bars first to end - 1.
+
+        Returns:
+            Order arrays keyed by 'row', 'type' (see ORDER_TYPES), 'amount', 'fee', 'total_value',
+            'balance_a' and 'balance_b'; the final balances and the final accumulation and
+            distribution counters
+        """
+        result = _simulate(
+            np.ascontiguousarray(machine.signal, dtype=np.int8),
+            np.ascontiguousarray(machine.phase, dtype=np.int8),
+            np.ascontiguousarray(close, dtype=np.float64),
+            first, end,
+            np.float64(balance_a), np.float64(balance_b), np.float64(fee),
+            np.float64(machine.max_duration), np.float64(machine.safety_margin), np.float64(machine.min_purchase),
+            accumulation_length, distribution_length
+        )
+        rows, types, amounts, fees, total_values, balances_a, balances_b, count = result[:8]
+        orders = {
+            'row': rows[:count], 'type': types[:count], 'amount': amounts[:count], 'fee': fees[:count],
+            'total_value': total_values[:count], 'balance_a': balances_a[:count], 'balance_b': balances_b[:count]
+        }
+        balance_a, balance_b, accumulation_length, distribution_length = result[8:]
+        return orders, np.float64(balance_a), np.float64(balance_b), int(accumulation_length), int(distribution_length)
+
+
+@njit(cache=True)
+def _simulate(signal, phase, close, first, end, balance_a, balance_b, fee, max_duration, safety_margin, min_purchase,
+              accumulation_length, distribution_length):
+    size = max(end - first, 0)
+    rows = np.empty(size, dtype=np.int64)
+    types = np.empty(size, dtype=np.int8)
+    amounts = np.empty(size)
+    fees = np.empty(size)
+    total_values = np.empty(size)
+    balances_a = np.empty(size)
+    balances_b = np.empty(size)
+    count = 0
+    for row in range(first, end):
+        price = close[row]
+        bar_phase = phase[row]
+        order_type = -1
+        amount = 0.0
+        if bar_phase == NEUTRAL:
+            order_type = WAIT
+        else:
+            if bar_phase == ACCUMULATION:
+                amount = balance_b / (max_duration * safety_margin * price)
+            else:
+                amount = balance_a / (max_duration * safety_margin)
+            if min_purchase / price > amount:
+                amount = min_purchase / price
+
+            can_sell = balance_a > amount
+            can_buy = balance_b > amount * price
+            if bar_phase == ACCUMULATION:
+                can_sell = can_sell and accumulation_length > 0
+            else:
+                can_buy = can_buy and distribution_length > 0
+
+            if signal[row] == SELL and can_sell:
+                order_type = SELL_MARKET
+                if bar_phase == ACCUMULATION:
+                    accumulation_length -= 1
+                else:
+                    distribution_length += 1
+            elif signal[row] == BUY and can_buy:
+                order_type = BUY_MARKET
+                if bar_phase == ACCUMULATION:
+                    accumulation_length += 1
+                else:
+                    distribution_length -= 1
+
+        if order_type < 0:
+            continue
+        total_value = price * amount
+        order_fee = 0.0
+        if order_type == BUY_MARKET:
+            order_fee = amount * fee
+            balance_a += amount * (1 - fee)
+            balance_b = 0.0 if abs(balance_b - total_value) < 1e-8 else balance_b - total_value
+        elif order_type == SELL_MARKET:
+            order_fee = total_value * fee
+            balance_a = 0.0 if abs(balance_a - amount) < 1e-8 else balance_a - amount
+            balance_b += total_value * (1 - fee)
+
+        rows[count] = row
+        types[count] = order_type
+        amounts[count] = amount
+        fees[count] = order_fee
+        total_values[count] = total_value
+        balances_a[count] = balance_a
+        balances_b[count] = balance_b
+        count += 1
+    return (rows, types, amounts, fees, total_values, balances_a, balances_b, count,
+            balance_a, balance_b, accumulation_length, distribution_length)
@@ -11,7 +11,8 @@ import matplotlib.pyplot as plt
 
 from backtesting.multi_backtest import MultiBacktest
 from backtesting.backtester import Backtester
-from definitions import PlotMode
+from definitions import PlotMode, PerformanceMetric
+from drawer import BatchRenderer
 
 @dataclass
 class ExperimentResult:
@@ -48,10 +49,15 @@ class ExperimentManager:
         num_tests_per_strategy: int,
         metrics: List[PlotMode],
         save_plots: bool = False,
-        plots_dir: Optional[Path] = None
+        plots_dir: Optional[Path] = None,
+        performance_metrics: Optional[List[PerformanceMetric]] = None,
+        interval_method: str = 't',
+        plot_workers: Optional[int] = None
     ) -> ExperimentResult:
         """
-        Run a single experiment with the given configuration
+        Run a single experiment with the given configuration.
+        interval_method selects 't' (Student t) or 'bootstrap' (percentile) intervals.
+        plot_workers sets the number of processes rendering the saved plots (1 renders inline).
         """
         # Create backtester instance
         backtester = Backtester(strategy=strategy(**strategy_config), **backtester_config)
@@ -63,28 +69,24 @@ class ExperimentManager:
                 num_tests_per_strategy=num_tests_per_strategy,
                 data_config=data_config,
                 metrics=metrics,
+                performance_metrics=performance_metrics,
             )
 
             # Calculate intervals
-            result_df = MultiBacktest.calculate_confidence_interval(result_df)
-            result_df = MultiBacktest.calculate_prediction_interval(result_df)
+            result_df = MultiBacktest.calculate_confidence_interval(result_df, method=interval_method)
+            result_df = MultiBacktest.calculate_prediction_interval(result_df, method=interval_method)
 
             # Save plots if requested
             if save_plots and plots_dir:
                 plots_dir.mkdir(parents=True, exist_ok=True)
                 experiment_name = f"{strategy.__name__}_{len(self.experiments)}"
                 
-                # Save boxplot
-                boxplot_path = plots_dir / f"{experiment_name}_boxplot.png"
-                MultiBacktest.plot_results(result_df, save_path=boxplot_path, show=False)
-                
-                # Save confidence intervals plot
-                ci_path = plots_dir / f"{experiment_name}_confidence_intervals.png"
-                MultiBacktest.plot_intervals(result_df, "Confidence", save_path=ci_path, show=False)
-                
-                # Save prediction intervals plot
-                pi_path = plots_dir / f"{experiment_name}_prediction_intervals.png"
-                MultiBacktest.plot_intervals(result_df, "Prediction", save_path=pi_path, show=False)
+                # Render boxplot and interval plots in parallel Agg workers
+                BatchRenderer.render([
+                    (MultiBacktest.plot_results, {'df': result_df, 'save_path': plots_dir / f"{experiment_name}_boxplot.png"}),
+                    (MultiBacktest.plot_intervals, {'df': result_df, 'interval_type': "Confidence", 'save_path': plots_dir / f"{experiment_name}_confidence_intervals.png"}),
+                    (MultiBacktest.plot_intervals, {'df': result_df, 'interval_type': "Prediction", 'save_path': plots_dir / f"{experiment_name}_prediction_intervals.png"}),
+                ], max_workers=plot_workers)
 
             # Create experiment result
             data_config_copy = data_config.copy()
@@ -224,14 +226,13 @@ class ExperimentManager:
         """
         summaries = []
         for exp in self.experiments:
-            for metric in exp.results_df['Metric'].unique():
-                metric_data = exp.results_df[exp.results_df['Metric'] == metric]
-                
+            for metric, metric_data in exp.results_df.groupby('Metric', sort=False):
                 summary = {
                     'Strategy': exp.strategy_name,
                     'Metric': metric,
                     'Mean Absolute Change': metric_data['Absolute Change'].mean(),
                     'Mean Percentage Change': metric_data['Percentage Change'].mean(),
+                    'Mean Value': metric_data['Value'].mean() if 'Value' in metric_data.columns else None,
                     'Failed Tests': exp.failed_tests,
                     'Total Tests': exp.num_tests_per_strategy,
                     'Success Rate': 1 - (exp.failed_tests / exp.num_tests_per_strategy)
@@ -239,7 +240,7 @@ class ExperimentManager:
                 
                 # Add confidence intervals
                 for interval_type in ['Confidence', 'Prediction']:
-                    for change_type in ['Absolute', 'Percentage']:
+                    for change_type in ['Absolute', 'Percentage', 'Value']:
                         lower_col = f'{change_type} Lower {interval_type}'
                         upper_col = f'{change_type} Upper {interval_type}'
                         if lower_col in metric_data.columns and upper_col in metric_data.columns:
@@ -0,0 +1,168 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from definitions import MarketData
+
+class WindowColumn:
+    """
+    One column of a MarketWindow: a NumPy view with the parts of the pandas Series API
+    strategies use per bar.
+
+    iloc, to_numpy, values and len work on the view directly. Any other Series attribute or
+    operator (rolling, diff, arithmetic...) builds the Series once and delegates to it.
+    """
+    __slots__ = ('name', '_values', '_window', '_series')
+
+    def __init__(self, name: str, values: np.ndarray, window: 'MarketWindow') -> None:
+        self.name = name
+        self._values = values
+        self._window = window
+        self._series: Optional[pd.Series] = None
+
+    @property
+    def iloc(self) -> '_PositionalIndexer':
+        return _PositionalIndexer(self)
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    @property
+    def index(self) -> pd.Index:
+        return self._window.index
+
+    def to_numpy(self, dtype: Any = None, copy: bool = False) -> np.ndarray:
+        values = self._values if dtype is None else self._values.astype(dtype, copy=False)
+        return values.copy() if copy and values is self._values else values
+
+    def to_series(self) -> pd.Series:
+        """The column as a pandas Series sharing the window's data and index."""
+        if self._series is None:
+            self._series = pd.Series(self._values, index=self.index, name=self.name, copy=False)
+        return self._series
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self.to_series())
+
+    def __array__(self, dtype: Any = None, copy: Any = None) -> np.ndarray:
+        return self._values if dtype is None else self._values.astype(dtype, copy=False)
+
+    def __getitem__(self, key):
+        return self.to_series()[key]
+
+    def __getattr__(self, attribute: str):
+        if attribute.startswith('_'):
+            raise AttributeError(attribute)
+        return getattr(self.to_series(), attribute)
+
+    def __repr__(self) -> str:
+        return repr(self.to_series())
+
+    __hash__ = None
+
+def _delegate(name: str):
+    def method(self, *args):
+        args = [arg.to_series() if isinstance(arg, WindowColumn) else arg for arg in args]
+        return getattr(self.to_series(), name)(*args)
+    method.__name__ = name
+    return method
+
+for _name in (
+        '__add__', '__radd__', '__sub__', '__rsub__', '__mul__', '__rmul__', '__truediv__',
+        '__rtruediv__', '__floordiv__', '__pow__', '__neg__', '__abs__',
+        '__lt__', '__le__', '__gt__', '__ge__', '__eq__', '__ne__'):
+    setattr(WindowColumn, _name, _delegate(_name))
+
+class _PositionalIndexer:
+    """iloc of a WindowColumn: integers return scalars boxed like pandas, anything else goes to the Series."""
+    __slots__ = ('_column',)
+
+    def __init__(self, column: WindowColumn) -> None:
+        self._column = column
+
+    def __getitem__(self, key):
+        column = self._column
+        value = column._values[key]
+        if isinstance(value, np.ndarray):
+            return column.to_series().iloc[key]
+        if isinstance(value, np.datetime64):
+            return pd.Timestamp(value)
+        return value
+
+class MarketWindow:
+    """
+    Read-only window of market data backed by NumPy slices of columns extracted once.
+
+    Backtester passes one of these to strategy.run instead of marketdata.iloc[start:stop], which
+    avoids building a DataFrame (index, blocks) on every bar. Column access returns a
+    WindowColumn supporting the usual data['close'].iloc[-1] and data['close'].to_numpy()
+    patterns. Everything else falls back to an equivalent DataFrame built on first use.
+    """
+    __slots__ = ('_columns', '_source_index', '_start', '_stop', '_index', '_frame')
+
+    def __init__(self, columns: Dict[str, np.ndarray], source_index: pd.Index, start: int, stop: int) -> None:
+        """
+        Args:
+            columns: Full-length arrays of every market data column (see extract_columns)
+            source_index: Index of the full market data
+            start: First row of the window
+            stop: Row after the last one in the window
+        """
+        self._columns = columns
+        self._source_index = source_index
+        self._start = start
+        self._stop = stop
+        self._index: Optional[pd.Index] = None
+        self._frame: Optional[pd.DataFrame] = None
+
+    @staticmethod
+    def extract_columns(marketdata: MarketData) -> Dict[str, np.ndarray]:
+        """Extract every column of the market data to a NumPy array, once per backtest."""
+        return {column: marketdata[column].to_numpy() for column in marketdata.columns}
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    @property
+    def index(self) -> pd.Index:
+        if self._index is None:
+            self._index = self._source_index[self._start:self._stop]
+        return self._index
+
+    @property
+    def empty(self) -> bool:
+        return self._stop <= self._start
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._columns
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return WindowColumn(key, self._columns[key][self._start:self._stop], self)
+        return self.to_frame()[key]
+
+    def to_frame(self) -> pd.DataFrame:
+        """The window as a DataFrame, equal to marketdata.iloc[start:stop]."""
+        if self._frame is None:
+            self._frame = pd.DataFrame(
+                {column: values[self._start:self._stop] for column, values in self._columns.items()},
+                index=self.index
+            )
+        return self._frame
+
+    def __getattr__(self, attribute: str):
+        if attribute.startswith('_'):
+            raise AttributeError(attribute)
+        return getattr(self.to_frame(), attribute)
+
+    def __repr__(self) -> str:
+        return repr(self.to_frame())
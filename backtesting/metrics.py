@@ -0,0 +1,169 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from definitions import PerformanceMetric
+
+MINUTES_PER_YEAR = 365.25 * 24 * 60
+
+class PerformanceMetrics:
+    """
+    Vectorized performance metrics computed directly from the arrays of a Backtest frame.
+
+    All metrics use the total value in the second coin (total_value_b) as the equity curve,
+    so they can be computed for every test of a sweep and fed to the interval calculations
+    in MultiBacktest.
+    """
+
+    @staticmethod
+    def calculate(df: pd.DataFrame, periods_per_year: Optional[float] = None) -> Dict[PerformanceMetric, float]:
+        """
+        Compute every PerformanceMetric for a backtest result.
+
+        Args:
+            df: Backtest frame
+            periods_per_year: Bars per year used to annualize; inferred from the dates if None
+
+        Returns:
+            Dictionary mapping each PerformanceMetric to its value
+        """
+        equity = df['total_value_b'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        if periods_per_year is None:
+            periods_per_year = PerformanceMetrics._infer_periods_per_year(df['date'])
+
+        returns = PerformanceMetrics._returns(equity)
+        max_drawdown, max_drawdown_duration = PerformanceMetrics._drawdown(equity)
+        total_return = equity[-1] / equity[0] - 1 if equity[0] > 0 else 0.0
+        with np.errstate(over='ignore'):
+            annualized_return = np.expm1(np.log1p(total_return) * periods_per_year / max(len(equity) - 1, 1)) if total_return > -1 else -1.0
+
+        types = df['type'].to_numpy()
+        is_buy = types == 'buy_market'
+        is_sell = types == 'sell_market'
+        is_trade = is_buy | is_sell
+        price = df['price'].to_numpy(dtype=np.float64)
+        fee = df['fee'].to_numpy(dtype=np.float64)
+        total_value = df['total_value'].to_numpy(dtype=np.float64)
+
+        # Buy fees are charged in the first coin, sell fees in the second one
+        fees_b = np.sum(fee[is_buy] * price[is_buy]) + np.sum(fee[is_sell])
+        mean_equity = np.mean(equity)
+        trade_pnl = PerformanceMetrics._trade_pnl(
+            is_buy[is_trade], price[is_trade], df['amount'].to_numpy(dtype=np.float64)[is_trade],
+            fee[is_trade], total_value[is_trade], df['balance_a'].iloc[0], close[0]
+        )
+
+        return {
+            PerformanceMetric.TOTAL_RETURN: total_return,
+            PerformanceMetric.SHARPE_RATIO: PerformanceMetrics._sharpe(returns, periods_per_year),
+            PerformanceMetric.SORTINO_RATIO: PerformanceMetrics._sortino(returns, periods_per_year),
+            PerformanceMetric.MAX_DRAWDOWN: max_drawdown,
+            PerformanceMetric.MAX_DRAWDOWN_DURATION: max_drawdown_duration,
+            PerformanceMetric.CALMAR_RATIO: float(annualized_return / max_drawdown) if max_drawdown > 0 else 0.0,
+            PerformanceMetric.TURNOVER: np.sum(total_value[is_trade]) / mean_equity if mean_equity > 0 else 0.0,
+            PerformanceMetric.FEE_DRAG: fees_b / equity[0] if equity[0] > 0 else 0.0,
+            PerformanceMetric.EXPOSURE: PerformanceMetrics._exposure(df['hold_value'].to_numpy(dtype=np.float64), equity),
+            PerformanceMetric.NUM_TRADES: float(np.count_nonzero(is_trade)),
+            PerformanceMetric.WIN_RATE: float(np.mean(trade_pnl > 0)) if len(trade_pnl) else 0.0,
+            PerformanceMetric.TRADE_PNL: float(np.sum(trade_pnl)),
+            PerformanceMetric.MEAN_TRADE_PNL: float(np.mean(trade_pnl)) if len(trade_pnl) else 0.0,
+        }
+
+    @staticmethod
+    def _infer_periods_per_year(dates: pd.Series) -> float:
+        if len(dates) < 2:
+            return MINUTES_PER_YEAR
+        bar_seconds = np.median(np.diff(dates.to_numpy().astype('datetime64[s]').astype(np.int64)))
+        return MINUTES_PER_YEAR * 60 / bar_seconds if bar_seconds > 0 else MINUTES_PER_YEAR
+
+    @staticmethod
+    def _returns(equity: np.ndarray) -> np.ndarray:
+        previous = equity[:-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.where(previous > 0, np.diff(equity) / previous, 0.0)
+        return returns
+
+    @staticmethod
+    def _sharpe(returns: np.ndarray, periods_per_year: float) -> float:
+        if len(returns) < 2:
+            return 0.0
+        std = np.std(returns, ddof=1)
+        return float(np.mean(returns) / std * np.sqrt(periods_per_year)) if std > 0 else 0.0
+
+    @staticmethod
+    def _sortino(returns: np.ndarray, periods_per_year: float) -> float:
+        if len(returns) < 2:
+            return 0.0
+        downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2))
+        return float(np.mean(returns) / downside * np.sqrt(periods_per_year)) if downside > 0 else 0.0
+
+    @staticmethod
+    def _drawdown(equity: np.ndarray) -> Tuple[float, float]:
+        """Maximum drawdown as a fraction of the peak, and longest time under water in bars."""
+        peak = np.maximum.accumulate(equity)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdown = np.where(peak > 0, 1 - equity / peak, 0.0)
+        underwater = equity < peak
+        positions = np.arange(len(equity))
+        last_peak = np.maximum.accumulate(np.where(underwater, 0, positions))
+        duration = np.where(underwater, positions - last_peak, 0)
+        return float(np.max(drawdown)), float(np.max(duration))
+
+    @staticmethod
+    def _exposure(hold_value: np.ndarray, equity: np.ndarray) -> float:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            exposure = np.where(equity > 0, hold_value / equity, 0.0)
+        return float(np.mean(exposure))
+
+    @staticmethod
+    def _trade_pnl(
+            is_buy: np.ndarray,
+            price: np.ndarray,
+            amount: np.ndarray,
+            fee: np.ndarray,
+            total_value: np.ndarray,
+            initial_balance_a: float,
+            initial_price: float
+        ) -> np.ndarray:
+        """
+        Realized PnL (in the second coin) of every sell, with the sold units matched to the
+        bought ones first in, first out.
+
+        Holdings present before the first bar are a first lot valued at the first close price.
+        A sell larger than the position only sells the position. Positions are a cumulative sum
+        floored at zero, and the cost of the units of every sell is read from the cumulative
+        cost of the lots at its range of sold units (searchsorted), so there is no loop.
+        """
+        # Units bought net of the fee (paid in the first coin) and units asked to sell
+        bought = np.where(is_buy, amount - fee, 0.0)
+        change = np.where(is_buy, bought, -amount)
+
+        # Position floored at zero: the cumulative sum minus its running minimum below zero
+        unfloored = initial_balance_a + np.cumsum(change)
+        position = unfloored - np.minimum(np.minimum.accumulate(unfloored), 0.0)
+        previous = np.concatenate(([initial_balance_a], position[:-1]))
+        sold = np.where(is_buy, 0.0, previous - position)
+
+        # Lots in order, with their edges on the cumulative bought units and cumulative cost
+        lot_units = np.concatenate(([initial_balance_a], bought[is_buy]))
+        lot_cost = np.concatenate(([initial_balance_a * initial_price], total_value[is_buy]))
+        edges = np.concatenate(([0.0], np.cumsum(lot_units)))
+        costs = np.concatenate(([0.0], np.cumsum(lot_cost)))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            unit_cost = np.where(lot_units > 0, lot_cost / lot_units, 0.0)
+
+        def cost_of_first(units: np.ndarray) -> np.ndarray:
+            lot = np.clip(np.searchsorted(edges, units, side='right') - 1, 0, len(lot_units) - 1)
+            return costs[lot] + (units - edges[lot]) * unit_cost[lot]
+
+        sold_until = np.cumsum(sold)
+        sold_before = np.concatenate(([0.0], sold_until[:-1]))
+        sold_cost = cost_of_first(sold_until) - cost_of_first(sold_before)
+        is_sell = ~is_buy
+        return total_value[is_sell] - fee[is_sell] - sold_cost[is_sell]
@@ -13,15 +13,20 @@ from typing import Optional, List
 import matplotlib.pyplot as plt
 
 from backtesting import Backtester, Backtest
-from definitions import PlotMode
+from backtesting.metrics import PerformanceMetrics
+from backtesting.bootstrap import BootstrapIntervals
+from definitions import PlotMode, PerformanceMetric
 
 class MultiBacktest:
+    VALUE_COLUMNS = ('Absolute Change', 'Percentage Change', 'Value')
+
     @staticmethod
     def run_multiple_backtests(
         backtester: Backtester = None,
         num_tests_per_strategy = 10,
         data_config: dict = None,
         metrics: List[PlotMode] = None,
+        performance_metrics: Optional[List[PerformanceMetric]] = None,
     ) -> pd.DataFrame:
 
         results = []
@@ -29,13 +34,12 @@ class MultiBacktest:
         with ProcessPoolExecutor() as executor:
             futures = []
             for i in range(num_tests_per_strategy):
-                future = executor.submit(backtester.run_backtest, data_config)
+                future = executor.submit(MultiBacktest._run_single_test, backtester, data_config, metrics, performance_metrics)
                 futures.append((i, future))
 
             for i, future in tqdm(futures, total=num_tests_per_strategy, desc=f"Running {num_tests_per_strategy} tests", leave=False):
                 try:
-                    df: Backtest = future.result()
-                    metric_change = MultiBacktest._calculate_metric_change(df, metrics)
+                    metric_change = future.result()
                     results.append((metric_change, data_config.get('variation')))
                 except Exception as e:
                     failed_tests += 1
@@ -54,12 +58,13 @@ class MultiBacktest:
 
     @staticmethod
     def plot_results(df: pd.DataFrame, save_path: Optional[Path] = None, show: bool = True):
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 16))
+        change_types = [column for column in ['Percentage Change', 'Absolute Change', 'Value'] if column in df.columns and df[column].notna().any()]
+        fig, axes = plt.subplots(len(change_types), 1, figsize=(12, 8 * len(change_types)), squeeze=False)
 
-        for ax, change_type in zip([ax1, ax2], ['Percentage Change', 'Absolute Change']):
-            # Prepare data for boxplot
-            metrics = df['Metric'].unique()
-            data = [df[df['Metric'] == metric][change_type] for metric in metrics]
+        for ax, change_type in zip(axes[:, 0], change_types):
+            # Prepare data for boxplot, skipping the metrics without values of this type
+            metrics = df.loc[df[change_type].notna(), 'Metric'].unique()
+            data = [df[df['Metric'] == metric][change_type].dropna() for metric in metrics]
 
             # Create horizontal boxplot
             bp = ax.boxplot(data, vert=False, patch_artist=True, labels=metrics)
@@ -69,7 +74,7 @@ class MultiBacktest:
                 box.set(facecolor='lightblue', alpha=0.7)
 
             # Calculate the range of x values
-            all_values = df[change_type].values
+            all_values = df[change_type].dropna().values
             x_min, x_max = min(all_values), max(all_values)
             x_range = x_max - x_min
 
@@ -118,65 +123,81 @@ class MultiBacktest:
             plt.close(fig)
 
     @staticmethod
-    def calculate_confidence_interval(df, confidence=0.95):
+    def calculate_confidence_interval(df, confidence=0.95, method='t'):
+        value_columns = MultiBacktest._value_columns(df)
+        if method == 'bootstrap':
+            intervals_df = BootstrapIntervals.calculate(df, 'Confidence', confidence, value_columns=value_columns)
+            return df.merge(intervals_df, on='Metric', how='left')
+
         intervals = []
         for metric in df['Metric'].unique():
-            # Calculate confidence intervals for Absolute Change
-            abs_data = df.loc[df['Metric'] == metric, 'Absolute Change']
-            abs_mean = abs_data.mean()
-            abs_std_err = abs_data.sem()
-            abs_n = len(abs_data)
-            abs_lower, abs_upper = stats.t.interval(confidence, df=abs_n-1, loc=abs_mean, scale=abs_std_err)
-            
-            # Calculate confidence intervals for Percentage Change
-            pct_data = df.loc[df['Metric'] == metric, 'Percentage Change']
-            pct_mean = pct_data.mean()
-            pct_std_err = pct_data.sem()
-            pct_n = len(pct_data)
-            pct_lower, pct_upper = stats.t.interval(confidence, df=pct_n-1, loc=pct_mean, scale=pct_std_err)
-            
-            intervals.append({
-                'Metric': metric,
-                'Absolute Lower Confidence': abs_lower,
-                'Absolute Upper Confidence': abs_upper,
-                'Percentage Lower Confidence': pct_lower,
-                'Percentage Upper Confidence': pct_upper
-            })
+            interval = {'Metric': metric}
+            for column in value_columns:
+                data = df.loc[df['Metric'] == metric, column].dropna()
+                prefix = column.split(' ')[0]
+                interval[f'{prefix} Lower Confidence'], interval[f'{prefix} Upper Confidence'] = \
+                    MultiBacktest._t_interval(data, confidence, data.sem())
+            intervals.append(interval)
 
         intervals_df = pd.DataFrame(intervals)
         return df.merge(intervals_df, on='Metric', how='left')
 
     @staticmethod
-    def calculate_prediction_interval(df, confidence=0.95):
+    def calculate_prediction_interval(df, confidence=0.95, method='t'):
+        value_columns = MultiBacktest._value_columns(df)
+        if method == 'bootstrap':
+            intervals_df = BootstrapIntervals.calculate(df, 'Prediction', confidence, value_columns=value_columns)
+            return df.merge(intervals_df, on='Metric', how='left')
+
         intervals = []
         for metric in df['Metric'].unique():
-            # Calculate prediction intervals for Absolute Change
-            abs_data = df.loc[df['Metric'] == metric, 'Absolute Change']
-            abs_mean = abs_data.mean()
-            abs_std = abs_data.std(ddof=1)
-            abs_n = len(abs_data)
-            abs_scale = abs_std * math.sqrt(1 + 1/abs_n)
-            abs_lower, abs_upper = stats.t.interval(confidence, df=abs_n-1, loc=abs_mean, scale=abs_scale)
-            
-            # Calculate prediction intervals for Percentage Change
-            pct_data = df.loc[df['Metric'] == metric, 'Percentage Change']
-            pct_mean = pct_data.mean()
-            pct_std = pct_data.std(ddof=1)
-            pct_n = len(pct_data)
-            pct_scale = pct_std * math.sqrt(1 + 1/pct_n)
-            pct_lower, pct_upper = stats.t.interval(confidence, df=pct_n-1, loc=pct_mean, scale=pct_scale)
-            
-            intervals.append({
-                'Metric': metric,
-                'Absolute Lower Prediction': abs_lower,
-                'Absolute Upper Prediction': abs_upper,
-                'Percentage Lower Prediction': pct_lower,
-                'Percentage Upper Prediction': pct_upper
-            })
+            interval = {'Metric': metric}
+            for column in value_columns:
+                data = df.loc[df['Metric'] == metric, column].dropna()
+                prefix = column.split(' ')[0]
+                scale = data.std(ddof=1) * math.sqrt(1 + 1/len(data)) if len(data) else np.nan
+                interval[f'{prefix} Lower Prediction'], interval[f'{prefix} Upper Prediction'] = \
+                    MultiBacktest._t_interval(data, confidence, scale)
+            intervals.append(interval)
 
         intervals_df = pd.DataFrame(intervals)
         return df.merge(intervals_df, on='Metric', how='left')
 
+    @staticmethod
+    def _value_columns(df: pd.DataFrame) -> List[str]:
+        return [column for column in MultiBacktest.VALUE_COLUMNS if column in df.columns]
+
+    @staticmethod
+    def _t_interval(data: pd.Series, confidence: float, scale: float):
+        # Change metrics have no 'Value' and performance metrics no change, so a column can be empty
+        if data.empty:
+            return np.nan, np.nan
+        return stats.t.interval(confidence, df=len(data)-1, loc=data.mean(), scale=scale)
+
+    @staticmethod
+    def _run_single_test(
+            backtester: Backtester,
+            data_config: dict,
+            metrics: List[PlotMode],
+            performance_metrics: Optional[List[PerformanceMetric]] = None
+        ):
+        # Runs in the worker process so only the metric values are sent back, not the whole frame
+        df: Backtest = backtester.run_backtest(data_config)
+        results = MultiBacktest._calculate_metric_change(df, metrics or [])
+        if performance_metrics:
+            results.update(MultiBacktest._calculate_performance_metrics(df, performance_metrics))
+        return results
+
+    @staticmethod
+    def _calculate_performance_metrics(
+            df: Backtest,
+            performance_metrics: List[PerformanceMetric]
+        ):
+        # Performance metrics have no initial value to compare against, so they are kept as a
+        # plain value instead of an absolute and percentage change
+        values = PerformanceMetrics.calculate(df)
+        return {metric: {'value': values[metric]} for metric in performance_metrics}
+
     @staticmethod
     def _calculate_metric_change(
             df: Backtest,
@@ -199,8 +220,9 @@ class MultiBacktest:
             for metric, values in metrics.items():
                 df_data.append({
                     'Metric': metric.value,
-                    'Absolute Change': values['absolute'],
-                    'Percentage Change': values['percentage'],
+                    'Absolute Change': values.get('absolute', np.nan),
+                    'Percentage Change': values.get('percentage', np.nan),
+                    'Value': values.get('value', np.nan),
                     'Price Variation': price_variation,
                     'Tests Per Strategy': num_tests_per_strategy,
                     'Strategy': strategy_name
@@ -211,15 +233,17 @@ class MultiBacktest:
     @staticmethod
     def plot_intervals(df: pd.DataFrame, interval_type: str, save_path: Optional[Path] = None, show: bool = True):
         # Create figure with more height and use constrained_layout
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 18), constrained_layout=True)
-        
-        metrics = df['Metric'].unique()
-        y_pos = range(len(metrics))
+        change_types = [change_type for change_type in ['Percentage', 'Absolute', 'Value'] if f'{change_type} Lower {interval_type}' in df.columns]
+        fig, axes = plt.subplots(len(change_types), 1, figsize=(12, 9 * len(change_types)), constrained_layout=True, squeeze=False)
 
-        for idx, (ax, change_type) in enumerate(zip([ax1, ax2], ['Percentage', 'Absolute'])):
+        for idx, (ax, change_type) in enumerate(zip(axes[:, 0], change_types)):
             # Get the appropriate column names for this change type
             lower_col = f'{change_type} Lower {interval_type}'
             upper_col = f'{change_type} Upper {interval_type}'
+
+            # Only the metrics with an interval of this type get a row
+            metrics = df.loc[df[lower_col].notna(), 'Metric'].unique()
+            y_pos = range(len(metrics))
             
             # Get all values for setting axis limits
             all_values = df[[lower_col, upper_col]].values.flatten()
@@ -0,0 +1,133 @@
+from time import perf_counter
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Union
+
+import pandas as pd
+
+PhaseName = Union[str, Callable[..., str]]
+
+_MISSING = object()
+
+class BacktestProfiler:
+    """
+    Opt-in per-phase profiler for the backtest loop.
+
+    Phases are timed with phase() or by instrumenting a method for the duration of a run, so
+    the regular loop carries no profiling code. Phases nest: each call is recorded under its
+    full stack (e.g. bar;execute;strategy.run;indicators), which gives cumulative and self time
+    per phase for the report, and the self times in the collapsed-stack format read by
+    flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, root: str = 'backtest') -> None:
+        """
+        Args:
+            root: Name of the outermost frame of every stack (e.g. the strategy name)
+        """
+        self.root = root
+        self.bars = 0
+        self.total_time = 0.0
+        self.self_times: Dict[Tuple[str, ...], float] = {}
+        self.cumulative: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        # Frames of the phases in progress: [name, start, time spent in children]
+        self._stack: List[List[Any]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a call of a phase."""
+        frame = [name, perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - frame[1]
+            path = (self.root, *(f[0] for f in self._stack))
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][2] += elapsed
+            else:
+                self.total_time += elapsed
+            self.self_times[path] = self.self_times.get(path, 0.0) + elapsed - frame[2]
+            # Recursive calls are only counted once in the cumulative time
+            if name not in (f[0] for f in self._stack):
+                self.cumulative[name] = self.cumulative.get(name, 0.0) + elapsed
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def wrap(self, func: Callable, name: PhaseName) -> Callable:
+        """
+        Wrap a callable so every call is timed as a phase.
+
+        Args:
+            func: Callable to wrap
+            name: Phase name, or a function of the call arguments returning it
+        """
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.phase(name(*args, **kwargs) if callable(name) else name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    @contextmanager
+    def instrument(self, target: Any, attribute: str, name: PhaseName) -> Iterator[None]:
+        """
+        Time the calls to a method of an object or class while the context is active.
+
+        Args:
+            target: Instance or class owning the method
+            attribute: Name of the method
+            name: Phase name, or a function of the call arguments returning it
+        """
+        saved = vars(target).get(attribute, _MISSING)
+        wrapped = self.wrap(getattr(target, attribute), name)
+        setattr(target, attribute, staticmethod(wrapped) if isinstance(target, type) else wrapped)
+        try:
+            yield
+        finally:
+            if saved is _MISSING:
+                delattr(target, attribute)
+            else:
+                setattr(target, attribute, saved)
+
+    def report(self) -> pd.DataFrame:
+        """
+        Timings of every phase, slowest first.
+
+        Returns:
+            DataFrame indexed by phase with the calls, calls per bar, cumulative and self
+            time in seconds, microseconds per bar and share of the profiled time
+        """
+        self_total: Dict[str, float] = {}
+        for path, seconds in self.self_times.items():
+            self_total[path[-1]] = self_total.get(path[-1], 0.0) + seconds
+        bars = max(self.bars, 1)
+        report = pd.DataFrame({
+            'calls': pd.Series(self.calls, dtype='int64'),
+            'calls_per_bar': pd.Series(self.calls, dtype='float64') / bars,
+            'cumulative_s': pd.Series(self.cumulative, dtype='float64'),
+            'self_s': pd.Series(self_total, dtype='float64'),
+        })
+        report['us_per_bar'] = report['cumulative_s'] / bars * 1e6
+        report['share'] = report['cumulative_s'] / self.total_time if self.total_time else 0.0
+        report.index.name = 'phase'
+        return report.sort_values('cumulative_s', ascending=False)
+
+    def summary(self) -> str:
+        """Report formatted as text, with the number of bars and the total time."""
+        header = f"{self.root}: {self.bars} bars in {self.total_time:.3f}s ({self.total_time / max(self.bars, 1) * 1e6:.1f} us/bar)"
+        return f"{header}\n{self.report().to_string(float_format=lambda value: f'{value:.4g}')}"
+
+    def folded(self) -> str:
+        """Self times in microseconds in the collapsed-stack format, one stack per line."""
+        return "\n".join(
+            f"{';'.join(path)} {round(seconds * 1e6)}"
+            for path, seconds in sorted(self.self_times.items())
+        ) + "\n"
+
+    def write_folded(self, path: Union[str, Path]) -> None:
+        """Write the collapsed-stack trace, e.g. for `flamegraph.pl trace.folded > trace.svg`."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.folded())
@@ -0,0 +1,88 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from indicators import IndicatorKernels
+
+# Pandas implementations the kernels replaced in Indicators, kept here as the reference
+
+def pandas_rolling_std(close: pd.Series, window: int) -> pd.Series:
+    return close.rolling(window=window).std()
+
+def pandas_rsi(close: pd.Series, window: int) -> pd.Series:
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    rs = gain.rolling(window=window).mean() / loss.rolling(window=window).mean().replace(0, np.finfo(float).eps)
+    return 100 - (100 / (1 + rs))
+
+def pandas_wilder_rsi(close: pd.Series, window: int) -> pd.Series:
+    # Wilder's smoothing is an exponential average with alpha = 1 / window
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / window, adjust=False).mean()
+    loss = (-delta).clip(lower=0).ewm(alpha=1 / window, adjust=False).mean()
+    return 100 - (100 / (1 + gain / loss))
+
+def pandas_atr(high: pd.Series, low: pd.Series, close: pd.Series, window: int) -> pd.Series:
+    tr = pd.concat([high - low, abs(high - close.shift()), abs(low - close.shift())], axis=1).max(axis=1)
+    return tr.rolling(window=window).mean()
+
+def best_of(func, repeat: int = 7, number: int = 10) -> float:
+    """Best time of a call in milliseconds."""
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number * 1000
+
+if __name__ == "__main__":
+    n_bars = 43200  # 30 days of 1 minute bars
+    window = 14
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 0.1, n_bars))
+    high = close + rng.uniform(0, 0.2, n_bars)
+    low = close - rng.uniform(0, 0.2, n_bars)
+    series = {name: pd.Series(values) for name, values in (('close', close), ('high', high), ('low', low))}
+
+    cases = {
+        'rolling std': (
+            lambda: pandas_rolling_std(series['close'], window),
+            lambda dtype: IndicatorKernels.rolling_std(close, window, dtype=dtype),
+        ),
+        'rolling std (200)': (
+            lambda: pandas_rolling_std(series['close'], 200),
+            lambda dtype: IndicatorKernels.rolling_std(close, 200, dtype=dtype),
+        ),
+        'rsi': (
+            lambda: pandas_rsi(series['close'], window),
+            lambda dtype: IndicatorKernels.rsi(close, window, dtype=dtype),
+        ),
+        'wilder rsi': (
+            lambda: pandas_wilder_rsi(series['close'], window),
+            lambda dtype: IndicatorKernels.wilder_rsi(close, window, dtype=dtype),
+        ),
+        'true range + atr': (
+            lambda: pandas_atr(series['high'], series['low'], series['close'], window),
+            lambda dtype: IndicatorKernels.atr(high, low, close, window, dtype=dtype),
+        ),
+    }
+
+    rows = []
+    for name, (reference, kernel) in cases.items():
+        expected = reference().to_numpy()
+        valid = ~np.isnan(expected)
+        if name == 'wilder rsi':
+            # The ewm version is seeded with the first change instead of Wilder's mean seed
+            valid[:20 * window] = False
+        row = {'indicator': name, 'pandas_ms': best_of(reference)}
+        for dtype in (np.float64, np.float32):
+            label = np.dtype(dtype).name
+            result = kernel(dtype)
+            row[f'{label}_ms'] = best_of(lambda: kernel(dtype))
+            row[f'{label}_speedup'] = row['pandas_ms'] / row[f'{label}_ms']
+            row[f'{label}_max_abs_diff'] = np.nanmax(np.abs(result[valid] - expected[valid]))
+        rows.append(row)
+
+    print(f"{n_bars} bars, window {window}")
+    print(pd.DataFrame(rows).set_index('indicator').to_string(float_format=lambda value: f'{value:.3g}'))
@@ -0,0 +1,194 @@
+import time
+import logging
+from typing import Dict, List, Optional
+
+import ccxt
+import numpy as np
+import pandas as pd
+
+from latency import LatencyTracker
+from definitions import MarketData
+from exchange_apis import BaseExchangeAPI
+from validation import ValidationPolicy
+
+class BarRingBuffer:
+    """
+    Fixed-size ring buffer of OHLCV bars for a single pair.
+
+    Every bar is written twice, at its ring position and one capacity further, so the latest
+    bars are always contiguous and view() can build a DataFrame on top of the storage without
+    copying. A view is only valid until the next append.
+    """
+    COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+    def __init__(self, capacity: int = 200) -> None:
+        """
+        Args:
+            capacity: Number of bars kept
+        """
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        self.capacity = capacity
+        self.count = 0
+        self._dates = np.zeros(2 * capacity, dtype='datetime64[ns]')
+        self._values = {column: np.zeros(2 * capacity, dtype=np.float64) for column in self.COLUMNS}
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        """Open time of the newest bar in milliseconds, or None if the buffer is empty."""
+        if self.count == 0:
+            return None
+        return int(self._dates[self._end - 1].astype('datetime64[ms]').astype(np.int64))
+
+    @property
+    def _end(self) -> int:
+        return self.count % self.capacity + self.capacity
+
+    def append(self, bars: List[List[float]]) -> int:
+        """
+        Append bars in chronological order, in ccxt format [timestamp_ms, open, high, low, close, volume].
+
+        A bar with the same timestamp as the newest stored one replaces it (it was still
+        forming when it was stored); older bars are ignored.
+
+        Args:
+            bars: Bars to append
+
+        Returns:
+            Number of new bars stored
+        """
+        if not bars:
+            return 0
+        bars = np.asarray(bars, dtype=np.float64)
+        timestamps = bars[:, 0].astype(np.int64)
+        last = self.last_timestamp
+        if last is not None:
+            if timestamps[-1] < last:
+                return 0
+            first = np.searchsorted(timestamps, last)
+            if timestamps[first] == last:
+                self._write(np.array([self._end - 1 - self.capacity]), timestamps[first:first + 1], bars[first:first + 1])
+                first += 1
+            timestamps, bars = timestamps[first:], bars[first:]
+
+        new = len(bars)
+        timestamps, bars = timestamps[-self.capacity:], bars[-self.capacity:]
+        self.count += new - len(bars)
+        self._write((self.count + np.arange(len(bars))) % self.capacity, timestamps, bars)
+        self.count += len(bars)
+        return new
+
+    def view(self, size: Optional[int] = None) -> pd.DataFrame:
+        """
+        Zero-copy MarketData view of the newest bars, oldest first.
+
+        Args:
+            size: Number of bars to include; all stored bars if None
+        """
+        size = len(self) if size is None else min(size, len(self))
+        window = slice(self._end - size, self._end)
+        return pd.DataFrame(
+            {'date': self._dates[window], **{column: values[window] for column, values in self._values.items()}},
+            copy=False
+        )
+
+    def _write(self, positions: np.ndarray, timestamps: np.ndarray, bars: np.ndarray) -> None:
+        dates = timestamps.astype('datetime64[ms]').astype('datetime64[ns]')
+        for offset in (0, self.capacity):
+            self._dates[positions + offset] = dates
+            for column_index, values in enumerate(self._values.values(), start=1):
+                values[positions + offset] = bars[:, column_index]
+
+
+class LiveBars:
+    """
+    Per-pair ring buffers fed from an exchange API.
+
+    The first update of a pair warms its buffer with a full fetch; later updates only fetch
+    the bars since the newest stored timestamp and validate just those bars. After a gap
+    longer than the buffer (e.g. an outage) the buffer is rebuilt with a full fetch, since
+    a fetch since the newest stored bar would return the oldest missing bars.
+    """
+
+    def __init__(
+        self,
+        exchange_api: BaseExchangeAPI,
+        timeframe: str = '1m',
+        capacity: int = 200,
+        latency: Optional[LatencyTracker] = None
+    ) -> None:
+        """
+        Args:
+            exchange_api: Exchange API to fetch bars from
+            timeframe: Timeframe of the bars
+            capacity: Number of bars kept per pair
+            latency: Tracker for the fetch, DataFrame and validation spans; the shared one if None
+        """
+        self.exchange_api = exchange_api
+        self.timeframe = timeframe
+        self.capacity = capacity
+        self.timeframe_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        self.buffers: Dict[str, BarRingBuffer] = {}
+        self.latency = latency or LatencyTracker.shared()
+        self.logger = logging.getLogger(f"LiveBars-{timeframe}")
+
+    def update(self, pair: str, now: Optional[int] = None) -> pd.DataFrame:
+        """
+        Fetch the missing bars of a pair and return a view of its buffer.
+
+        Args:
+            pair: Trading pair (e.g., 'DOG/USDT')
+            now: Current time in milliseconds, to detect gaps longer than the buffer; the
+                local clock if None
+
+        Returns:
+            Zero-copy MarketData view of the newest bars
+        """
+        buffer = self.buffers.get(pair)
+        since = buffer.last_timestamp if buffer is not None else None
+        now = int(time.time() * 1000) if now is None else now
+        if since is not None and now - since >= self.capacity * self.timeframe_ms:
+            self.logger.warning(f"{pair} buffer is {(now - since) // self.timeframe_ms} bars behind, rebuilding it")
+            since = None
+        if since is None:
+            buffer = self.buffers[pair] = BarRingBuffer(self.capacity)
+            self.logger.info(f"Warming {pair} buffer with {self.capacity} bars")
+        # get_bars returns the newest bar first
+        with self.latency.span('bar_fetch'):
+            bars = self.exchange_api.get_bars(pair=pair, timeframe=self.timeframe, limit=self.capacity, since=since)[::-1]
+        if bars:
+            with self.latency.span('dataframe'):
+                new_bars = pd.DataFrame(bars, columns=['date', *BarRingBuffer.COLUMNS])
+                new_bars['date'] = pd.to_datetime(new_bars['date'], unit='ms')
+                new_bars = new_bars.astype({column: np.float64 for column in BarRingBuffer.COLUMNS})
+            with self.latency.span('validation'):
+                ValidationPolicy.validate_frame(MarketData, new_bars, boundary=True)
+        with self.latency.span('dataframe'):
+            stored = buffer.append(bars)
+            view = buffer.view()
+        self.logger.debug(f"Stored {stored} new bars for {pair}")
+        return view
+
+    def push(self, pair: str, bar: List[float]) -> pd.DataFrame:
+        """
+        Store a closed bar received from a MarketFeed and return a view of the pair's buffer.
+
+        If the buffer is empty or bars were missed (e.g. while the stream reconnected), the
+        missing bars are fetched with update() instead.
+
+        Args:
+            pair: Trading pair (e.g., 'DOG/USDT')
+            bar: Bar in ccxt format [timestamp_ms, open, high, low, close, volume]
+
+        Returns:
+            Zero-copy MarketData view of the newest bars
+        """
+        buffer = self.buffers.get(pair)
+        last = buffer.last_timestamp if buffer is not None else None
+        if last is None or bar[0] > last + self.timeframe_ms:
+            return self.update(pair, now=bar[0])
+        buffer.append([bar])
+        return buffer.view()
@@ -1,10 +1,13 @@
 import time
 import schedule
-
-import pandas as pd
+from pathlib import Path
 
 from trader import Trader
-from definitions import Memory, MarketData
+from latency import LatencyTracker
+from bar_buffer import LiveBars
+from market_feed import CcxtProFeed
+from order_journal import OrderJournal
+from order_reconciler import OrderReconciler
 from exchange_apis import BitgetAPI
 from strategies.multi_moving_average_strategy import MultiMovingAverageStrategy
 
@@ -15,37 +18,60 @@ trader = Trader(
         min_purchase=5.1,
         safety_margin=1.5,
         trading_phase = MultiMovingAverageStrategy.TradingPhase.DISTRIBUTION,
+        debug=True,
     ),
     exchange_api=BitgetAPI(
         api_key="BITGET_API_KEY_DOG_USDT_BOT", 
         api_secret="BITGET_API_SECRET_DOG_USDT_BOT"
     ),
-    pair='DOG/USDT'
+    pair='DOG/USDT',
+    journal=OrderJournal(Path('data/journal/bitget_DOG_USDT.sqlite'))
 )
+live_bars = LiveBars(trader.exchange_api, timeframe='1m', capacity=trader.strategy.required_lookback)
+latency = LatencyTracker.shared()
+reconciler = OrderReconciler(trader.exchange_api, trader.journal, trader.pair, interval=10)
 
-def job():
+def run_strategy(fetch_data):
     try:
         start_time = time.time()
 
         print("----------- RUN -----------")
 
-        data = trader.exchange_api.get_bars(pair=trader.pair, timeframe='1m', limit=200)
-        data = pd.DataFrame(data, columns=['date', 'open', 'high', 'low', 'close', 'volume'])
-        data = data.iloc[::-1]
-        data = MarketData(data)
+        # The tick covers the whole loop, from the bar fetch to the order placement
+        with latency.span('tick'):
+            data = fetch_data()
 
-        memory: Memory = { 'orders': [], 'balance_a': 0.0,'balance_b': 0.0}
-        memory['balance_a'] = trader.exchange_api.get_account_balance(trader.pair.split('/')[0])
-        memory['balance_b'] = trader.exchange_api.get_account_balance(trader.pair.split('/')[1])
+            # Balances tracked from the reconciled fills, read from the journal without
+            # calling the exchange
+            with latency.span('memory_load'):
+                memory = reconciler.load_memory()
 
-        trader.execute_strategy(data, memory)
+            trader.execute_strategy(data, memory)
 
         end_time = time.time()
         print("Tiempo de ejecución: {} segundos".format(end_time - start_time))
     except Exception as e:
         print("Se produjo un error: ", e)
 
+def job():
+    # Only the bars since the last run are fetched; data is a view of the buffer
+    run_strategy(lambda: live_bars.update(trader.pair))
+
+def on_bar(pair, bar):
+    # Called by the feed as soon as a bar closes
+    run_strategy(lambda: live_bars.push(pair, bar))
+
 def main():
+    # Prometheus text endpoint with the per-stage latencies (enables the shared tracker)
+    latency.serve(port=8000)
+    reconciler.start()
+    feed = CcxtProFeed('bitget', [trader.pair], timeframe='1m', watch_ticks=False)
+    feed.on_bar(on_bar)
+    feed.run()
+
+def main_polling():
+    latency.serve(port=8000)
+    reconciler.start()
     schedule.every().minute.at(":06").do(job)
 
     while True:
@@ -53,4 +79,4 @@ def main():
         time.sleep(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
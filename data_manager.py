@@ -15,7 +15,7 @@ import zipfile
 from tqdm import tqdm
 from pathlib import Path
 from enum import Enum, auto
-from typing import List, Union, Tuple, Optional, Dict, Any
+from typing import List, Union, Tuple, Optional, Dict, Any, Hashable
 from datetime import datetime, timedelta
 
 import numpy as np
@@ -23,6 +23,14 @@ import pandas as pd
 from pandera.errors import SchemaError
 
 from definitions import MarketData
+from validation import ValidationPolicy
+
+try:
+    import pyarrow
+    import pyarrow.csv as pyarrow_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -93,7 +101,8 @@ class DataManager:
         duration: Optional[int] = None,
         variation: Optional[float] = None,
         tolerance: float = 0.01,
-        normalize: bool = False
+        normalize: bool = False,
+        timeframe: Optional[str] = None
     ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """
         Get a sample of market data with options for selecting specific segments.
@@ -106,6 +115,8 @@ class DataManager:
             variation: Target price variation for the selected segment
             tolerance: Tolerance for the variation target
             normalize: Whether to normalize the price data
+            timeframe: Timeframe to resample the 1m data to (e.g. '5m', '1h'). Indices and
+                durations are then counted in bars of this timeframe
         
         Returns:
             Tuple containing:
@@ -127,28 +138,8 @@ class DataManager:
                 sample_data_path = data_path
                 logger.info(f"Using specified data file: {sample_data_path}")
             
-            # Read the data
-            try:
-                df = pd.read_csv(sample_data_path, parse_dates=['date'])
-                # Ensure correct data types for MarketData validation
-                for col in ['open', 'high', 'low', 'close']:
-                    if col in df.columns:
-                        df[col] = df[col].astype(np.float64)
-                        # Ensure values are positive (required by MarketData schema)
-                        if col in ['open', 'high', 'low', 'close'] and (df[col] <= 0).any():
-                            min_value = df[col].min()
-                            if min_value <= 0:
-                                # Add a small offset to make all values positive
-                                df[col] = df[col] - min_value + 0.01
-                
-                if 'volume' in df.columns:
-                    df['volume'] = df['volume'].astype(np.float64)
-                
-                market_data = df
-                logger.info(f"Successfully loaded data with {len(market_data)} rows")
-            except Exception as e:
-                logger.error(f"Error reading data file {sample_data_path}: {str(e)}")
-                raise ValueError(f"Failed to read data file: {str(e)}")
+            # Read the data, resampled to the requested timeframe
+            market_data = DataManager._load_marketdata(sample_data_path, timeframe)
             
             # Select segment based on variation if specified
             if duration and variation is not None:
@@ -174,13 +165,14 @@ class DataManager:
                 'variation': variation,
                 'tolerance': tolerance,
                 'normalize': normalize,
+                'timeframe': timeframe,
                 'rows': len(market_data)
             }
             metadata = {k: v for k, v in metadata.items() if v is not None}
             
             # Validate with MarketData schema before returning
             try:
-                validated_data = MarketData(market_data)
+                validated_data = ValidationPolicy.validate_frame(MarketData, market_data, boundary=True)
                 return validated_data, metadata
             except Exception as e:
                 logger.warning(f"Data validation error: {str(e)}. Returning raw DataFrame.")
@@ -193,6 +185,236 @@ class DataManager:
             logger.error(f"Error getting market data sample: {str(e)}")
             raise
 
+    # Timeframe units and their length in minutes
+    TIMEFRAME_UNITS = {'m': 1, 'h': 60, 'd': 60 * 24, 'w': 60 * 24 * 7}
+    # Resampled market data by (data file, timeframe), with the (mtime, size) of the file
+    # when it was read; bounded like _marketdata_cache
+    _timeframe_cache: Dict[Tuple[str, str], Tuple[Tuple[int, int], pd.DataFrame]] = {}
+
+    @staticmethod
+    def resample_marketdata(data: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+        """
+        Aggregate market data into OHLCV bars of a higher timeframe.
+        
+        Bars are bucketed by their open time, so every bucket starts at a multiple of the
+        timeframe. The reductions run once over the whole frame with ufunc.reduceat.
+        
+        Args:
+            data: Market data sorted by date
+            timeframe: Target timeframe (e.g. '5m', '15m', '1h', '1d')
+        
+        Returns:
+            Market data with one row per timeframe bucket, dated at the bucket open
+        
+        Raises:
+            ValueError: If the timeframe cannot be parsed
+        """
+        step = np.int64(DataManager._timeframe_to_minutes(timeframe) * 60 * 10**9)
+        if len(data) == 0:
+            return data.copy()
+
+        dates = data['date'].to_numpy().astype('datetime64[ns]').view(np.int64)
+        buckets = dates // step
+        starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+        ends = np.append(starts[1:], len(data)) - 1
+
+        resampled = pd.DataFrame({
+            'date': pd.Series((buckets[starts] * step).view('datetime64[ns]')).astype(data['date'].dtype),
+            'open': data['open'].to_numpy(dtype=np.float64)[starts],
+            'high': np.maximum.reduceat(data['high'].to_numpy(dtype=np.float64), starts),
+            'low': np.minimum.reduceat(data['low'].to_numpy(dtype=np.float64), starts),
+            'close': data['close'].to_numpy(dtype=np.float64)[ends],
+            'volume': np.add.reduceat(data['volume'].to_numpy(dtype=np.float64), starts),
+        })
+        logger.debug(f"Resampled {len(data)} rows to {len(resampled)} {timeframe} bars")
+        return resampled
+
+    @staticmethod
+    def align_timeframes(data: pd.DataFrame, timeframes: List[str]) -> pd.DataFrame:
+        """
+        Build a multi-timeframe view aligned to the index of the base market data.
+        
+        Every row gets the OHLCV values of the last higher-timeframe bar that had closed by
+        the close of that row, so no value from an unfinished bar leaks into the past.
+        Columns are suffixed with the timeframe (e.g. 'close_1h'); rows before the first
+        closed bar hold NaN.
+        
+        Args:
+            data: Base market data sorted by date (usually 1m bars)
+            timeframes: Higher timeframes to add
+        
+        Returns:
+            Copy of the market data with the aligned higher-timeframe columns added
+        """
+        aligned = data.copy()
+        dates = data['date'].to_numpy().astype('datetime64[ns]').view(np.int64)
+        bar_length = np.int64(np.median(np.diff(dates))) if len(dates) > 1 else np.int64(60 * 10**9)
+        for timeframe in timeframes:
+            resampled = DataManager.resample_marketdata(data, timeframe)
+            step = np.int64(DataManager._timeframe_to_minutes(timeframe) * 60 * 10**9)
+            close_times = resampled['date'].to_numpy().astype('datetime64[ns]').view(np.int64) + step
+            positions = np.searchsorted(close_times, dates + bar_length, side='right') - 1
+            closed = positions >= 0
+            for column in ['open', 'high', 'low', 'close', 'volume']:
+                values = np.full(len(data), np.nan)
+                values[closed] = resampled[column].to_numpy()[positions[closed]]
+                aligned[f'{column}_{timeframe}'] = values
+        return aligned
+
+    @staticmethod
+    def clear_timeframe_cache() -> None:
+        """Drop every cached resampled data file."""
+        DataManager._timeframe_cache.clear()
+
+    @staticmethod
+    def clear_marketdata_cache() -> None:
+        """Drop every cached data file, parsed and resampled."""
+        DataManager._marketdata_cache.clear()
+        DataManager._timeframe_cache.clear()
+
+    @staticmethod
+    def _timeframe_to_minutes(timeframe: str) -> int:
+        """
+        Convert a timeframe string such as '15m' or '4h' to minutes.
+        
+        Raises:
+            ValueError: If the timeframe cannot be parsed
+        """
+        unit = timeframe[-1:]
+        amount = timeframe[:-1]
+        if unit not in DataManager.TIMEFRAME_UNITS or not amount.isdigit() or int(amount) <= 0:
+            raise ValueError(f"Invalid timeframe: {timeframe}")
+        return int(amount) * DataManager.TIMEFRAME_UNITS[unit]
+
+    @staticmethod
+    def _load_marketdata(data_path: Path, timeframe: Optional[str] = None) -> pd.DataFrame:
+        """
+        Read a market data file, resampled to the given timeframe.
+        
+        Resampled frames are cached per (file, timeframe) and reused while the file is
+        unchanged, so repeated samples skip both the CSV parse and the aggregation. Like
+        parsed files, at most MARKETDATA_CACHE_SIZE are kept and every call returns its own
+        (shallow) copy.
+        
+        Args:
+            data_path: Path to the data file
+            timeframe: Target timeframe, or None to keep the file's own bars
+        
+        Returns:
+            Market data
+        """
+        if timeframe is None:
+            return DataManager._read_marketdata(data_path)
+
+        key, signature = (str(data_path), timeframe), DataManager._file_signature(data_path)
+        cached = DataManager._cache_get(DataManager._timeframe_cache, key, signature)
+        if cached is not None:
+            logger.info(f"Using cached {timeframe} data for {data_path}")
+            return cached
+
+        market_data = DataManager.resample_marketdata(DataManager._read_marketdata(data_path), timeframe)
+        DataManager._cache_put(DataManager._timeframe_cache, key, signature, market_data)
+        logger.info(f"Resampled data to {len(market_data)} {timeframe} bars")
+        return market_data.copy(deep=False)
+
+    # Column types of the market data CSV files, declared so the parser does not infer them
+    CSV_DTYPES = {'open': np.float64, 'high': np.float64, 'low': np.float64, 'close': np.float64, 'volume': np.float64}
+    CSV_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+    # Parsed data files kept in memory, the least recently read ones are dropped first
+    MARKETDATA_CACHE_SIZE = 8
+    # Parsed market data by data file, with the (mtime, size) of the file when it was read
+    _marketdata_cache: Dict[str, Tuple[Tuple[int, int], pd.DataFrame]] = {}
+
+    @staticmethod
+    def _read_marketdata(data_path: Path) -> pd.DataFrame:
+        """
+        Read a market data CSV file and coerce it to the MarketData column types.
+        
+        Parsed files are cached in memory and reused while their modification time and size
+        are unchanged. Every call returns its own (shallow) copy of the cached frame.
+        
+        Args:
+            data_path: Path to the data file
+        
+        Returns:
+            Market data
+        
+        Raises:
+            ValueError: If the file cannot be read
+        """
+        try:
+            key, signature = str(data_path), DataManager._file_signature(data_path)
+            cached = DataManager._cache_get(DataManager._marketdata_cache, key, signature)
+            if cached is not None:
+                logger.info(f"Using cached data for {data_path}")
+                return cached
+
+            df = DataManager._parse_marketdata_csv(data_path)
+            # Ensure values are positive (required by MarketData schema)
+            for col in ['open', 'high', 'low', 'close']:
+                if col in df.columns:
+                    min_value = df[col].min()
+                    if min_value <= 0:
+                        # Add a small offset to make all values positive
+                        df[col] = df[col] - min_value + 0.01
+
+            DataManager._cache_put(DataManager._marketdata_cache, key, signature, df)
+            
+            logger.info(f"Successfully loaded data with {len(df)} rows")
+            return df.copy(deep=False)
+        except Exception as e:
+            logger.error(f"Error reading data file {data_path}: {str(e)}")
+            raise ValueError(f"Failed to read data file: {str(e)}")
+
+    @staticmethod
+    def _file_signature(data_path: Path) -> Tuple[int, int]:
+        """(mtime, size) of a data file, which invalidates its cached frames when it changes."""
+        stat = data_path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _cache_get(cache: Dict, key: Hashable, signature: Tuple[int, int]) -> Optional[pd.DataFrame]:
+        """Shallow copy of a cached frame if its file is unchanged, marking it as recently read."""
+        cached = cache.get(key)
+        if cached is None or cached[0] != signature:
+            return None
+        cache[key] = cache.pop(key)
+        return cached[1].copy(deep=False)
+
+    @staticmethod
+    def _cache_put(cache: Dict, key: Hashable, signature: Tuple[int, int], df: pd.DataFrame) -> None:
+        """Cache a frame, dropping the least recently read ones beyond MARKETDATA_CACHE_SIZE."""
+        cache.pop(key, None)
+        while len(cache) >= DataManager.MARKETDATA_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+        cache[key] = (signature, df)
+
+    @staticmethod
+    def _parse_marketdata_csv(data_path: Path) -> pd.DataFrame:
+        """
+        Parse a market data CSV file with the declared column types.
+        
+        Uses the multithreaded pyarrow CSV reader when pyarrow is installed and the pandas C
+        parser otherwise. Dates are parsed with CSV_DATE_FORMAT, falling back to inference
+        for files written in another format.
+        """
+        if PYARROW_AVAILABLE:
+            convert_options = pyarrow_csv.ConvertOptions(
+                column_types={'date': pyarrow.timestamp('ns'), **{col: pyarrow.float64() for col in DataManager.CSV_DTYPES}},
+                timestamp_parsers=[DataManager.CSV_DATE_FORMAT]
+            )
+            try:
+                return pyarrow_csv.read_csv(data_path, convert_options=convert_options).to_pandas()
+            except pyarrow.ArrowInvalid as e:
+                logger.debug(f"pyarrow could not parse {data_path} ({str(e)}), using the C parser")
+
+        df = pd.read_csv(data_path, engine='c', dtype=DataManager.CSV_DTYPES)
+        try:
+            df['date'] = pd.to_datetime(df['date'], format=DataManager.CSV_DATE_FORMAT)
+        except ValueError:
+            df['date'] = pd.to_datetime(df['date'])
+        return df
+    
     @staticmethod
     def _choose_random_data_path(data_path: Path = Path('data/coinex_prices_raw')) -> Path:
         """
@@ -0,0 +1,173 @@
+import sys
+import json
+import time
+import atexit
+import logging
+import threading
+from enum import Enum
+from pathlib import Path
+from queue import SimpleQueue
+from typing import Any, Dict, List, Optional, TextIO, Union
+from weakref import WeakSet
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+class DecisionTracer:
+    """
+    Level-gated trace of strategy decisions, written as JSON lines off the hot path.
+
+    Strategies guard their records with `if tracer.enabled_for(DecisionTracer.DEBUG):`, so a
+    disabled tracer costs one comparison per bar and builds nothing. Enabled records are put
+    on a queue as they are; a writer thread serializes them (enums, models, NumPy scalars and
+    timestamps included) and writes them in batches to a file or a text stream. The shared
+    tracer is disabled by default, like LatencyTracker.shared().
+    """
+    DEBUG = logging.DEBUG
+    INFO = logging.INFO
+    # Level of a disabled tracer, above every record level
+    DISABLED = float('inf')
+    # Records written per batch at most
+    BATCH = 1024
+    _shared: Optional['DecisionTracer'] = None
+    _consoles: Dict[int, 'DecisionTracer'] = {}
+    _shared_lock = threading.Lock()
+    _STOP = object()
+    # Tracers with a running writer, closed by a single atexit hook
+    _running: 'WeakSet[DecisionTracer]' = WeakSet()
+    _atexit_registered = False
+
+    def __init__(self, level: Optional[int] = None, sink: Union[str, Path, TextIO, None] = None) -> None:
+        """
+        Args:
+            level: Minimum level of the records written, None to disable the tracer
+            sink: JSONL file to append to, or a text stream; standard output by default
+        """
+        self.level = self.DISABLED if level is None else level
+        self.sink = sink
+        self.logger = logging.getLogger("DecisionTracer")
+        self._queue: SimpleQueue = SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> 'DecisionTracer':
+        """Process-wide tracer used by strategies without their own; disabled until configured."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @classmethod
+    def console(cls, level: int = logging.DEBUG) -> 'DecisionTracer':
+        """
+        Tracer writing to standard output, what strategies use with debug=True. One tracer is
+        shared per level, so any number of debugging strategies use a single writer thread.
+        """
+        with cls._shared_lock:
+            if level not in cls._consoles:
+                cls._consoles[level] = cls(level=level, sink=sys.stdout)
+            return cls._consoles[level]
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Close every tracer with a running writer; registered with atexit on first use."""
+        with cls._shared_lock:
+            tracers = list(cls._running)
+        for tracer in tracers:
+            tracer.close()
+
+    def configure(self, level: Optional[int], sink: Union[str, Path, TextIO, None] = None) -> None:
+        """Change the level and sink; pending records are written to the previous sink first."""
+        self.close()
+        self.level = self.DISABLED if level is None else level
+        self.sink = sink
+
+    def enabled_for(self, level: int) -> bool:
+        return level >= self.level
+
+    def record(self, level: int, event: str, **fields: Any) -> None:
+        """
+        Queue a record if the level is enabled. Field values are serialized later by the
+        writer, so they must not be mutated after the call.
+        """
+        if level < self.level:
+            return
+        if self._writer is None:
+            self._start()
+        self._queue.put({'time': time.time(), 'level': logging.getLevelName(level), 'event': event, **fields})
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until every queued record has been written."""
+        if self._writer is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self) -> None:
+        """Write the queued records and stop the writer."""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        with self._shared_lock:
+            self._running.discard(self)
+        if writer is not None:
+            self._queue.put(self._STOP)
+            writer.join()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, args=(self.sink,), name="DecisionTracer", daemon=True)
+                self._writer.start()
+                with self._shared_lock:
+                    self._running.add(self)
+                    if not DecisionTracer._atexit_registered:
+                        atexit.register(DecisionTracer.close_all)
+                        DecisionTracer._atexit_registered = True
+
+    def _write_loop(self, sink: Union[str, Path, TextIO, None]) -> None:
+        stream = open(sink, 'a', encoding='utf-8') if isinstance(sink, (str, Path)) else (sink or sys.stdout)
+        try:
+            running = True
+            while running:
+                items = [self._queue.get()]
+                while len(items) < self.BATCH and not self._queue.empty():
+                    items.append(self._queue.get())
+                lines, events = [], []
+                for item in items:
+                    if item is self._STOP:
+                        running = False
+                    elif isinstance(item, threading.Event):
+                        events.append(item)
+                    else:
+                        lines.append(self._serialize(item))
+                if lines:
+                    stream.write('\n'.join(lines) + '\n')
+                    stream.flush()
+                for event in events:
+                    event.set()
+        except Exception as e:
+            self.logger.error(f"Error writing decision trace: {str(e)}")
+        finally:
+            if stream is not sink and stream is not sys.stdout:
+                stream.close()
+
+    @staticmethod
+    def _serialize(record: Dict[str, Any]) -> str:
+        return json.dumps(record, default=DecisionTracer._to_json)
+
+    @staticmethod
+    def _to_json(value: Any) -> Any:
+        if isinstance(value, Enum):
+            return value.name if not isinstance(value.value, str) else value.value
+        if isinstance(value, BaseModel):
+            return value.model_dump()
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, (pd.Timestamp, np.datetime64)):
+            return str(pd.Timestamp(value))
+        if isinstance(value, (list, tuple, set)):
+            return list(value)
+        return str(value)
@@ -54,3 +54,19 @@ class PlotMode(Enum):
     TOTAL_VALUE_B = 'total_value_b'
     ADJUSTED_A_BALANCE = 'adjusted_a_balance'
     ADJUSTED_B_BALANCE = 'adjusted_b_balance'
+
+class PerformanceMetric(Enum):
+    # Names match the keys returned by PerformanceMetrics.calculate
+    TOTAL_RETURN = 'total_return'
+    SHARPE_RATIO = 'sharpe_ratio'
+    SORTINO_RATIO = 'sortino_ratio'
+    MAX_DRAWDOWN = 'max_drawdown'
+    MAX_DRAWDOWN_DURATION = 'max_drawdown_duration'
+    CALMAR_RATIO = 'calmar_ratio'
+    TURNOVER = 'turnover'
+    FEE_DRAG = 'fee_drag'
+    EXPOSURE = 'exposure'
+    NUM_TRADES = 'num_trades'
+    WIN_RATE = 'win_rate'
+    TRADE_PNL = 'trade_pnl'
+    MEAN_TRADE_PNL = 'mean_trade_pnl'
@@ -1,2 +1,4 @@
 from drawer.backtest_drawer import BacktestDrawer
 from drawer.indicator_drawer import IndicatorPlotManager
+from drawer.decimation import Decimator
+from drawer.batch_renderer import BatchRenderer
\ No newline at end of file
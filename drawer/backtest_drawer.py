@@ -1,11 +1,16 @@
 from pathlib import Path
+import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-from typing import List, Tuple, Dict, Any, Optional
+from typing import Callable, List, Tuple, Dict, Any, Optional
 
 from definitions import PlotMode
+from drawer.decimation import Decimator
 
 class BacktestDrawer:
+    # Points per line by default, a few per horizontal pixel of the figure
+    MAX_POINTS = 4000
+
     @classmethod
     def draw(
         cls,
@@ -14,24 +19,34 @@ class BacktestDrawer:
         extra_plots_price: Optional[List[Tuple[Tuple, Dict[str, Any]]]] = None,
         extra_plot: Optional[List[Tuple[Tuple, Dict[str, Any]]]] = None,
         save_path: Optional[Path] = None,
-        show: bool = True
+        show: bool = True,
+        max_points: Optional[int] = MAX_POINTS,
+        decimation: str = 'minmax'
     ) -> None:
+        """
+        Draw prices, indicators and balances of a backtest.
+
+        Long backtests are decimated: every line is reduced to at most max_points points
+        (MAX_POINTS by default, None to plot every row) with the chosen Decimator method
+        ('minmax' or 'lttb') before plotting. Buy and sell points are always drawn in full.
+        """
         plt.style.use('ggplot')
+        decimate = lambda y: Decimator.decimate(y, max_points, decimation)
         
         fig, axes = cls._setup_layout(plot_modes, extra_plot)
         
         current_ax = 0
         
         if PlotMode.PRICE in plot_modes:
-            cls._draw_prices(axes[current_ax], df, extra_plots_price)
+            cls._draw_prices(axes[current_ax], df, extra_plots_price, decimate)
             current_ax += 1
         
         if extra_plot:
-            cls._draw_extra(axes[current_ax], df['date'].values, extra_plot)
+            cls._draw_extra(axes[current_ax], df['date'].values, extra_plot, decimate)
             current_ax += 1
 
         if any(mode in plot_modes for mode in set(PlotMode) - {PlotMode.PRICE}):
-            cls._draw_balances(axes[current_ax], axes[current_ax].twinx(), df, plot_modes)
+            cls._draw_balances(axes[current_ax], axes[current_ax].twinx(), df, plot_modes, decimate)
         
         plt.tight_layout()
         if save_path:
@@ -59,17 +74,20 @@ class BacktestDrawer:
             cls,
             ax: plt.Axes,
             df,
-            extra_plots_price: Optional[List[Tuple[Tuple, Dict[str, Any]]]] = None
+            extra_plots_price: Optional[List[Tuple[Tuple, Dict[str, Any]]]] = None,
+            decimate: Callable = Decimator.decimate
         ) -> None:
         dates = mdates.date2num(df['date'].values)
-        ax.plot(dates, df['close'], label='close Price', color='darkblue', linewidth=2)
+        close = df['close'].to_numpy()
+        rows = decimate(close)
+        ax.plot(dates[rows], close[rows], label='close Price', color='darkblue', linewidth=2)
         
-        cls._draw_extra_plots_price(ax, df['date'].values, extra_plots_price)
+        cls._draw_extra_plots_price(ax, df['date'].values, extra_plots_price, decimate)
         cls._draw_buy_and_sell_points(ax, df)
         cls._customice_price_axes(ax)
 
     @staticmethod
-    def _draw_extra_plots_price(ax, dates, extra_plots_price):
+    def _draw_extra_plots_price(ax, dates, extra_plots_price, decimate: Callable = Decimator.decimate):
         if extra_plots_price:
             for plot_data, plot_kwargs in extra_plots_price:
                 plot_type = plot_kwargs.pop('type', 'plot')
@@ -77,16 +95,24 @@ class BacktestDrawer:
                 if plot_type == 'plot' and len(plot_data) >= 2:
                     plot_data = list(plot_data)  # Convert to list to make mutable
                     if len(plot_data[0]) == len(dates):  # Check if it's using the same time series
-                        plot_data[0] = mdates.date2num(dates)
+                        plot_data = BacktestDrawer._decimate_series(dates, plot_data, decimate)
                 getattr(ax, plot_type)(*plot_data, **plot_kwargs)
 
     @staticmethod
     def _draw_buy_and_sell_points(ax, df):
         if 'type' in df.columns:
+            types = df['type'].to_numpy()
             for trade_type, color, label in [('buy_market', 'green', 'Buy'), ('sell_market', 'red', 'Sell')]:
-                points = df[df['type'] == trade_type]
-                dates = mdates.date2num(points['date'].values)
-                ax.scatter(dates, points['price'], color=color, label=label, s=50)
+                rows = np.flatnonzero(types == trade_type)
+                dates = mdates.date2num(df['date'].to_numpy()[rows])
+                ax.scatter(dates, df['price'].to_numpy()[rows], color=color, label=label, s=50)
+
+    @staticmethod
+    def _decimate_series(dates, plot_data: list, decimate: Callable) -> list:
+        # Time series sharing the frame dates are decimated on their own values
+        values = np.asarray(plot_data[1], dtype=np.float64)
+        rows = decimate(values)
+        return [mdates.date2num(dates)[rows], values[rows], *plot_data[2:]]
 
     @staticmethod
     def _customice_price_axes(ax):
@@ -102,7 +128,8 @@ class BacktestDrawer:
             ax: plt.Axes,
             ax_extra: plt.Axes,
             df, 
-            plot_modes: List[PlotMode]
+            plot_modes: List[PlotMode],
+            decimate: Callable = Decimator.decimate
         ) -> None:
         plot_configs = {
             PlotMode.BALANCE_A: {'column': 'balance_a', 'label': 'DOG Balance', 'color': 'darkorange','axis': ax, 'linestyle': '-', 'linewidth': 3, 'alpha': 1.0 },
@@ -120,7 +147,7 @@ class BacktestDrawer:
         for mode in plot_modes:
             if mode in plot_configs:
                 config = plot_configs[mode]
-                line = cls._draw_balances_lines(dates, df, config)
+                line = cls._draw_balances_lines(dates, df, config, decimate)
                 
                 lines.append(line)
                 labels.append(config.get('label'))
@@ -152,8 +179,10 @@ class BacktestDrawer:
             ax_extra.axis('off')
 
     @staticmethod
-    def _draw_balances_lines(dates: List[float], df, config:tuple) -> plt.Line2D:
-        line, = config.get('axis').plot(dates, df[config.get('column')],
+    def _draw_balances_lines(dates: List[float], df, config:tuple, decimate: Callable = Decimator.decimate) -> plt.Line2D:
+        values = df[config.get('column')].to_numpy()
+        rows = decimate(values)
+        line, = config.get('axis').plot(dates[rows], values[rows],
                         label=config.get('label'), color=config.get('color'), 
                         linewidth=config.get('linewidth'), linestyle=config.get('linestyle'), 
                         alpha=config.get('alpha'))
@@ -168,7 +197,13 @@ class BacktestDrawer:
         return line
 
     @classmethod
-    def _draw_extra(cls, ax: plt.Axes, dates, extra_plot: List[Tuple[Tuple, Dict[str, Any]]]) -> None:
+    def _draw_extra(
+            cls,
+            ax: plt.Axes,
+            dates,
+            extra_plot: List[Tuple[Tuple, Dict[str, Any]]],
+            decimate: Callable = Decimator.decimate
+        ) -> None:
         plot_methods = {
             'scatter': ax.scatter,
             'plot': ax.plot,
@@ -184,7 +219,7 @@ class BacktestDrawer:
             if plot_type == 'plot' and len(plot_data) >= 2:
                 plot_data = list(plot_data)  # Convert to list to make mutable
                 if len(plot_data[0]) == len(dates):  # Check if it's using the same time series
-                    plot_data[0] = mdates.date2num(dates)
+                    plot_data = cls._decimate_series(dates, plot_data, decimate)
             
             plot_method(*plot_data, **plot_kwargs)
         
@@ -0,0 +1,55 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import matplotlib.pyplot as plt
+
+class BatchRenderer:
+    """
+    Headless rendering of many figures in parallel worker processes.
+
+    Every job is a plotting callable (e.g. MultiBacktest.plot_results or BacktestDrawer.draw)
+    with its keyword arguments, which must include a save_path. Workers switch matplotlib to the
+    non-interactive Agg backend and close every figure after each job, so they can render an
+    unbounded number of figures without a display.
+    """
+
+    @staticmethod
+    def render(
+        jobs: List[Tuple[Callable, Dict[str, Any]]],
+        max_workers: Optional[int] = None
+    ) -> None:
+        """
+        Render the figures of all jobs.
+
+        Args:
+            jobs: List of (plot function, keyword arguments) pairs
+            max_workers: Number of worker processes; defaults to one per job up to the CPU
+                count. With 1 the jobs run in the current process
+
+        Raises:
+            Exception: The first error raised by a job
+        """
+        if not jobs:
+            return
+        max_workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+        if max_workers == 1:
+            for function, kwargs in jobs:
+                BatchRenderer._render_job(function, kwargs)
+            return
+
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=BatchRenderer._init_worker) as executor:
+            futures = [executor.submit(BatchRenderer._render_job, function, kwargs) for function, kwargs in jobs]
+            for future in futures:
+                future.result()
+
+    @staticmethod
+    def _init_worker() -> None:
+        plt.switch_backend('Agg')
+
+    @staticmethod
+    def _render_job(function: Callable, kwargs: Dict[str, Any]) -> None:
+        try:
+            function(**{**kwargs, 'show': False})
+        finally:
+            plt.close('all')
@@ -0,0 +1,108 @@
+from typing import Optional
+
+import numpy as np
+
+class Decimator:
+    """
+    Downsampling of long series before plotting.
+
+    A figure cannot show more points than it has horizontal pixels, so plotting every row of a
+    long backtest only costs time. Both methods return the indices of the rows to keep, so the
+    same selection can be applied to the x and y values of a line.
+    """
+    METHODS = ('minmax', 'lttb')
+
+    @staticmethod
+    def decimate(y, max_points: Optional[int] = None, method: str = 'minmax', x=None) -> np.ndarray:
+        """
+        Select the rows of a series to plot.
+
+        Args:
+            y: Values of the series
+            max_points: Maximum number of points to keep, or None to keep all of them
+            method: 'minmax' keeps the extremes of every bucket, 'lttb' keeps the point of each
+                bucket that best preserves the shape of the line (Largest-Triangle-Three-Buckets)
+            x: Positions of the values (only used by 'lttb'); row numbers if None
+
+        Returns:
+            Sorted indices of the rows to keep. The first row of every NaN gap inside the
+            series is kept as well, so the decimated line breaks where the full one does
+
+        Raises:
+            ValueError: If the method is unknown
+        """
+        if method not in Decimator.METHODS:
+            raise ValueError(f"Unknown decimation method: {method}")
+        y = np.asarray(y, dtype=np.float64)
+        if max_points is None or len(y) <= max_points:
+            return np.arange(len(y))
+        if method == 'minmax':
+            rows = Decimator.minmax(y, max_points)
+        else:
+            rows = Decimator.lttb(np.arange(len(y), dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64), y, max_points)
+        return np.union1d(rows, Decimator.gaps(y))
+
+    @staticmethod
+    def gaps(y: np.ndarray) -> np.ndarray:
+        """First row of every run of NaN values with finite values on both sides."""
+        missing = np.isnan(y)
+        finite = np.flatnonzero(~missing)
+        if len(finite) == 0:
+            return finite
+        starts = np.flatnonzero(missing[1:] & ~missing[:-1]) + 1
+        return starts[starts < finite[-1]]
+
+    @staticmethod
+    def minmax(y: np.ndarray, max_points: int) -> np.ndarray:
+        """
+        Keep the first and last rows plus the minimum and maximum of every bucket.
+
+        With one bucket per pixel column the rendered line is indistinguishable from the full
+        one, since every vertical extent drawn in a column is preserved.
+        """
+        n = len(y)
+        buckets = max((max_points - 2) // 2, 1)
+        bucket_size = -(-n // buckets)
+        # Pad to a whole number of buckets; NaN rows never win the argmin/argmax
+        padded = np.full(bucket_size * buckets, np.nan)
+        padded[:n] = y
+        padded = padded.reshape(buckets, bucket_size)
+        missing = np.isnan(padded)
+        offsets = np.arange(buckets) * bucket_size
+        lows = np.where(missing, np.inf, padded).argmin(axis=1) + offsets
+        highs = np.where(missing, -np.inf, padded).argmax(axis=1) + offsets
+        indices = np.unique(np.concatenate(([0, n - 1], lows, highs)))
+        indices = indices[indices < n]
+        # Buckets with no finite value yield a NaN row
+        return indices[~np.isnan(y[indices])]
+
+    @staticmethod
+    def lttb(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+        """
+        Largest-Triangle-Three-Buckets downsampling over the finite values of a series.
+
+        The first and last points are kept; from every bucket in between the point forming the
+        largest triangle with the previously kept point and the mean of the next bucket is kept.
+        """
+        finite = np.flatnonzero(np.isfinite(y))
+        if len(finite) <= max(max_points, 2):
+            return finite
+        x, y = x[finite], y[finite]
+        n = len(finite)
+
+        bounds = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+        selected = np.empty(max_points, dtype=np.int64)
+        selected[0], selected[-1] = 0, n - 1
+        previous = 0
+        for bucket in range(max_points - 2):
+            start, end = bounds[bucket], bounds[bucket + 1]
+            next_end = bounds[bucket + 2] if bucket + 2 < len(bounds) else n
+            next_x = x[end:next_end].mean() if next_end > end else x[-1]
+            next_y = y[end:next_end].mean() if next_end > end else y[-1]
+            areas = np.abs(
+                (x[previous] - next_x) * (y[start:end] - y[previous])
+                - (x[previous] - x[start:end]) * (next_y - y[previous])
+            )
+            previous = start + int(np.argmax(areas)) if end > start else start
+            selected[bucket + 1] = previous
+        return finite[np.unique(selected)]
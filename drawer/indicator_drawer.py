@@ -1,6 +1,6 @@
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Union
 import pandas as pd
-from indicators import IndicatorTypes, Indicator
+from indicators import IndicatorTypes, Indicator, IndicatorModel
 
 class IndicatorPlotConfig:
     DEFAULT_COLORS = ['blue', 'orange', 'green', 'red', 'purple', 'brown', 'pink', 'gray']
@@ -33,7 +33,7 @@ class IndicatorPlotConfig:
     _type_counters: Dict = {}
     
     @classmethod
-    def get_plot_style(cls, indicator: Indicator) -> dict:
+    def get_plot_style(cls, indicator: IndicatorModel) -> dict:
         """Get the plotting style for an indicator"""
         # Inicializar contador si no existe
         if indicator.type not in cls._type_counters:
@@ -69,11 +69,11 @@ class IndicatorPlotConfig:
         cls._type_counters = {}
 
 class IndicatorPlotManager:
-    def create_price_plots(self, data: pd.DataFrame, indicators: List[Indicator]) -> List[Tuple[Tuple, dict]]:
+    def create_price_plots(self, data: pd.DataFrame, indicators: List[Union[Indicator, IndicatorModel]]) -> List[Tuple[Tuple, dict]]:
         """Create plots for price-related indicators"""
         IndicatorPlotConfig.reset_counters()  # Reset counters before creating plots
         plots = []
-        for indicator in indicators:
+        for indicator in self._to_models(indicators):
             if isinstance(indicator.type, IndicatorTypes.Price):
                 plot_data = (data['date'], indicator.result)
                 plot_style = IndicatorPlotConfig.get_plot_style(indicator)
@@ -81,14 +81,19 @@ class IndicatorPlotManager:
 
         return plots if plots else None
     
-    def create_technical_plots(self, data: pd.DataFrame, indicators: List[Indicator]) -> List[Tuple[Tuple, dict]]:
+    def create_technical_plots(self, data: pd.DataFrame, indicators: List[Union[Indicator, IndicatorModel]]) -> List[Tuple[Tuple, dict]]:
         """Create plots for technical indicators"""
         IndicatorPlotConfig.reset_counters()  # Reset counters before creating plots
         plots = []
-        for indicator in indicators:
+        for indicator in self._to_models(indicators):
             if isinstance(indicator.type, IndicatorTypes.Extra):
                 plot_data = (data['date'], indicator.result)
                 plot_style = IndicatorPlotConfig.get_plot_style(indicator)
                 plots.append((plot_data, plot_style))
 
         return plots if plots else None
+
+    @staticmethod
+    def _to_models(indicators: List[Union[Indicator, IndicatorModel]]) -> List[IndicatorModel]:
+        """Validate the indicators once, at the plotting boundary"""
+        return [indicator.to_model() if isinstance(indicator, Indicator) else indicator for indicator in indicators]
@@ -1,11 +1,16 @@
 import os
 import time
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, List, Optional, Any, Union, Tuple
 
 import ccxt
+from ccxt.base.decimal_to_precision import decimal_to_precision, NO_PADDING, ROUND, TRUNCATE
 from dotenv import load_dotenv
 
+from request_scheduler import RequestScheduler, RequestPriority
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -41,7 +46,19 @@ class BaseExchangeAPI:
         self.exchange: Optional[ccxt.Exchange] = None
         self.logger = logging.getLogger(f"ExchangeAPI-{exchange_id}")
         self.max_retries = 3
-        self.retry_delay = 1  # seconds
+        self.retry_delay = 1  # seconds, doubled after each failed attempt
+        self.scheduler: Optional[RequestScheduler] = None
+        
+        # Cached full balance and market metadata, with the monotonic time they were fetched
+        self.balance_ttl = 5.0  # seconds
+        self.markets_ttl = 3600.0  # seconds
+        self._balance_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._markets_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._balance_generation = 0
+        self._order_fills: Dict[str, float] = {}
+        self._cache_lock = threading.Lock()
+        self._markets_refreshing = False
+        self._order_executor: Optional[ThreadPoolExecutor] = None
         
         # Initialize the connection
         self._initialize_connection()
@@ -68,6 +85,8 @@ class BaseExchangeAPI:
                 'secret': api_secret,
                 **self.options
             })
+            # Requests are throttled by the shared RequestScheduler instead of per instance
+            self.exchange.enableRateLimit = False
             
             self.logger.info(f"Successfully connected to {self.exchange_id}")
         except Exception as e:
@@ -93,14 +112,27 @@ class BaseExchangeAPI:
             
         return self.exchange
     
-    def _execute_with_retry(self, operation: str, func, *args, **kwargs) -> Any:
-        """
-        Execute an API operation with retry logic.
+    def _execute_with_retry(
+        self,
+        operation: str,
+        func,
+        *args,
+        priority: RequestPriority = RequestPriority.DATA,
+        coalesce: bool = False,
+        idempotent: bool = True,
+        **kwargs
+    ) -> Any:
+        """
+        Execute an API operation through the account's request scheduler, with retry logic.
         
         Args:
             operation: Name of the operation for logging
             func: Function to execute
             *args: Arguments to pass to the function
+            priority: Priority of the request in the scheduler queue
+            coalesce: Whether identical requests in flight at the same time may share one call
+            idempotent: Whether the request can safely be sent twice; order placement is not
+                retried after errors that may have reached the exchange
             **kwargs: Keyword arguments to pass to the function
             
         Returns:
@@ -109,35 +141,41 @@ class BaseExchangeAPI:
         Raises:
             Exception: If all retries fail
         """
-        retries = 0
-        last_error = None
-        
-        while retries < self.max_retries:
-            try:
-                self.logger.debug(f"Executing {operation} (attempt {retries + 1}/{self.max_retries})")
-                return func(*args, **kwargs)
-            except ccxt.NetworkError as e:
-                retries += 1
-                last_error = e
-                self.logger.warning(f"Network error during {operation}: {str(e)}. Retrying in {self.retry_delay}s ({retries}/{self.max_retries})")
-                time.sleep(self.retry_delay)
-            except ccxt.ExchangeError as e:
-                retries += 1
-                last_error = e
-                self.logger.warning(f"Exchange error during {operation}: {str(e)}. Retrying in {self.retry_delay}s ({retries}/{self.max_retries})")
-                time.sleep(self.retry_delay)
-            except Exception as e:
-                # For other exceptions, don't retry
-                self.logger.error(f"Error during {operation}: {str(e)}")
-                raise
-        
-        self.logger.error(f"Failed to execute {operation} after {self.max_retries} attempts: {str(last_error)}")
-        raise last_error
+        scheduler = self._get_scheduler()
+        coalesce_key = (operation, args, tuple(sorted(kwargs.items()))) if coalesce else None
+        return scheduler.execute(
+            operation, func, *args,
+            priority=priority,
+            coalesce_key=coalesce_key,
+            max_retries=self.max_retries,
+            base_delay=self.retry_delay,
+            idempotent=idempotent,
+            **kwargs
+        )
+
+    def _get_scheduler(self) -> RequestScheduler:
+        """
+        Get the request scheduler shared by every wrapper using this exchange account.
+        
+        Returns:
+            The RequestScheduler for this exchange and API key
+        """
+        if self.scheduler is None:
+            rate_limit = getattr(self.exchange, 'rateLimit', None)
+            self.scheduler = RequestScheduler.for_account(
+                self.exchange_id,
+                self.api_key,
+                rate_limit if isinstance(rate_limit, (int, float)) else None
+            )
+        return self.scheduler
 
     def create_order(self, pair: str, order_type: str, side: str, amount: float, price: float, params: Dict[str, Any] = {}) -> Dict[str, Any]:
         """
         Create a new order on the exchange.
         
+        The amount and price are rounded to the precision of the pair, taken from the cached
+        markets metadata (see get_market).
+        
         Args:
             pair: Trading pair (e.g., 'BTC/USD')
             order_type: Type of order ('market', 'limit', etc.)
@@ -154,13 +192,124 @@ class BaseExchangeAPI:
         """
         exchange = self._ensure_connection()
         operation = f"create_{side}_{order_type}_order_{pair}"
+        amount, price = self._to_precision(pair, amount, price)
         
         self.logger.info(f"Creating {side} {order_type} order for {amount} {pair} at price {price}")
-        return self._execute_with_retry(
-            operation,
-            exchange.create_order,
-            pair, order_type, side, amount, price, params
-        )
+        try:
+            return self._execute_with_retry(
+                operation,
+                exchange.create_order,
+                pair, order_type, side, amount, price, params,
+                priority=RequestPriority.ORDER,
+                idempotent=False
+            )
+        finally:
+            # The order reserves or moves funds even if its response was lost
+            self.invalidate_balance()
+
+    def submit_orders(self, orders: List[Dict[str, Any]]) -> List[Future]:
+        """
+        Submit several orders without waiting for their acknowledgements.
+        
+        Orders use the ccxt create_orders format (symbol, type, side, amount, price, params).
+        If the exchange has a batch order endpoint they are sent in a single request;
+        otherwise they are sent concurrently, one request each.
+        
+        Args:
+            orders: Orders to submit
+            
+        Returns:
+            One future per order, resolving to the exchange response or raising its error
+        """
+        if not orders:
+            return []
+        exchange = self._ensure_connection()
+        executor = self._get_order_executor()
+        
+        if len(orders) == 1 or not exchange.has.get('createOrders'):
+            return [
+                executor.submit(
+                    self.create_order,
+                    order['symbol'], order['type'], order['side'], order['amount'],
+                    order.get('price'), order.get('params', {})
+                )
+                for order in orders
+            ]
+        
+        self.logger.info(f"Creating {len(orders)} orders in one batch request")
+        batch = executor.submit(self._create_orders_batch, orders)
+        futures = [Future() for _ in orders]
+        
+        def resolve(batch: Future) -> None:
+            error = batch.exception()
+            for index, future in enumerate(futures):
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(batch.result()[index])
+        
+        batch.add_done_callback(resolve)
+        return futures
+
+    def create_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create several orders, using the batch endpoint when available.
+        
+        Args:
+            orders: Orders in the ccxt create_orders format
+            
+        Returns:
+            Exchange responses, in the order of the input
+            
+        Raises:
+            Various exceptions depending on the error
+        """
+        return [future.result() for future in self.submit_orders(orders)]
+
+    def _create_orders_batch(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        exchange = self._ensure_connection()
+        rounded = []
+        for order in orders:
+            amount, price = self._to_precision(order['symbol'], order['amount'], order.get('price'))
+            rounded.append({**order, 'amount': amount, 'price': price})
+        orders = rounded
+        try:
+            return self._execute_with_retry(
+                f"create_orders_{len(orders)}",
+                exchange.create_orders,
+                orders,
+                priority=RequestPriority.ORDER,
+                idempotent=False
+            )
+        finally:
+            self.invalidate_balance()
+
+    def _to_precision(self, pair: str, amount: float, price: Optional[float]) -> Tuple[float, Optional[float]]:
+        """
+        Round an order amount (down, so it never exceeds the balance) and price to the
+        precision of the pair in the cached markets metadata.
+        
+        Args:
+            pair: Trading pair (e.g., 'BTC/USD')
+            amount: Order amount
+            price: Order price, or None
+            
+        Returns:
+            The rounded amount and price
+        """
+        exchange = self._ensure_connection()
+        precision = self.get_market(pair).get('precision') or {}
+        if precision.get('amount') is not None:
+            amount = float(decimal_to_precision(amount, TRUNCATE, precision['amount'], exchange.precisionMode, NO_PADDING))
+        if price is not None and precision.get('price') is not None:
+            price = float(decimal_to_precision(price, ROUND, precision['price'], exchange.precisionMode, NO_PADDING))
+        return amount, price
+
+    def _get_order_executor(self) -> ThreadPoolExecutor:
+        with self._cache_lock:
+            if self._order_executor is None:
+                self._order_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix=f"orders-{self.exchange_id}")
+            return self._order_executor
 
     def get_latest_price(self, pair: str) -> float:
         """
@@ -182,7 +331,8 @@ class BaseExchangeAPI:
         ticker = self._execute_with_retry(
             operation,
             exchange.fetch_ticker,
-            pair
+            pair,
+            coalesce=True
         )
         
         return ticker['last']
@@ -191,6 +341,8 @@ class BaseExchangeAPI:
         """
         Get the account balance for a specific currency.
         
+        All currencies are served from the cached full balance (see get_balances).
+        
         Args:
             currency: Currency code (e.g., 'BTC', 'USD')
             
@@ -201,15 +353,9 @@ class BaseExchangeAPI:
             Various exceptions depending on the error
             KeyError: If the currency is not found in the balance
         """
-        exchange = self._ensure_connection()
-        operation = "get_account_balance"
-        
         self.logger.info(f"Fetching account balance for {currency}")
         try:
-            balance = self._execute_with_retry(
-                operation,
-                exchange.fetch_balance
-            )
+            balance = self.get_balances()
             
             if currency not in balance['total']:
                 self.logger.warning(f"Currency {currency} not found in balance")
@@ -220,7 +366,107 @@ class BaseExchangeAPI:
             self.logger.error(f"Currency {currency} not found in balance: {str(e)}")
             return 0.0
 
-    def get_bars(self, pair: str, timeframe: str, limit: int) -> List[List[float]]:
+    def get_balances(self) -> Dict[str, Any]:
+        """
+        Get the full account balance, fetching it at most once every balance_ttl seconds.
+        
+        Returns:
+            A copy of the balance as returned by ccxt fetch_balance, so callers cannot
+            modify the cached one
+            
+        Raises:
+            Various exceptions depending on the error
+        """
+        with self._cache_lock:
+            if self._balance_cache is not None and time.monotonic() - self._balance_cache[0] < self.balance_ttl:
+                return self._copy_balance(self._balance_cache[1])
+            generation = self._balance_generation
+        
+        exchange = self._ensure_connection()
+        fetched_at = time.monotonic()
+        balance = self._execute_with_retry(
+            "get_account_balance",
+            exchange.fetch_balance,
+            priority=RequestPriority.ACCOUNT
+        )
+        with self._cache_lock:
+            # Keep the cache empty if it was invalidated while the request was in flight
+            if generation == self._balance_generation:
+                self._balance_cache = (fetched_at, balance)
+        return self._copy_balance(balance)
+
+    @staticmethod
+    def _copy_balance(balance: Dict[str, Any]) -> Dict[str, Any]:
+        # ccxt balances nest one level of dicts (per currency and per total/free/used)
+        return {key: dict(value) if isinstance(value, dict) else value for key, value in balance.items()}
+
+    def invalidate_balance(self) -> None:
+        """Drop the cached balance, e.g. after an order was placed, cancelled or filled."""
+        with self._cache_lock:
+            self._balance_cache = None
+            self._balance_generation += 1
+
+    def get_markets(self) -> Dict[str, Any]:
+        """
+        Get the markets metadata (precision, limits, fees) of the exchange.
+        
+        The first call loads the markets; afterwards they are served from the cache and
+        reloaded in a background thread once older than markets_ttl seconds.
+        
+        Returns:
+            Markets by symbol, as returned by ccxt load_markets
+            
+        Raises:
+            Various exceptions depending on the error
+        """
+        with self._cache_lock:
+            cache = self._markets_cache
+            stale = cache is not None and time.monotonic() - cache[0] >= self.markets_ttl
+            if stale and not self._markets_refreshing:
+                self._markets_refreshing = True
+                threading.Thread(target=self._refresh_markets, daemon=True).start()
+        if cache is None:
+            return self._load_markets(reload=False)
+        return cache[1]
+
+    def get_market(self, pair: str) -> Dict[str, Any]:
+        """
+        Get the cached metadata of a trading pair.
+        
+        Args:
+            pair: Trading pair (e.g., 'BTC/USD')
+            
+        Returns:
+            Market metadata
+            
+        Raises:
+            KeyError: If the pair is not listed on the exchange
+        """
+        return self.get_markets()[pair]
+
+    def _load_markets(self, reload: bool) -> Dict[str, Any]:
+        exchange = self._ensure_connection()
+        self.logger.info(f"Loading markets for {self.exchange_id}")
+        markets = self._execute_with_retry(
+            "load_markets",
+            exchange.load_markets,
+            reload,
+            coalesce=True
+        )
+        with self._cache_lock:
+            self._markets_cache = (time.monotonic(), markets)
+        return markets
+
+    def _refresh_markets(self) -> None:
+        try:
+            self._load_markets(reload=True)
+        except Exception as e:
+            self.logger.warning(f"Background markets refresh failed: {str(e)}")
+        finally:
+            with self._cache_lock:
+                self._markets_refreshing = False
+
+    def get_bars(self, pair: str, timeframe: str, limit: int, since: Optional[int] = None) -> List[List[float]]:
         """
         Get OHLCV (Open, High, Low, Close, Volume) bars for a trading pair.
         
@@ -228,6 +474,7 @@ class BaseExchangeAPI:
             pair: Trading pair (e.g., 'BTC/USD')
             timeframe: Timeframe for the bars (e.g., '1m', '1h', '1d')
             limit: Number of bars to retrieve
+            since: Only retrieve bars opened at or after this timestamp (in milliseconds)
             
         Returns:
             List of OHLCV bars in reverse chronological order
@@ -238,12 +485,22 @@ class BaseExchangeAPI:
         exchange = self._ensure_connection()
         operation = f"get_bars_{pair}_{timeframe}"
         
-        self.logger.info(f"Fetching {limit} {timeframe} bars for {pair}")
-        bars = self._execute_with_retry(
-            operation,
-            exchange.fetch_ohlcv,
-            pair, timeframe=timeframe, limit=limit
-        )
+        if since is None:
+            self.logger.info(f"Fetching {limit} {timeframe} bars for {pair}")
+            bars = self._execute_with_retry(
+                operation,
+                exchange.fetch_ohlcv,
+                pair, timeframe=timeframe, limit=limit,
+                coalesce=True
+            )
+        else:
+            self.logger.info(f"Fetching {timeframe} bars for {pair} since {since}")
+            bars = self._execute_with_retry(
+                operation,
+                exchange.fetch_ohlcv,
+                pair, timeframe=timeframe, since=since, limit=limit,
+                coalesce=True
+            )
         
         # Return bars in reverse chronological order (newest first)
         return bars[::-1]
@@ -266,11 +523,35 @@ class BaseExchangeAPI:
         operation = f"get_order_{order_id}"
         
         self.logger.info(f"Fetching order {order_id} for {symbol}")
-        return self._execute_with_retry(
+        order = self._execute_with_retry(
             operation,
             exchange.fetch_order,
-            order_id, symbol
+            order_id, symbol,
+            priority=RequestPriority.ACCOUNT,
+            coalesce=True
         )
+        self._track_fill(order)
+        return order
+
+    def _track_fill(self, order: Dict[str, Any]) -> None:
+        """
+        Invalidate the cached balance when an order has been filled further since last seen.
+        
+        Args:
+            order: Order as returned by ccxt
+        """
+        filled = order.get('filled') if isinstance(order, dict) else None
+        if not isinstance(filled, (int, float)):
+            return
+        with self._cache_lock:
+            previous = self._order_fills.get(order.get('id'), 0.0)
+            if order.get('status') in ('closed', 'canceled', 'expired', 'rejected'):
+                # Final orders will not fill further
+                self._order_fills.pop(order.get('id'), None)
+            else:
+                self._order_fills[order.get('id')] = filled
+        if filled > previous:
+            self.invalidate_balance()
 
     def cancel_order(self, id: str, symbol: str) -> Dict[str, Any]:
         """
@@ -290,11 +571,15 @@ class BaseExchangeAPI:
         operation = f"cancel_order_{id}"
         
         self.logger.info(f"Cancelling order {id} for {symbol}")
-        return self._execute_with_retry(
-            operation,
-            exchange.cancel_order,
-            id, symbol
-        )
+        try:
+            return self._execute_with_retry(
+                operation,
+                exchange.cancel_order,
+                id, symbol,
+                priority=RequestPriority.ORDER
+            )
+        finally:
+            self.invalidate_balance()
     
     def fetch_trades(self, pair: str, since: Optional[int] = None, limit: Optional[int] = None, params: Dict[str, Any] = {}) -> List[Dict[str, Any]]:
         """
@@ -322,6 +607,57 @@ class BaseExchangeAPI:
             pair, since, limit, params
         )
     
+    def fetch_my_trades(self, pair: str, since: Optional[int] = None, limit: Optional[int] = None, params: Dict[str, Any] = {}) -> List[Dict[str, Any]]:
+        """
+        Fetch the account's own trades (fills) for a trading pair.
+        
+        Unlike fetch_trades, which returns the public trades of the market, every trade
+        returned here carries the id of the order it filled.
+        
+        Args:
+            pair: Trading pair (e.g., 'BTC/USD')
+            since: Timestamp in milliseconds to fetch trades from
+            limit: Maximum number of trades to fetch
+            params: Additional parameters specific to the exchange
+            
+        Returns:
+            List of trades
+            
+        Raises:
+            Various exceptions depending on the error
+        """
+        exchange = self._ensure_connection()
+        operation = f"fetch_my_trades_{pair}"
+        
+        self.logger.info(f"Fetching own trades for {pair} (since: {since}, limit: {limit})")
+        return self._execute_with_retry(
+            operation,
+            exchange.fetch_my_trades,
+            pair, since, limit, params,
+            priority=RequestPriority.ACCOUNT
+        )
+    
+    def get_server_time(self) -> int:
+        """
+        Get the exchange clock, to compare with the timestamps of its trades.
+        
+        Returns:
+            Exchange time in milliseconds; the local clock, corrected by the time difference
+            ccxt measured if any, when the exchange has no time endpoint
+            
+        Raises:
+            Various exceptions depending on the error
+        """
+        exchange = self._ensure_connection()
+        if not exchange.has.get('fetchTime'):
+            self.logger.warning(f"{self.exchange_id} has no time endpoint, using the local clock")
+            return int(exchange.milliseconds() - exchange.options.get('timeDifference', 0))
+        return int(self._execute_with_retry(
+            "get_server_time",
+            exchange.fetch_time,
+            priority=RequestPriority.ACCOUNT
+        ))
+    
     def get_exchange_info(self) -> Dict[str, Any]:
         """
         Get information about the exchange.
@@ -8,16 +8,22 @@ Indicator objects that can be used by strategies to make trading decisions.
 The module supports two main categories of indicators:
 1. Price indicators: Based on price data (e.g., moving averages, Bollinger Bands)
 2. Extra indicators: Additional metrics (e.g., RSI, volume, momentum)
+
+BatchIndicators computes the rolling indicators for many series and window lengths at once,
+for parameter sweeps and strategies using several windows.
 """
 
-from typing import Type, Union, List, Optional
+from typing import Type, Union, List, Optional, Tuple
+from functools import lru_cache
 from enum import Enum, auto
 
 import pandas as pd
 import numpy as np
+from scipy.signal import lfilter
 from pydantic import BaseModel
 
 from definitions import MarketData
+from validation import ValidationPolicy
 
 
 class IndicatorTypes:
@@ -42,12 +48,9 @@ class IndicatorTypes:
         VOLUME_SMA = auto()
 
 
-class Indicator(BaseModel):
+class IndicatorModel(BaseModel):
     """
-    Standard container for indicator data.
-    
-    This class provides a consistent interface for all indicators,
-    making them easier to use in strategies and visualization.
+    Validated form of an indicator, for plotting and serialization boundaries.
     
     Attributes:
         name: Unique identifier for the indicator
@@ -62,6 +65,71 @@ class Indicator(BaseModel):
         arbitrary_types_allowed = True
 
 
+class Indicator:
+    """
+    Standard container for indicator data.
+    
+    This class provides a consistent interface for all indicators,
+    making them easier to use in strategies and visualization.
+    
+    Strategies build several indicators per bar, so this is a plain __slots__ object with no
+    validation, backed by a NumPy array. The pandas Series is only built when result is
+    read; to_model() returns the validated IndicatorModel.
+    
+    Attributes:
+        name: Unique identifier for the indicator
+        type: Category and type of the indicator
+        values: Array with the calculated indicator values
+        index: Index of the values (that of the market data), None for a range index
+    """
+    __slots__ = ('name', 'type', 'values', 'index', '_result')
+
+    def __init__(
+        self,
+        name: str,
+        type: Union[IndicatorTypes.Price, IndicatorTypes.Extra],
+        result: Optional[pd.Series] = None,
+        values: Optional[np.ndarray] = None,
+        index: Optional[pd.Index] = None
+    ) -> None:
+        """
+        Args:
+            name: Unique identifier for the indicator
+            type: Category and type of the indicator
+            result: Series with the values; its array and index are used as they are
+            values: Array with the values, when there is no Series
+            index: Index of values
+        """
+        if result is not None:
+            values, index = result.to_numpy(), result.index
+        elif values is None:
+            raise ValueError(f"Indicator {name} needs a result Series or values")
+        self.name = name
+        self.type = type
+        self.values = values
+        self.index = index
+        self._result = result
+
+    @property
+    def result(self) -> pd.Series:
+        """Values as a Series, built on first access without copying them."""
+        if self._result is None:
+            self._result = pd.Series(self.values, index=self.index, copy=False)
+        return self._result
+
+    @property
+    def last(self) -> float:
+        """Latest value, what strategies read on every bar."""
+        return self.values[-1]
+
+    def to_model(self) -> IndicatorModel:
+        """Validated IndicatorModel, subject to the global ValidationPolicy as a boundary object."""
+        return ValidationPolicy.build_model(IndicatorModel, boundary=True, name=self.name, type=self.type, result=self.result)
+
+    def __repr__(self) -> str:
+        return f"Indicator(name={self.name!r}, type={self.type}, last={self.values[-1] if len(self.values) else None})"
+
+
 class Indicators:
     """
     Collection of technical indicators for trading strategies.
@@ -124,11 +192,13 @@ class Indicators:
             >>> print(f"Latest values - Middle: {middle.result.iloc[-1]}, "
                       f"Upper: {upper.result.iloc[-1]}, Lower: {lower.result.iloc[-1]}")
         """
-        sma = data['close'].rolling(window=window).mean()
-        std = data['close'].rolling(window=window).std()
+        close = data['close'].to_numpy(dtype=np.float64)
+        middle = IndicatorKernels.rolling_mean(close, window)
+        deviation = IndicatorKernels.rolling_std(close, window) * num_std
         
-        upper_band = sma + (std * num_std)
-        lower_band = sma - (std * num_std)
+        sma = pd.Series(middle, index=data.index, name='close')
+        upper_band = pd.Series(middle + deviation, index=data.index, name='close')
+        lower_band = pd.Series(middle - deviation, index=data.index, name='close')
         
         return [
             Indicator(
@@ -230,24 +300,42 @@ class Indicators:
             >>> elif latest_rsi > 70:
             ...     print("Overbought condition detected")
         """
-        delta = data['close'].diff()
-        
-        # Separate gains and losses
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
+        rsi = IndicatorKernels.rsi(data['close'].to_numpy(dtype=np.float64), window)
         
-        # Calculate average gain and loss
-        avg_gain = gain.rolling(window=window).mean()
-        avg_loss = loss.rolling(window=window).mean()
+        return Indicator(
+            name=f'rsi_{window}',
+            type=IndicatorTypes.Extra.RELATIVE_STRENGTH_INDEX,
+            values=rsi,
+            index=data.index
+        )
+    
+    @staticmethod
+    def calculate_wilder_rsi(
+        data: Type[MarketData], 
+        window: int = 14
+    ) -> Indicator:
+        """
+        Calculate the Relative Strength Index with Wilder's smoothing.
         
-        # Calculate RS and RSI
-        rs = avg_gain / avg_loss.replace(0, np.finfo(float).eps)  # Avoid division by zero
-        rsi = 100 - (100 / (1 + rs))
+        Unlike calculate_rsi, which averages the last window changes, gains and losses are
+        smoothed recursively as in Wilder's original definition (the usual charting RSI).
         
+        Args:
+            data: Market data containing OHLCV information
+            window: Smoothing period
+            
+        Returns:
+            Indicator object containing the calculated RSI
+            
+        Example:
+            >>> rsi = Indicators.calculate_wilder_rsi(market_data)
+            >>> print(f"Latest RSI: {rsi.result.iloc[-1]:.1f}")
+        """
         return Indicator(
-            name=f'rsi_{window}',
+            name=f'wilder_rsi_{window}',
             type=IndicatorTypes.Extra.RELATIVE_STRENGTH_INDEX,
-            result=rsi
+            values=IndicatorKernels.wilder_rsi(data['close'].to_numpy(dtype=np.float64), window),
+            index=data.index
         )
     
     @staticmethod
@@ -393,20 +481,452 @@ class Indicators:
             >>> stop_loss = entry_price - (2 * atr.result.iloc[-1])
             >>> print(f"Stop loss price: {stop_loss}")
         """
-        high = data['high']
-        low = data['low']
-        close = data['close']
-        
-        # Calculate true range
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(window=window).mean()
+        atr = IndicatorKernels.atr(
+            data['high'].to_numpy(dtype=np.float64),
+            data['low'].to_numpy(dtype=np.float64),
+            data['close'].to_numpy(dtype=np.float64),
+            window
+        )
         
         return Indicator(
             name=f'atr_{window}',
             type=IndicatorTypes.Extra.VOLUME_SMA,  # Reusing existing type
-            result=atr
+            values=atr,
+            index=data.index
+        )
+
+
+class BatchIndicators:
+    """
+    Indicators computed for many price series and many window lengths in a single pass.
+
+    Methods take a 1-D (time) or 2-D (series x time) array and one or more window lengths,
+    and return a (series x window x time) array. Rolling sums come from one cumulative sum
+    per series, from which every window is a single vectorized difference, so a window costs
+    one subtraction instead of a rolling pass. Deviations are the exception: they use the
+    IndicatorKernels variance per series and window, as the sum-of-squares formula is not
+    stable. Values without a full window of history are NaN, as in the pandas rolling
+    versions of Indicators.
+    """
+
+    @staticmethod
+    def rolling_mean(values: np.ndarray, windows: Union[int, List[int]]) -> np.ndarray:
+        """
+        Simple moving average of every series over every window.
+
+        Args:
+            values: Array of shape (time,) or (series, time)
+            windows: Window length or list of window lengths
+
+        Returns:
+            Array of shape (series, window, time)
+
+        Example:
+            >>> closes = np.stack([pair_a['close'], pair_b['close']])
+            >>> smas = BatchIndicators.rolling_mean(closes, [10, 50, 100, 200])
+            >>> smas[1, 3, -1]  # latest 200-bar SMA of the second pair
+        """
+        values, windows = BatchIndicators._prepare(values, windows)
+        # Same centering as IndicatorKernels.rolling_mean, so both round alike
+        offset = IndicatorKernels._centering_offset(values)
+        return BatchIndicators._rolling_sum(values - offset, windows) / windows[:, None] + offset[:, None]
+
+    @staticmethod
+    def rolling_std(values: np.ndarray, windows: Union[int, List[int]], ddof: int = 1) -> np.ndarray:
+        """
+        Rolling standard deviation of every series over every window.
+
+        Args:
+            values: Array of shape (time,) or (series, time)
+            windows: Window length or list of window lengths
+            ddof: Delta degrees of freedom (1, the sample deviation, as pandas)
+
+        Returns:
+            Array of shape (series, window, time)
+        """
+        values, windows = BatchIndicators._prepare(values, windows)
+        # The sum-of-squares formula of the prefix sums cancels once prices trend away from
+        # the centering offset, so every window goes through the exact/anchored M2 kernel
+        result = np.empty((values.shape[0], len(windows), values.shape[1]))
+        for series, series_values in enumerate(values):
+            for index, window in enumerate(windows):
+                result[series, index] = IndicatorKernels.rolling_std(series_values, int(window), ddof)
+        return result
+
+    @staticmethod
+    def bollinger_bands(
+        values: np.ndarray,
+        windows: Union[int, List[int]],
+        num_std: float = 2.0
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Middle, upper and lower Bollinger Bands for every series and window.
+
+        Args:
+            values: Array of shape (time,) or (series, time)
+            windows: Window length or list of window lengths
+            num_std: Number of standard deviations for the upper and lower bands
+
+        Returns:
+            Middle, upper and lower bands, each of shape (series, window, time)
+        """
+        middle = BatchIndicators.rolling_mean(values, windows)
+        deviation = BatchIndicators.rolling_std(values, windows) * num_std
+        return middle, middle + deviation, middle - deviation
+
+    @staticmethod
+    def rsi(values: np.ndarray, windows: Union[int, List[int]]) -> np.ndarray:
+        """
+        Relative Strength Index with simple averages, as Indicators.calculate_rsi.
+
+        Args:
+            values: Array of shape (time,) or (series, time)
+            windows: Window length or list of window lengths
+
+        Returns:
+            Array of shape (series, window, time) with values between 0 and 100
+        """
+        values, windows = BatchIndicators._prepare(values, windows)
+        delta = np.diff(values, axis=1, prepend=values[:, :1])
+        gains = BatchIndicators._rolling_sum(np.maximum(delta, 0), windows)
+        losses = BatchIndicators._rolling_sum(np.maximum(-delta, 0), windows)
+        # Zero-loss windows are decided per series and window by the same rule as IndicatorKernels.rsi
+        result = np.empty_like(gains)
+        for series in range(gains.shape[0]):
+            for index in range(gains.shape[1]):
+                result[series, index] = IndicatorKernels._relative_strength(gains[series, index], losses[series, index], np.float64)
+        return result
+
+    @staticmethod
+    def velocity(values: np.ndarray, windows: Union[int, List[int]]) -> np.ndarray:
+        """
+        Velocity as Indicators.calculate_velocity: the mean of the last window differences.
+
+        The mean of consecutive differences telescopes to (x[t] - x[t - window]) / window,
+        so no rolling sum is needed.
+
+        Args:
+            values: Array of shape (time,) or (series, time)
+            windows: Window length or list of window lengths
+
+        Returns:
+            Array of shape (series, window, time)
+        """
+        values, windows = BatchIndicators._prepare(values, windows)
+        return BatchIndicators._lagged_difference(values, windows) / windows[:, None]
+
+    @staticmethod
+    def moving_averages(data: Type[MarketData], windows: List[int], column: str = 'close') -> List[Indicator]:
+        """
+        Simple moving averages of one column for several windows, as Indicator objects.
+
+        Equivalent to calling Indicators.calculate_moving_average once per window.
+
+        Args:
+            data: Market data containing OHLCV information
+            windows: Window lengths
+            column: Column to average
+
+        Returns:
+            One Indicator per window, in the order of windows
+        """
+        averages = BatchIndicators.rolling_mean(data[column].to_numpy(dtype=np.float64), windows)[0]
+        prefix = 'ma' if column == 'close' else f'{column}_sma'
+        return [
+            Indicator(
+                name=f'{prefix}_{window}',
+                type=IndicatorTypes.Price.SIMPLE_MOVING_AVERAGE if column == 'close' else IndicatorTypes.Extra.VOLUME_SMA,
+                values=average,
+                index=data.index
+            )
+            for window, average in zip(windows, averages)
+        ]
+
+    @staticmethod
+    def _prepare(values: np.ndarray, windows: Union[int, List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+        values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+        windows = np.atleast_1d(np.asarray(windows, dtype=np.int64))
+        if (windows < 1).any():
+            raise ValueError("Window lengths must be positive")
+        return values, windows
+
+    @staticmethod
+    def _rolling_sum(values: np.ndarray, windows: np.ndarray) -> np.ndarray:
+        """Sums over the last window values, NaN until a full window is available."""
+        cumulative = np.zeros((values.shape[0], values.shape[1] + 1))
+        np.cumsum(values, axis=1, out=cumulative[:, 1:])
+        return BatchIndicators._lagged_difference(cumulative, windows)[:, :, 1:]
+
+    @staticmethod
+    def _lagged_difference(values: np.ndarray, windows: np.ndarray) -> np.ndarray:
+        """values[t] - values[t - window] for every window, NaN for the first window values."""
+        result = np.full((values.shape[0], len(windows), values.shape[1]), np.nan)
+        for index, window in enumerate(windows):
+            # Slices of the same array, written in place: no gathered copies per window
+            np.subtract(values[:, window:], values[:, :-window], out=result[:, index, window:])
+        return result
+
+
+class IndicatorKernels:
+    """
+    NumPy kernels for single-series rolling indicators, without intermediate Series.
+
+    Every kernel takes plain arrays and a dtype (np.float64 or np.float32) for its inputs,
+    work arrays and result; float32 halves the memory traffic. Rolling sums are read from
+    prefix sums of values centered on their mean, accumulated in float64 in both modes. The
+    variance never uses the sum-of-squares formula, which cancels catastrophically when the
+    variance is small next to the price level (see rolling_var). Values without enough
+    history are NaN, as in the pandas versions.
+    """
+    # Windows up to this length get an exact two-pass variance
+    EXACT_WINDOW = 16
+    # Values between the exact M2 anchors of the sliding variance
+    ANCHOR_EVERY = 1024
+
+    @staticmethod
+    def rolling_mean(values: np.ndarray, window: int, dtype: type = np.float64) -> np.ndarray:
+        """Simple moving average over the last window values."""
+        values = np.asarray(values, dtype=dtype)
+        offset = IndicatorKernels._centering_offset(values)
+        return (IndicatorKernels._rolling_sum(values - offset, window) / window + offset).astype(dtype, copy=False)
+
+    @staticmethod
+    def rolling_var(values: np.ndarray, window: int, ddof: int = 1, dtype: type = np.float64) -> np.ndarray:
+        """
+        Rolling variance over the last window values.
+
+        Short windows are computed exactly, summing the squared deviations from the rolling
+        mean with one pass per lag. Long windows use Welford's sliding update, M2[t] = M2[t - 1] + (x_new - x_old) *
+        (x_new - mean[t] + x_old - mean[t - 1]), with the increments accumulated by a cumulative
+        sum from an exact M2 every anchor_every values, which bounds the rounding drift.
+
+        Args:
+            values: Input series
+            window: Number of values per window
+            ddof: Delta degrees of freedom (1, the sample variance, as pandas)
+            dtype: Floating type of the computation and the result
+        """
+        values = np.asarray(values, dtype=dtype)
+        n = len(values)
+        result = np.full(n, np.nan, dtype=dtype)
+        if window < 1:
+            raise ValueError("Window length must be positive")
+        if window <= ddof or n < window:
+            return result
+
+        # Centered values keep the rolling means precise to the scale of the moves, not the price
+        x = values.astype(np.float64, copy=False)
+        x = x - IndicatorKernels._centering_offset(x)
+        mean = IndicatorKernels._rolling_sum(x, window) / window
+
+        if window <= IndicatorKernels.EXACT_WINDOW:
+            # One contiguous pass per lag: sum of (x[t - lag] - mean[t]) ** 2
+            current = mean[window - 1:]
+            m2 = np.zeros(n - window + 1)
+            deviation = np.empty_like(m2)
+            for lag in range(window):
+                np.subtract(x[window - 1 - lag:n - lag], current, out=deviation)
+                m2 += deviation * deviation
+            result[window - 1:] = m2 / (window - ddof)
+            return result
+
+        increments = np.zeros(n)
+        increments[window:] = (x[window:] - x[:-window]) * (x[window:] - mean[window:] + x[:-window] - mean[window - 1:-1])
+        accumulated = np.cumsum(increments)
+
+        m2 = accumulated[window - 1:].copy()
+        for start in range(0, len(m2), IndicatorKernels.ANCHOR_EVERY):
+            anchor = window - 1 + start
+            exact = np.square(x[anchor - window + 1:anchor + 1] - mean[anchor]).sum()
+            m2[start:start + IndicatorKernels.ANCHOR_EVERY] += exact - accumulated[anchor]
+        result[window - 1:] = np.maximum(m2, 0) / (window - ddof)
+        return result
+
+    @staticmethod
+    def rolling_std(values: np.ndarray, window: int, ddof: int = 1, dtype: type = np.float64) -> np.ndarray:
+        """Rolling standard deviation over the last window values."""
+        return np.sqrt(IndicatorKernels.rolling_var(values, window, ddof, dtype))
+
+    @staticmethod
+    def wilder_smooth(values: np.ndarray, window: int, dtype: type = np.float64) -> np.ndarray:
+        """
+        Wilder's smoothing: seeded with the mean of the first window values, then
+        avg[t] = avg[t - 1] + (x[t] - avg[t - 1]) / window, as a linear filter in one pass.
+        """
+        values = np.asarray(values, dtype=dtype)
+        result = np.full(len(values), np.nan, dtype=dtype)
+        if len(values) < window:
+            return result
+        alpha = 1.0 / window
+        seed = values[:window].mean(dtype=np.float64)
+        result[window - 1] = seed
+        if len(values) > window:
+            smoothed, _ = lfilter(
+                np.array([alpha], dtype=dtype), np.array([1.0, alpha - 1.0], dtype=dtype),
+                values[window:], zi=np.array([(1.0 - alpha) * seed], dtype=dtype)
+            )
+            result[window:] = smoothed
+        return result
+
+    @staticmethod
+    def rsi(close: np.ndarray, window: int = 14, dtype: type = np.float64) -> np.ndarray:
+        """Relative Strength Index with simple averages of the last window changes, as Indicators.calculate_rsi."""
+        gains, losses = IndicatorKernels._gains_losses(close, dtype)
+        return IndicatorKernels._relative_strength(
+            IndicatorKernels._rolling_sum(gains, window),
+            IndicatorKernels._rolling_sum(losses, window),
+            dtype
         )
+
+    @staticmethod
+    def wilder_rsi(close: np.ndarray, window: int = 14, dtype: type = np.float64) -> np.ndarray:
+        """Relative Strength Index with Wilder-smoothed gains and losses (Wilder's original definition)."""
+        gains, losses = IndicatorKernels._gains_losses(close, dtype)
+        # The first change is undefined; Wilder's seed is the mean of the next window changes
+        result = np.full(len(gains), np.nan, dtype=dtype)
+        result[1:] = IndicatorKernels._relative_strength(
+            IndicatorKernels.wilder_smooth(gains[1:], window, dtype),
+            IndicatorKernels.wilder_smooth(losses[1:], window, dtype),
+            dtype
+        )
+        return result
+
+    @staticmethod
+    def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray, dtype: type = np.float64) -> np.ndarray:
+        """True range: the largest of high - low and the gaps from the previous close."""
+        high, low, close = (np.asarray(values, dtype=dtype) for values in (high, low, close))
+        result = high - low
+        if len(result) > 1:
+            previous = close[:-1]
+            np.maximum(result[1:], np.abs(high[1:] - previous), out=result[1:])
+            np.maximum(result[1:], np.abs(low[1:] - previous), out=result[1:])
+        return result
+
+    @staticmethod
+    def atr(
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        window: int = 14,
+        wilder: bool = False,
+        dtype: type = np.float64
+    ) -> np.ndarray:
+        """
+        Average True Range.
+
+        Args:
+            high: High prices
+            low: Low prices
+            close: Close prices
+            window: Number of periods to average
+            wilder: Use Wilder's smoothing instead of the simple average of Indicators.calculate_atr
+            dtype: Floating type of the computation and the result
+        """
+        true_range = IndicatorKernels.true_range(high, low, close, dtype)
+        if wilder:
+            return IndicatorKernels.wilder_smooth(true_range, window, dtype)
+        return IndicatorKernels.rolling_mean(true_range, window, dtype)
+
+    @staticmethod
+    def _centering_offset(values: np.ndarray) -> np.ndarray:
+        """
+        float64 mean of the finite values along the last axis (0 if there are none), kept as
+        a length-1 axis. Prefix sums of the values minus it stay small; IndicatorKernels and
+        BatchIndicators both center with it, so their rolling sums round alike.
+        """
+        finite = np.isfinite(values)
+        total = np.where(finite, values, 0).sum(axis=-1, keepdims=True, dtype=np.float64)
+        count = finite.sum(axis=-1, keepdims=True)
+        return np.divide(total, count, out=np.zeros(total.shape), where=count > 0)
+
+    @staticmethod
+    def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+        """float64 sums over the last window values, NaN until a full window is available."""
+        if window < 1:
+            raise ValueError("Window length must be positive")
+        cumulative = np.zeros(len(values) + 1)
+        np.cumsum(values, out=cumulative[1:])
+        result = np.full(len(values), np.nan)
+        np.subtract(cumulative[window:], cumulative[:-window], out=result[window - 1:])
+        return result
+
+    @staticmethod
+    def _gains_losses(close: np.ndarray, dtype: type) -> Tuple[np.ndarray, np.ndarray]:
+        close = np.asarray(close, dtype=dtype)
+        delta = np.zeros(len(close), dtype=dtype)
+        np.subtract(close[1:], close[:-1], out=delta[1:])
+        return np.maximum(delta, 0), np.maximum(-delta, 0)
+
+    @staticmethod
+    def _relative_strength(gain: np.ndarray, loss: np.ndarray, dtype: type) -> np.ndarray:
+        # Window sums of exact zeros may come out as tiny residues of the prefix sums
+        scale = np.finfo(dtype).eps * 64 * max(np.nanmax(gain, initial=0), np.nanmax(loss, initial=0), 1e-300)
+        loss = np.where(loss <= scale, np.finfo(float).eps, loss)
+        return (100 - 100 / (1 + gain / loss)).astype(dtype, copy=False)
+
+
+class LatestIndicators:
+    """
+    Latest value of an indicator, computed from the tail of the data only.
+
+    Per-bar strategy decisions only read the final value of each indicator; these functions
+    return it with O(window) work on the last elements instead of a full rolling Series.
+    Each returns the same value as the last element of the matching Indicators method, or
+    NaN when there is not enough data.
+    """
+
+    @staticmethod
+    def sma(values: np.ndarray, window: int) -> float:
+        """Simple moving average of the last window values."""
+        if len(values) < window:
+            return np.nan
+        return float(np.mean(values[-window:]))
+
+    @staticmethod
+    def ema(values: np.ndarray, window: int) -> float:
+        """
+        Exponential moving average (span = window, as Indicators.calculate_exponential_moving_average).
+
+        The recursion depends on every value, so this is a single dot product with cached
+        exponential weights rather than a tail computation.
+        """
+        if len(values) == 0:
+            return np.nan
+        return float(np.dot(LatestIndicators._ema_weights(window, len(values)), values))
+
+    @staticmethod
+    def rsi(values: np.ndarray, window: int = 14) -> float:
+        """RSI with simple averages of the last window changes, as Indicators.calculate_rsi."""
+        if len(values) < window:
+            return np.nan
+        # With exactly window values the first change is undefined and counts as zero, as in calculate_rsi
+        delta = np.diff(values[-window - 1:]) if len(values) > window else np.diff(values)
+        gain = delta[delta > 0].sum()
+        loss = -delta[delta < 0].sum()
+        if loss == 0:
+            loss = np.finfo(float).eps
+        return float(100 - 100 / (1 + gain / loss))
+
+    @staticmethod
+    def velocity(values: np.ndarray, window: int) -> float:
+        """Mean of the last window changes, as Indicators.calculate_velocity."""
+        if len(values) <= window:
+            return np.nan
+        return float((values[-1] - values[-1 - window]) / window)
+
+    @staticmethod
+    def acceleration(values: np.ndarray, window: int) -> float:
+        """Acceleration of the values themselves, as calculate_acceleration of calculate_velocity."""
+        if len(values) <= 2 * window:
+            return np.nan
+        return float((values[-1] - 2 * values[-1 - window] + values[-1 - 2 * window]) / window ** 2)
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _ema_weights(window: int, length: int) -> np.ndarray:
+        alpha = 2 / (window + 1)
+        weights = alpha * (1 - alpha) ** np.arange(length - 1, -1, -1, dtype=np.float64)
+        # The first value seeds the recursion with the weight left over by the others
+        weights[0] = (1 - alpha) ** (length - 1)
+        weights.setflags(write=False)
+        return weights
@@ -0,0 +1,182 @@
+import os
+import time
+import bisect
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+class LatencyHistogram:
+    """
+    Latency distribution of one stage: cumulative Prometheus buckets since start plus a
+    rolling window of the latest samples for quantiles.
+    """
+    # Upper bounds in seconds, from sub-millisecond computations to multi-second API calls
+    BUCKETS: Tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self, window: int = 1000) -> None:
+        """
+        Args:
+            window: Number of latest samples kept for quantiles
+        """
+        self.counts: List[int] = [0] * (len(self.BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.recent: Deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.recent.append(seconds)
+
+    def quantiles(self, qs: Tuple[float, ...] = (0.5, 0.95, 0.99)) -> Dict[float, float]:
+        """Quantiles of the rolling window, in seconds."""
+        if not self.recent:
+            return {q: float('nan') for q in qs}
+        values = np.quantile(np.fromiter(self.recent, dtype=np.float64), qs)
+        return dict(zip(qs, values.tolist()))
+
+
+class LatencyTracker:
+    """
+    Per-stage timing spans of the live loop, exposed in the Prometheus text format.
+
+    Stages are timed with `with tracker.span('bar_fetch'):`; spans may nest (e.g. the
+    indicators span runs inside the strategy span), each stage gets its own histogram.
+    The metrics can be scraped from serve() or written to a file for the node_exporter
+    textfile collector with write_textfile(). A disabled tracker makes spans no-ops, which
+    is the default for the shared tracker so backtests pay nothing for the instrumentation.
+    """
+    METRIC = 'trading_bot_stage_latency_seconds'
+    _shared: Optional['LatencyTracker'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, enabled: bool = True, window: int = 1000) -> None:
+        """
+        Args:
+            enabled: Whether spans are recorded
+            window: Number of latest samples per stage kept for quantiles
+        """
+        self.enabled = enabled
+        self.window = window
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.logger = logging.getLogger("LatencyTracker")
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @classmethod
+    def shared(cls) -> 'LatencyTracker':
+        """Process-wide tracker used by the trading components; disabled until enabled."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(enabled=False)
+            return cls._shared
+
+    def span(self, stage: str):
+        """Context manager timing the enclosed block as one sample of a stage."""
+        if not self.enabled:
+            return nullcontext()
+        return self._span(stage)
+
+    @contextmanager
+    def _span(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Record a sample of a stage, in seconds."""
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = LatencyHistogram(self.window)
+            histogram.observe(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Count, mean and rolling quantiles of every stage, in seconds."""
+        with self._lock:
+            return {
+                stage: {
+                    'count': histogram.count,
+                    'mean': histogram.sum / histogram.count,
+                    **{f'p{int(q * 100)}': value for q, value in histogram.quantiles().items()}
+                }
+                for stage, histogram in self.histograms.items()
+            }
+
+    def render(self) -> str:
+        """Metrics in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {self.METRIC} Time spent in each stage of the live trading loop.",
+            f"# TYPE {self.METRIC} histogram",
+        ]
+        with self._lock:
+            for stage, histogram in sorted(self.histograms.items()):
+                cumulative = np.cumsum(histogram.counts)
+                for bound, count in zip(LatencyHistogram.BUCKETS, cumulative):
+                    lines.append(f'{self.METRIC}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'{self.METRIC}_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{self.METRIC}_sum{{stage="{stage}"}} {histogram.sum}')
+                lines.append(f'{self.METRIC}_count{{stage="{stage}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Union[str, Path]) -> None:
+        """
+        Write the metrics to a file, atomically so a collector never reads a partial file.
+
+        Args:
+            path: Destination file (e.g. in the node_exporter textfile directory)
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}")
+        with os.fdopen(fd, 'w') as file:
+            file.write(self.render())
+        os.replace(temporary, path)
+
+    def serve(self, port: int = 8000, host: str = '0.0.0.0') -> ThreadingHTTPServer:
+        """
+        Serve the metrics over HTTP from a daemon thread and enable the tracker.
+
+        Args:
+            port: Port to listen on
+            host: Interface to bind
+
+        Returns:
+            The running server
+        """
+        tracker = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                body = tracker.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+        self.enabled = True
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self._server.serve_forever, name="latency-metrics", daemon=True).start()
+        self.logger.info(f"Serving latency metrics on {host}:{self._server.server_address[1]}")
+        return self._server
+
+    def shutdown(self) -> None:
+        """Stop the metrics server, if running."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
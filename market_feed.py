@@ -0,0 +1,201 @@
+import time
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Any
+
+import ccxt.pro
+import pandas as pd
+
+BarCallback = Callable[[str, List[float]], None]
+TickCallback = Callable[[str, float], None]
+
+class MarketFeed(ABC):
+    """
+    Event-driven source of market data.
+
+    Subscribers are called with (pair, bar) for every closed bar, in ccxt format
+    [timestamp_ms, open, high, low, close, volume], and with (pair, price) for every tick.
+    Feeds push the bar that is still forming through _push_bar; it is only delivered once
+    a bar with a newer timestamp arrives, which is the moment it closed.
+    """
+
+    def __init__(self) -> None:
+        self._bar_callbacks: List[BarCallback] = []
+        self._tick_callbacks: List[TickCallback] = []
+        self._forming: Dict[str, List[float]] = {}
+        self._running = False
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def on_bar(self, callback: BarCallback) -> None:
+        """Subscribe to closed bars."""
+        self._bar_callbacks.append(callback)
+
+    def on_tick(self, callback: TickCallback) -> None:
+        """Subscribe to ticks (last traded price)."""
+        self._tick_callbacks.append(callback)
+
+    @abstractmethod
+    def run(self) -> None:
+        """Stream market data, blocking until stop() is called or the feed ends."""
+
+    def stop(self) -> None:
+        """Stop streaming after the current event."""
+        self._running = False
+
+    def _push_bar(self, pair: str, bar: List[float]) -> None:
+        forming = self._forming.get(pair)
+        if forming is not None and bar[0] > forming[0]:
+            self._emit_bar(pair, forming)
+        if forming is None or bar[0] >= forming[0]:
+            self._forming[pair] = list(bar)
+
+    def _emit_bar(self, pair: str, bar: List[float]) -> None:
+        for callback in self._bar_callbacks:
+            try:
+                callback(pair, bar)
+            except Exception as e:
+                self.logger.error(f"Error in bar callback for {pair}: {str(e)}")
+
+    def _emit_tick(self, pair: str, price: float) -> None:
+        for callback in self._tick_callbacks:
+            try:
+                callback(pair, price)
+            except Exception as e:
+                self.logger.error(f"Error in tick callback for {pair}: {str(e)}")
+
+
+class CcxtProFeed(MarketFeed):
+    """
+    Websocket feed using the watch_ohlcv and watch_ticker streams of ccxt.pro.
+
+    Closed bars are delivered as soon as the exchange pushes the first update of the next
+    bar, instead of waiting for the next REST poll. Callbacks run in order on a worker
+    thread, so a callback that blocks (REST calls, order placement) does not stall the
+    streams of the event loop or their keepalives.
+    """
+
+    def __init__(
+        self,
+        exchange_id: str,
+        pairs: List[str],
+        timeframe: str = '1m',
+        watch_ticks: bool = True,
+        options: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Args:
+            exchange_id: The CCXT exchange identifier (e.g., 'bitget')
+            pairs: Trading pairs to stream
+            timeframe: Timeframe of the bars
+            watch_ticks: Whether to stream ticks as well as bars
+            options: Additional options to pass to the ccxt.pro exchange constructor
+        """
+        super().__init__()
+        self.exchange_id = exchange_id
+        self.pairs = pairs
+        self.timeframe = timeframe
+        self.watch_ticks = watch_ticks
+        self.options = options or {}
+        self.reconnect_delay = 1  # seconds, doubled after each failed reconnection
+        self.max_reconnect_delay = 60
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._callback_executor: Optional[ThreadPoolExecutor] = None
+
+    def run(self) -> None:
+        asyncio.run(self._run())
+
+    async def _run(self) -> None:
+        self._running = True
+        self._loop = asyncio.get_running_loop()
+        # A single worker keeps the callbacks in the order of the events
+        self._callback_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"feed-{self.exchange_id}")
+        exchange = getattr(ccxt.pro, self.exchange_id)(self.options)
+        try:
+            watchers = [self._watch(pair, self._watch_bars, exchange) for pair in self.pairs]
+            if self.watch_ticks:
+                watchers += [self._watch(pair, self._watch_ticker, exchange) for pair in self.pairs]
+            await asyncio.gather(*watchers)
+        finally:
+            await exchange.close()
+            executor, self._callback_executor = self._callback_executor, None
+            # Let the callbacks already dispatched finish
+            await self._loop.run_in_executor(None, executor.shutdown)
+            self._loop = None
+
+    def _emit_bar(self, pair: str, bar: List[float]) -> None:
+        self._dispatch(super()._emit_bar, pair, bar)
+
+    def _emit_tick(self, pair: str, price: float) -> None:
+        self._dispatch(super()._emit_tick, pair, price)
+
+    def _dispatch(self, emit: Callable, *args: Any) -> None:
+        if self._callback_executor is None:
+            emit(*args)
+        else:
+            self._loop.run_in_executor(self._callback_executor, emit, *args)
+
+    async def _watch(self, pair: str, watcher: Callable, exchange) -> None:
+        delay = self.reconnect_delay
+        while self._running:
+            try:
+                await watcher(pair, exchange)
+                delay = self.reconnect_delay
+            except Exception as e:
+                self.logger.warning(f"Stream error for {pair}: {str(e)}. Reconnecting in {delay}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _watch_bars(self, pair: str, exchange) -> None:
+        bars = await exchange.watch_ohlcv(pair, self.timeframe)
+        for bar in bars:
+            self._push_bar(pair, bar)
+
+    async def _watch_ticker(self, pair: str, exchange) -> None:
+        ticker = await exchange.watch_ticker(pair)
+        if ticker.get('last') is not None:
+            self._emit_tick(pair, float(ticker['last']))
+
+
+class ReplayFeed(MarketFeed):
+    """
+    Local stand-in for a live feed that replays stored market data.
+
+    Every bar is first pushed as forming and closed by the next one, as a live stream
+    would, and its close is emitted as a tick. Useful in tests and dry runs.
+    """
+
+    def __init__(self, data: Dict[str, pd.DataFrame], delay: float = 0.0) -> None:
+        """
+        Args:
+            data: Market data to replay per pair
+            delay: Seconds to wait between bars
+        """
+        super().__init__()
+        self.data = data
+        self.delay = delay
+
+    def run(self) -> None:
+        self._running = True
+        streams = {pair: self._to_bars(df) for pair, df in self.data.items()}
+        for index in range(max((len(bars) for bars in streams.values()), default=0)):
+            if not self._running:
+                return
+            for pair, bars in streams.items():
+                if index < len(bars):
+                    self._push_bar(pair, bars[index])
+                    self._emit_tick(pair, bars[index][4])
+            if self.delay:
+                time.sleep(self.delay)
+        # The stream ended, so the last bars are closed as well
+        for pair, bar in self._forming.items():
+            self._emit_bar(pair, bar)
+        self._forming.clear()
+        self._running = False
+
+    @staticmethod
+    def _to_bars(df: pd.DataFrame) -> List[List[float]]:
+        timestamps = pd.to_datetime(df['date']).to_numpy().astype('datetime64[ms]').astype('int64')
+        values = df[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype='float64')
+        return [[int(timestamp), *row] for timestamp, row in zip(timestamps, values.tolist())]
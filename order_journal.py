@@ -0,0 +1,245 @@
+import json
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from definitions import Memory, Order
+from strategies import Action
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS actions (
+    id INTEGER PRIMARY KEY,
+    timestamp INTEGER NOT NULL,
+    pair TEXT NOT NULL,
+    action_type TEXT NOT NULL,
+    price REAL,
+    amount REAL
+);
+CREATE INDEX IF NOT EXISTS actions_pair_time ON actions (pair, timestamp);
+
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY,
+    order_id TEXT,
+    timestamp INTEGER NOT NULL,
+    pair TEXT NOT NULL,
+    type TEXT,
+    side TEXT,
+    price REAL,
+    amount REAL,
+    filled REAL,
+    status TEXT,
+    raw TEXT
+);
+CREATE INDEX IF NOT EXISTS orders_pair_time ON orders (pair, timestamp);
+CREATE INDEX IF NOT EXISTS orders_order_id ON orders (order_id);
+
+CREATE TABLE IF NOT EXISTS fills (
+    id INTEGER PRIMARY KEY,
+    trade_id TEXT NOT NULL UNIQUE,
+    order_id TEXT,
+    timestamp INTEGER NOT NULL,
+    pair TEXT NOT NULL,
+    side TEXT NOT NULL,
+    price REAL NOT NULL,
+    amount REAL NOT NULL,
+    cost REAL NOT NULL,
+    fee REAL NOT NULL DEFAULT 0,
+    fee_currency TEXT,
+    balance_a REAL NOT NULL DEFAULT 0,
+    balance_b REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS fills_pair_time ON fills (pair, timestamp);
+CREATE INDEX IF NOT EXISTS fills_order_id ON fills (order_id);
+"""
+
+class OrderJournal:
+    """
+    Append-only local journal of the actions, orders and fills of a trader, stored in SQLite.
+
+    The database runs in WAL mode and every record is committed on its own, so a crash loses
+    at most the record being written. Rows are never updated: an order status change is a new
+    row for the same order_id, and fills are unique by trade id so replaying them is harmless.
+    Lookups by pair and time use indexes, so loading the recent history into Memory only
+    reads the rows it returns.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Args:
+            path: SQLite database file; created with its parent directory if missing
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger("OrderJournal")
+        self._lock = threading.Lock()
+        # Acknowledgements and fills may be recorded from worker threads
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=FULL")
+        self._connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def record_action(self, pair: str, action: Action, timestamp: Optional[int] = None) -> None:
+        """
+        Record an action generated by the strategy.
+
+        Args:
+            pair: Trading pair
+            action: Action to record
+            timestamp: Time of the action in milliseconds; now if None
+        """
+        self._insert(
+            "INSERT INTO actions (timestamp, pair, action_type, price, amount) VALUES (?, ?, ?, ?, ?)",
+            (self._timestamp(timestamp), pair, action.action_type.value, self._float(action.price), self._float(action.amount))
+        )
+
+    def record_order(self, pair: str, order: Dict[str, Any]) -> None:
+        """
+        Record an order response (creation, status update or cancellation) as returned by ccxt.
+
+        Args:
+            pair: Trading pair
+            order: Exchange response
+        """
+        self._insert(
+            "INSERT INTO orders (order_id, timestamp, pair, type, side, price, amount, filled, status, raw) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                self._text(order.get('id')), self._timestamp(order.get('timestamp')), pair,
+                self._text(order.get('type')), self._text(order.get('side')),
+                self._float(order.get('price')), self._float(order.get('amount')), self._float(order.get('filled')),
+                self._text(order.get('status')), json.dumps(order, default=str)
+            )
+        )
+
+    def record_fill(self, pair: str, trade: Dict[str, Any], balance_a: float = 0.0, balance_b: float = 0.0) -> bool:
+        """
+        Record a fill (one of the account's trades, as returned by ccxt fetch_my_trades).
+
+        Args:
+            pair: Trading pair
+            trade: Trade to record
+            balance_a: Balance of the first coin after the fill, if known
+            balance_b: Balance of the second coin after the fill, if known
+
+        Returns:
+            True if the fill is new, False if it was already journaled
+        """
+        price = float(trade['price'])
+        amount = float(trade['amount'])
+        fee = trade.get('fee') or {}
+        cursor = self._insert(
+            "INSERT OR IGNORE INTO fills (trade_id, order_id, timestamp, pair, side, price, amount, cost, fee, fee_currency, balance_a, balance_b) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                str(trade['id']), self._text(trade.get('order')), self._timestamp(trade.get('timestamp')), pair,
+                trade['side'], price, amount, float(trade.get('cost') or price * amount),
+                float(fee.get('cost') or 0.0), fee.get('currency'), float(balance_a), float(balance_b)
+            )
+        )
+        return cursor.rowcount > 0
+
+    def get_actions(self, pair: str, since: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Actions of a pair at or after since (milliseconds), oldest first, at most the latest limit."""
+        return self._select('actions', pair, since, limit)
+
+    def get_orders(self, pair: str, since: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Order records of a pair at or after since (milliseconds), oldest first, at most the latest limit."""
+        return self._select('orders', pair, since, limit)
+
+    def get_fills(self, pair: str, since: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Fills of a pair at or after since (milliseconds), oldest first, at most the latest limit."""
+        return self._select('fills', pair, since, limit)
+
+    def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """Latest record of an order, or None if it was never journaled."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT * FROM orders WHERE order_id = ? ORDER BY id DESC LIMIT 1", (str(order_id),)
+            ).fetchone()
+        return dict(row) if row is not None else None
+
+    def get_order_fills(self, order_id: str) -> List[Dict[str, Any]]:
+        """Journaled fills of an order, oldest first."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT * FROM fills WHERE order_id = ? ORDER BY timestamp, id", (str(order_id),)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def last_fill_timestamp(self, pair: str) -> Optional[int]:
+        """Time of the newest journaled fill of a pair in milliseconds, or None."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT MAX(timestamp) FROM fills WHERE pair = ?", (pair,)
+            ).fetchone()
+        return row[0]
+
+    def load_memory(self, pair: str, balance_a: float, balance_b: float, limit: int = 200) -> Memory:
+        """
+        Build the strategy Memory from the latest fills of a pair.
+
+        Args:
+            pair: Trading pair
+            balance_a: Current balance of the first coin
+            balance_b: Current balance of the second coin
+            limit: Number of recent fills to load
+
+        Returns:
+            Memory with the recent fills as orders, oldest first
+        """
+        orders = [
+            Order(
+                timestamp=datetime.fromtimestamp(fill['timestamp'] / 1000, tz=timezone.utc).replace(tzinfo=None),
+                pair=pair,
+                type='buy_market' if fill['side'] == 'buy' else 'sell_market',
+                price=np.float64(fill['price']),
+                amount=np.float64(fill['amount']),
+                fee=np.float64(fill['fee']),
+                total_value=np.float64(fill['cost']),
+                balance_a=np.float64(fill['balance_a']),
+                balance_b=np.float64(fill['balance_b'])
+            )
+            for fill in self.get_fills(pair, limit=limit)
+        ]
+        return Memory(orders=orders, balance_a=np.float64(balance_a), balance_b=np.float64(balance_b))
+
+    def _insert(self, statement: str, parameters: tuple) -> sqlite3.Cursor:
+        with self._lock, self._connection:
+            return self._connection.execute(statement, parameters)
+
+    def _select(self, table: str, pair: str, since: Optional[int], limit: Optional[int]) -> List[Dict[str, Any]]:
+        # Newest rows first so LIMIT keeps the latest ones, then back to chronological order
+        query = f"SELECT * FROM {table} WHERE pair = ?"
+        parameters: list = [pair]
+        if since is not None:
+            query += " AND timestamp >= ?"
+            parameters.append(since)
+        query += " ORDER BY timestamp DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+        with self._lock:
+            rows = self._connection.execute(query, parameters).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    @staticmethod
+    def _timestamp(timestamp: Optional[int]) -> int:
+        return int(timestamp) if timestamp is not None else int(time.time() * 1000)
+
+    @staticmethod
+    def _float(value: Any) -> Optional[float]:
+        return float(value) if value is not None else None
+
+    @staticmethod
+    def _text(value: Any) -> Optional[str]:
+        return str(value) if value is not None else None
@@ -0,0 +1,201 @@
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from definitions import Memory
+from exchange_apis import BaseExchangeAPI
+from order_journal import OrderJournal
+
+class OrderReconciler:
+    """
+    Background reconciliation of the account's fills with the order journal.
+
+    Every cycle pulls only the trades since the newest journaled fill (fetch_my_trades with a
+    since cursor), journals them, appends an updated record for the orders they fill and
+    applies them to locally tracked balances. The balance is fetched at start and then every
+    resync_interval seconds; trades up to the exchange time read just before that fetch are
+    already part of it and are skipped. Orders are never fetched one by one.
+    """
+
+    def __init__(
+        self,
+        exchange_api: BaseExchangeAPI,
+        journal: OrderJournal,
+        pair: str,
+        interval: float = 10.0,
+        page_size: int = 100,
+        resync_interval: float = 300.0
+    ) -> None:
+        """
+        Args:
+            exchange_api: Exchange API to pull trades from
+            journal: Journal with the orders placed by the trader
+            pair: Trading pair (e.g., 'DOG/USDT')
+            interval: Seconds between reconciliation cycles
+            page_size: Trades requested per call
+            resync_interval: Seconds between full balance fetches, which correct any drift
+                of the tracked balances (missed trades, transfers, deposits)
+        """
+        self.exchange_api = exchange_api
+        self.journal = journal
+        self.pair = pair
+        self.interval = interval
+        self.page_size = page_size
+        self.resync_interval = resync_interval
+        self.base, self.quote = pair.split('/')
+        self.balance_a: Optional[float] = None
+        self.balance_b: Optional[float] = None
+        # Exchange time (ms) of the last balance fetch; older trades are already in the balances
+        self.synced_until: Optional[int] = None
+        self._synced_at = 0.0
+        self.logger = logging.getLogger(f"OrderReconciler-{pair}")
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Sync the balances and start reconciling in a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.resync()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"reconciler-{self.pair}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the reconciliation thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def resync(self) -> None:
+        """
+        Replace the tracked balances with a fresh full balance fetch.
+
+        The exchange time read before the fetch becomes the trade cursor: the fetched balances
+        include every trade up to it, so reconcile_once only applies later ones. The exchange
+        clock is used because balances rarely carry a timestamp and the local clock may be
+        ahead or behind; a trade made during the fetch itself may be counted twice until the
+        next resync.
+        """
+        # Exchange clock first, so no trade after the cursor can be missing from the balances
+        timestamp = self.exchange_api.get_server_time()
+        # A cached balance could be older than trades already applied
+        self.exchange_api.invalidate_balance()
+        balance = self.exchange_api.get_balances()['total']
+        balance_a = float(balance.get(self.base, 0.0))
+        balance_b = float(balance.get(self.quote, 0.0))
+        with self._lock:
+            if self.balance_a is not None and not np.allclose([self.balance_a, self.balance_b], [balance_a, balance_b]):
+                self.logger.warning(
+                    f"Tracked balances {self.balance_a} {self.base} / {self.balance_b} {self.quote} drifted "
+                    f"from the exchange ({balance_a} / {balance_b}); resynced"
+                )
+            self.balance_a, self.balance_b = balance_a, balance_b
+            self.synced_until = int(timestamp)
+            self._synced_at = time.monotonic()
+
+    def reconcile_once(self) -> List[Dict[str, Any]]:
+        """
+        Pull and journal the trades since the newest journaled fill or balance fetch.
+
+        Returns:
+            The fills that were not journaled yet, oldest first
+        """
+        if self.balance_a is None:
+            self.resync()
+
+        new_fills = []
+        last_fill = self.journal.last_fill_timestamp(self.pair)
+        since = self.synced_until if last_fill is None else max(last_fill, self.synced_until)
+        while True:
+            # since is inclusive; trades already journaled are skipped by their id
+            trades = self.exchange_api.fetch_my_trades(self.pair, since=since, limit=self.page_size)
+            trades = sorted(trades, key=lambda trade: (trade['timestamp'], str(trade['id'])))
+            new_fills += [trade for trade in trades if self._apply(trade)]
+            if len(trades) < self.page_size:
+                break
+            # A full page may be followed by more trades, new or not; move the cursor forward
+            # even if the whole page shares one timestamp, so the loop cannot stall on it
+            last = trades[-1]['timestamp']
+            if last <= since:
+                self.logger.warning(f"More than {self.page_size} trades at {since}; continuing after them")
+                last = since + 1
+            since = last
+
+        if new_fills:
+            self.logger.info(f"Reconciled {len(new_fills)} new fills")
+            # The exchange balance changed; later balance reads must not use the cached one
+            self.exchange_api.invalidate_balance()
+        return new_fills
+
+    def load_memory(self, limit: int = 200) -> Memory:
+        """
+        Memory with the tracked balances and the latest journaled fills.
+
+        Args:
+            limit: Number of recent fills to load as orders
+        """
+        if self.balance_a is None:
+            self.resync()
+        with self._lock:
+            balance_a, balance_b = self.balance_a, self.balance_b
+        return self.journal.load_memory(self.pair, balance_a, balance_b, limit=limit)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.reconcile_once()
+                if time.monotonic() - self._synced_at >= self.resync_interval:
+                    self.resync()
+            except Exception as e:
+                self.logger.error(f"Reconciliation failed: {str(e)}")
+
+    def _apply(self, trade: Dict[str, Any]) -> bool:
+        if trade['timestamp'] <= self.synced_until:
+            # Already included in the fetched balances
+            return False
+        with self._lock:
+            balance_a, balance_b = self._balances_after(trade)
+            if not self.journal.record_fill(self.pair, trade, balance_a=balance_a, balance_b=balance_b):
+                return False
+            self.balance_a, self.balance_b = balance_a, balance_b
+
+        order_id = trade.get('order')
+        order = self.journal.get_order(order_id) if order_id is not None else None
+        if order is None:
+            self.logger.warning(f"Fill {trade['id']} does not match any journaled order")
+            return True
+
+        filled = sum(fill['amount'] for fill in self.journal.get_order_fills(order_id))
+        amount = order['amount'] or filled
+        self.journal.record_order(self.pair, {
+            'id': order_id,
+            'timestamp': trade['timestamp'],
+            'type': order['type'],
+            'side': order['side'],
+            'price': order['price'],
+            'amount': amount,
+            'filled': filled,
+            'status': 'closed' if np.isclose(filled, amount) or filled > amount else 'open',
+        })
+        return True
+
+    def _balances_after(self, trade: Dict[str, Any]) -> tuple:
+        amount = float(trade['amount'])
+        cost = float(trade.get('cost') or float(trade['price']) * amount)
+        sign = 1.0 if trade['side'] == 'buy' else -1.0
+        balance_a = self.balance_a + sign * amount
+        balance_b = self.balance_b - sign * cost
+
+        fee = trade.get('fee') or {}
+        if fee.get('cost'):
+            # Fees paid in a third currency (e.g. BGB) leave both balances untouched
+            if fee.get('currency') == self.base:
+                balance_a -= float(fee['cost'])
+            elif fee.get('currency') == self.quote:
+                balance_b -= float(fee['cost'])
+        return max(balance_a, 0.0), max(balance_b, 0.0)
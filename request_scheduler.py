@@ -0,0 +1,191 @@
+import time
+import heapq
+import random
+import logging
+import itertools
+import threading
+from enum import IntEnum
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import ccxt
+
+class RequestPriority(IntEnum):
+    """Priority of a request; lower values are sent first when requests queue up."""
+    ORDER = 0
+    ACCOUNT = 1
+    DATA = 2
+
+class RequestScheduler:
+    """
+    Token-bucket scheduler shared by every API wrapper using the same exchange account.
+
+    Each request takes a token; tokens refill at the exchange rate limit. When requests queue
+    up they are released by priority, so order placement goes before data fetches. Failed
+    requests are retried with exponential backoff and jitter, and a rate limit error empties
+    the bucket so every caller backs off. Requests that are not idempotent (order placement)
+    are only retried when the exchange certainly rejected them, never after a timeout or a
+    dropped connection, which could place them twice. Identical requests in flight at the
+    same time can be coalesced into a single call.
+    """
+    # Network errors raised before the exchange processed the request
+    REJECTED_ERRORS = (ccxt.RateLimitExceeded, ccxt.DDoSProtection, ccxt.InvalidNonce)
+    _registry: Dict[Tuple[str, str], 'RequestScheduler'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, max_delay: float = 30.0) -> None:
+        """
+        Args:
+            rate: Requests per second
+            capacity: Maximum burst of requests; one second of requests by default
+            max_delay: Maximum backoff delay in seconds
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = rate
+        self.capacity = max(capacity if capacity is not None else rate, 1.0)
+        self.max_delay = max_delay
+        self.logger = logging.getLogger("RequestScheduler")
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._condition = threading.Condition()
+        self._waiting: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._inflight: Dict[Hashable, Future] = {}
+
+    @classmethod
+    def for_account(cls, exchange_id: str, account: str, rate_limit_ms: Optional[float]) -> 'RequestScheduler':
+        """
+        Get the scheduler shared by all wrappers of an exchange account, creating it if needed.
+
+        Args:
+            exchange_id: The CCXT exchange identifier
+            account: Identifier of the account (e.g. the API key variable name)
+            rate_limit_ms: Minimum milliseconds between requests, as reported by ccxt's rateLimit
+        """
+        key = (exchange_id, account)
+        with cls._registry_lock:
+            if key not in cls._registry:
+                rate = 1000 / rate_limit_ms if rate_limit_ms else 10.0
+                cls._registry[key] = cls(rate)
+            return cls._registry[key]
+
+    def execute(
+        self,
+        operation: str,
+        func: Callable,
+        *args,
+        priority: RequestPriority = RequestPriority.DATA,
+        coalesce_key: Optional[Hashable] = None,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        idempotent: bool = True,
+        **kwargs
+    ) -> Any:
+        """
+        Execute a request once a token is available, retrying network and exchange errors.
+
+        Args:
+            operation: Name of the operation for logging
+            func: Function to execute
+            *args: Arguments to pass to the function
+            priority: Priority of the request
+            coalesce_key: Requests with the same key in flight at the same time share one call
+            max_retries: Maximum number of attempts
+            base_delay: Backoff delay after the first failure, in seconds
+            idempotent: Whether the request can safely run twice; if not, network errors
+                that may have reached the exchange are raised without retrying
+            **kwargs: Keyword arguments to pass to the function
+
+        Returns:
+            The result of the function call
+
+        Raises:
+            Exception: If all retries fail, or immediately for errors that are not retried
+        """
+        if coalesce_key is None:
+            return self._execute(operation, func, args, kwargs, priority, max_retries, base_delay, idempotent)
+
+        with self._condition:
+            future = self._inflight.get(coalesce_key)
+            owner = future is None
+            if owner:
+                future = self._inflight[coalesce_key] = Future()
+        if not owner:
+            self.logger.debug(f"Coalescing {operation} with the request in flight")
+            return future.result()
+
+        try:
+            result = self._execute(operation, func, args, kwargs, priority, max_retries, base_delay, idempotent)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._condition:
+                del self._inflight[coalesce_key]
+
+    def _execute(self, operation, func, args, kwargs, priority, max_retries, base_delay, idempotent) -> Any:
+        last_error = None
+        for attempt in range(max_retries):
+            self._acquire(priority)
+            try:
+                self.logger.debug(f"Executing {operation} (attempt {attempt + 1}/{max_retries})")
+                return func(*args, **kwargs)
+            except (ccxt.NetworkError, ccxt.ExchangeError) as e:
+                last_error = e
+                if isinstance(e, (ccxt.RateLimitExceeded, ccxt.DDoSProtection)):
+                    self._drain()
+                if not idempotent and isinstance(e, ccxt.NetworkError) and not isinstance(e, self.REJECTED_ERRORS):
+                    self.logger.error(f"{type(e).__name__} during {operation}, not retried as it may have been executed: {str(e)}")
+                    raise
+                if attempt == max_retries - 1:
+                    break
+                delay = self._backoff(attempt, base_delay)
+                self.logger.warning(f"{type(e).__name__} during {operation}: {str(e)}. Retrying in {delay:.2f}s ({attempt + 1}/{max_retries})")
+                time.sleep(delay)
+            except Exception as e:
+                # For other exceptions, don't retry
+                self.logger.error(f"Error during {operation}: {str(e)}")
+                raise
+
+        self.logger.error(f"Failed to execute {operation} after {max_retries} attempts: {str(last_error)}")
+        raise last_error
+
+    def _backoff(self, attempt: int, base_delay: float) -> float:
+        # Equal jitter: half of the exponential delay is fixed, the other half random
+        delay = min(base_delay * 2 ** attempt, self.max_delay)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _acquire(self, priority: RequestPriority) -> None:
+        with self._condition:
+            ticket = (int(priority), next(self._sequence))
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    self._refill()
+                    first = self._waiting[0] == ticket
+                    if first and self._tokens >= 1:
+                        heapq.heappop(self._waiting)
+                        self._tokens -= 1
+                        return
+                    # Only the first request in line waits for the refill; the rest wait for it
+                    self._condition.wait(timeout=(1 - self._tokens) / self.rate if first else None)
+            finally:
+                # A waiter interrupted in line must not block the tickets behind it
+                if ticket in self._waiting:
+                    self._waiting.remove(ticket)
+                    heapq.heapify(self._waiting)
+                self._condition.notify_all()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _drain(self) -> None:
+        with self._condition:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
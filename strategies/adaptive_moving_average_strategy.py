@@ -1,13 +1,17 @@
 from enum import Enum, auto
-from typing import Tuple, List
+from typing import Dict, Tuple, List, Optional
 from collections import deque
 
 import numpy as np
 import pandas as pd
 
 from definitions import Memory, MarketData
-from indicators import Indicators, Indicator
+from indicators import Indicators, BatchIndicators, LatestIndicators, Indicator
+from validation import ValidationPolicy
+from latency import LatencyTracker
+from decision_trace import DecisionTracer
 from .strategy import Strategy, Action, ActionType
+from .signals import SignalSeries, StateMachine
 
 class AdaptiveMovingAverageStrategy(Strategy):
     class MarketCondition(Enum):
@@ -33,7 +37,8 @@ class AdaptiveMovingAverageStrategy(Strategy):
             volume_window: int = 20,
             momentum_window: int = 10,
             condition_memory: int = 50,
-            debug: bool = True
+            debug: bool = False,
+            tracer: Optional[DecisionTracer] = None
         ) -> None:
         self.max_duration = max_duration
         self.min_purchase = min_purchase
@@ -47,12 +52,15 @@ class AdaptiveMovingAverageStrategy(Strategy):
         self.distribution_length = 0
         self.accumulation_length = 0
         self.debug = debug
+        self.tracer = tracer or (DecisionTracer.console() if debug else DecisionTracer.shared())
         
         # Market memory
         self.condition_memory = condition_memory
         self.recent_conditions = deque(maxlen=condition_memory)
         self.recent_volumes = deque(maxlen=condition_memory)
         self.trading_phase = self.TradingPhase.NEUTRAL
+        self._signal_conditions: Optional[np.ndarray] = None
+        self._signal_phases: Optional[np.ndarray] = None
 
     def run(self, data: MarketData, memory: Memory) -> List[Tuple[Action, float, float]]:
         actions = []
@@ -72,30 +80,35 @@ class AdaptiveMovingAverageStrategy(Strategy):
         if self.trading_phase == self.TradingPhase.ACCUMULATION:
             if market_condition in [self.MarketCondition.STRONG_BULLISH, self.MarketCondition.BULLISH] and self._can_sell(balance_a, amount):
                 self.accumulation_length -= 1
-                actions.append(Action(action_type=ActionType.SELL_MARKET, price=current_price, amount=amount))
+                actions.append(ValidationPolicy.build_model(Action, action_type=ActionType.SELL_MARKET, price=current_price, amount=amount))
             elif market_condition in [self.MarketCondition.STRONG_BEARISH, self.MarketCondition.BEARISH] and self._can_buy(balance_b, amount, current_price):
                 self.accumulation_length += 1
-                actions.append(Action(action_type=ActionType.BUY_MARKET, price=current_price, amount=amount))
+                actions.append(ValidationPolicy.build_model(Action, action_type=ActionType.BUY_MARKET, price=current_price, amount=amount))
         elif self.trading_phase == self.TradingPhase.DISTRIBUTION:
             if market_condition in [self.MarketCondition.STRONG_BULLISH, self.MarketCondition.BULLISH] and self._can_sell(balance_a, amount):
                 self.distribution_length += 1
-                actions.append(Action(action_type=ActionType.SELL_MARKET, price=current_price, amount=amount))
+                actions.append(ValidationPolicy.build_model(Action, action_type=ActionType.SELL_MARKET, price=current_price, amount=amount))
             elif market_condition in [self.MarketCondition.STRONG_BEARISH, self.MarketCondition.BEARISH] and self._can_buy(balance_b, amount, current_price):
                 self.distribution_length -= 1
-                actions.append(Action(action_type=ActionType.BUY_MARKET, price=current_price, amount=amount))
+                actions.append(ValidationPolicy.build_model(Action, action_type=ActionType.BUY_MARKET, price=current_price, amount=amount))
         else:
-            actions.append(Action(action_type=ActionType.WAIT, price=current_price, amount=np.float64(0)))
-
-        if self.debug:
-            print("time:", str(data['date'].iloc[-1]))
-            print("Market Condition:", market_condition)
-            print("Trading Phase:", self.trading_phase)
-            print("balance_a:", balance_a, "|", "balance_b:", balance_b)
-            print("distribution_n:", self.distribution_length, "accumulation_n:", self.accumulation_length)
-            print("can_sell:", self._can_sell(balance_a, amount), "|", "can_buy:", self._can_buy(balance_b, amount, current_price))
-            print("amount:", amount)
-            print("amount_price:", amount * current_price)
-            print(actions)
+            actions.append(ValidationPolicy.build_model(Action, action_type=ActionType.WAIT, price=current_price, amount=np.float64(0)))
+
+        if self.tracer.enabled_for(DecisionTracer.DEBUG):
+            self._trace_decision(
+                data,
+                market_condition=market_condition,
+                trading_phase=self.trading_phase,
+                balance_a=balance_a,
+                balance_b=balance_b,
+                distribution_length=self.distribution_length,
+                accumulation_length=self.accumulation_length,
+                can_sell=self._can_sell(balance_a, amount),
+                can_buy=self._can_buy(balance_b, amount, current_price),
+                amount=amount,
+                amount_price=amount * current_price,
+                actions=list(actions)
+            )
 
         return actions
 
@@ -103,9 +116,7 @@ class AdaptiveMovingAverageStrategy(Strategy):
         indicators = []
         
         # Calculate Moving Averages
-        for window in self.ma_windows:
-            ma = Indicators.calculate_moving_average(data, window)
-            indicators.append(ma)
+        indicators.extend(BatchIndicators.moving_averages(data, self.ma_windows))
         
         # Calculate RSI
         rsi = Indicators.calculate_rsi(data, self.rsi_window)
@@ -124,15 +135,98 @@ class AdaptiveMovingAverageStrategy(Strategy):
         
         return indicators
 
+    def calculate_latest_indicators(self, data: MarketData) -> Dict[str, float]:
+        close = data['close'].to_numpy()
+        return {
+            **{f'ma_{window}': LatestIndicators.sma(close, window) for window in self.ma_windows},
+            f'rsi_{self.rsi_window}': LatestIndicators.rsi(close, self.rsi_window),
+            f'volume_sma_{self.volume_window}': LatestIndicators.sma(data['volume'].to_numpy(), self.volume_window),
+            f'velocity_{self.momentum_window}': LatestIndicators.velocity(close, self.momentum_window),
+            f'acceleration_{self.momentum_window}': LatestIndicators.acceleration(close, self.momentum_window),
+        }
+
+    def signal_mask(self, data: MarketData, window_size: int) -> Optional[np.ndarray]:
+        close = data['close'].to_numpy(dtype=np.float64)
+        volume = data['volume'].to_numpy()
+        ma_values = [SignalSeries.sma(close, window) for window in self.ma_windows]
+        rsi = SignalSeries.rsi(close, self.rsi_window, window_size)
+        volume_sma = SignalSeries.sma(volume, self.volume_window)
+        velocity = SignalSeries.velocity(close, self.momentum_window)
+        acceleration = SignalSeries.acceleration(close, self.momentum_window)
+
+        ma_pairs = list(zip(ma_values, ma_values[1:]))
+        ma_aligned_up = np.logical_and.reduce([a > b for a, b in ma_pairs])
+        ma_aligned_down = np.logical_and.reduce([a < b for a, b in ma_pairs])
+        conditions = SignalSeries.select(
+            [
+                ma_aligned_up & (close > ma_values[0]) & (velocity > 0) & (acceleration > 0) &
+                    (rsi > self.rsi_overbought) & (volume > volume_sma),
+                ma_aligned_down & (close < ma_values[0]) & (velocity < 0) & (acceleration < 0) &
+                    (rsi < self.rsi_oversold) & (volume > volume_sma),
+                (close > ma_values[0]) & (ma_values[0] > ma_values[1]) & (velocity > 0),
+                (close < ma_values[0]) & (ma_values[0] < ma_values[1]) & (velocity < 0)
+            ],
+            [
+                self.MarketCondition.STRONG_BULLISH,
+                self.MarketCondition.STRONG_BEARISH,
+                self.MarketCondition.BULLISH,
+                self.MarketCondition.BEARISH
+            ],
+            self.MarketCondition.NEUTRAL,
+            len(data)
+        )
+        ambiguous = SignalSeries.ambiguous([
+            (close, ma_values[0]), *ma_pairs, (rsi, self.rsi_overbought), (rsi, self.rsi_oversold), (volume, volume_sma)
+        ])
+        SignalSeries.resolve(conditions, ambiguous, data, window_size, self._analyze_market_condition)
+
+        # Replay the trading phase from the current market memory, as run would update it
+        recent_conditions = deque(self.recent_conditions, maxlen=self.condition_memory)
+        recent_volumes = deque(self.recent_volumes, maxlen=self.condition_memory)
+        trading_phase = self.trading_phase
+        phases = np.full(len(data), trading_phase, dtype=object)
+        for row in range(window_size - 1, len(data)):
+            recent_conditions.append(conditions[row])
+            recent_volumes.append(volume[row])
+            trading_phase = self._next_trading_phase(recent_conditions, recent_volumes, volume[row], trading_phase)
+            phases[row] = trading_phase
+
+        self._signal_conditions, self._signal_phases = conditions, phases
+        return (conditions != self.MarketCondition.NEUTRAL) & (phases != self.TradingPhase.NEUTRAL)
+
+    def state_machine(self, data: MarketData, window_size: int) -> Optional[StateMachine]:
+        self.signal_mask(data, window_size)
+        conditions = self._signal_conditions
+        bullish = (conditions == self.MarketCondition.STRONG_BULLISH) | (conditions == self.MarketCondition.BULLISH)
+        bearish = (conditions == self.MarketCondition.STRONG_BEARISH) | (conditions == self.MarketCondition.BEARISH)
+        return StateMachine(
+            signal=np.select([bullish, bearish], [StateMachine.SELL, StateMachine.BUY], StateMachine.NO_SIGNAL).astype(np.int8),
+            phase=StateMachine.phase_codes(self._signal_phases),
+            max_duration=self.max_duration,
+            safety_margin=self.safety_margin,
+            min_purchase=self.min_purchase,
+            counters=('accumulation_length', 'distribution_length')
+        )
+
+    def wait_bars(self, data: MarketData, start: int, stop: int) -> np.ndarray:
+        # run waits whenever the phase it just updated is neutral
+        return np.flatnonzero(self._signal_phases[start:stop] == self.TradingPhase.NEUTRAL) + start
+
+    def skip_bars(self, data: MarketData, start: int, stop: int, window_size: int) -> None:
+        self.recent_conditions.extend(self._signal_conditions[start:stop])
+        self.recent_volumes.extend(data['volume'].to_numpy()[start:stop])
+        self.trading_phase = self._signal_phases[stop - 1]
+
     def _analyze_market_condition(self, data: MarketData) -> MarketCondition:
-        indicators = self.calculate_indicators(data)
+        with LatencyTracker.shared().span('indicators'):
+            latest = self.calculate_latest_indicators(data)
         
         # Get latest values
-        ma_values = [ind.result.iloc[-1] for ind in indicators[:len(self.ma_windows)]]
-        rsi = indicators[len(self.ma_windows)].result.iloc[-1]
-        volume_sma = indicators[len(self.ma_windows) + 1].result.iloc[-1]
-        velocity = indicators[len(self.ma_windows) + 2].result.iloc[-1]
-        acceleration = indicators[len(self.ma_windows) + 3].result.iloc[-1]
+        ma_values = [latest[f'ma_{window}'] for window in self.ma_windows]
+        rsi = latest[f'rsi_{self.rsi_window}']
+        volume_sma = latest[f'volume_sma_{self.volume_window}']
+        velocity = latest[f'velocity_{self.momentum_window}']
+        acceleration = latest[f'acceleration_{self.momentum_window}']
         
         current_price = data['close'].iloc[-1]
         current_volume = data['volume'].iloc[-1]
@@ -172,18 +266,28 @@ class AdaptiveMovingAverageStrategy(Strategy):
         return self.MarketCondition.NEUTRAL
 
     def _update_trading_phase(self, data: MarketData) -> None:
-        if len(self.recent_conditions) < self.condition_memory:
-            return
+        self.trading_phase = self._next_trading_phase(
+            self.recent_conditions, self.recent_volumes, data['volume'].iloc[-1], self.trading_phase
+        )
+
+    def _next_trading_phase(
+            self,
+            recent_conditions: deque,
+            recent_volumes: deque,
+            current_volume: float,
+            trading_phase: TradingPhase
+        ) -> TradingPhase:
+        if len(recent_conditions) < self.condition_memory:
+            return trading_phase
         
         # Count recent conditions
-        bullish_count = sum(1 for c in self.recent_conditions 
+        bullish_count = sum(1 for c in recent_conditions 
                           if c in [self.MarketCondition.BULLISH, self.MarketCondition.STRONG_BULLISH])
-        bearish_count = sum(1 for c in self.recent_conditions 
+        bearish_count = sum(1 for c in recent_conditions 
                           if c in [self.MarketCondition.BEARISH, self.MarketCondition.STRONG_BEARISH])
         
         # Calculate volume trend
-        avg_volume = sum(self.recent_volumes) / len(self.recent_volumes)
-        current_volume = data['volume'].iloc[-1]
+        avg_volume = sum(recent_volumes) / len(recent_volumes)
         volume_increasing = current_volume > avg_volume
         
         # Phase detection logic
@@ -191,11 +295,12 @@ class AdaptiveMovingAverageStrategy(Strategy):
         bearish_ratio = bearish_count / self.condition_memory
         
         if bullish_ratio > 0.6 and volume_increasing:
-            self.trading_phase = self.TradingPhase.DISTRIBUTION
+            return self.TradingPhase.DISTRIBUTION
         elif bearish_ratio > 0.6 and volume_increasing:
-            self.trading_phase = self.TradingPhase.ACCUMULATION
+            return self.TradingPhase.ACCUMULATION
         elif abs(bullish_ratio - bearish_ratio) < 0.2:
-            self.trading_phase = self.TradingPhase.NEUTRAL
+            return self.TradingPhase.NEUTRAL
+        return trading_phase
 
     def _calculate_amount(self, balance_a: float, balance_b: float, current_price: float) -> float:
         if self.trading_phase == self.TradingPhase.NEUTRAL:
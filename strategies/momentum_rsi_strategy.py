@@ -1,12 +1,16 @@
 from enum import Enum, auto
-from typing import Tuple, List
+from typing import Dict, Tuple, List, Optional
 
 import numpy as np
 import pandas as pd
 
 from definitions import Memory, MarketData
-from indicators import Indicators, Indicator
+from indicators import Indicators, BatchIndicators, LatestIndicators, Indicator
+from validation import ValidationPolicy
+from latency import LatencyTracker
+from decision_trace import DecisionTracer
 from .strategy import Strategy, Action, ActionType
+from .signals import SignalSeries, StateMachine
 
 class MomentumRsiStrategy(Strategy):
     class MarketCondition(Enum):
@@ -31,7 +35,8 @@ class MomentumRsiStrategy(Strategy):
             ma_windows: List[int] = [20, 50],
             momentum_window: int = 10,
             trading_phase: TradingPhase = TradingPhase.NEUTRAL,
-            debug: bool = True
+            debug: bool = False,
+            tracer: Optional[DecisionTracer] = None
         ) -> None:
         self.max_duration = max_duration
         self.min_purchase = min_purchase
@@ -45,7 +50,9 @@ class MomentumRsiStrategy(Strategy):
         self.accumulation_length = 0
         self.trading_phase = trading_phase
         self.debug = debug
+        self.tracer = tracer or (DecisionTracer.console() if debug else DecisionTracer.shared())
         self.last_condition = self.MarketCondition.NEUTRAL
+        self._signal_conditions: Optional[np.ndarray] = None
 
     def run(self, data: MarketData, memory: Memory) -> List[Tuple[Action, float, float]]:
         actions = []
@@ -58,30 +65,35 @@ class MomentumRsiStrategy(Strategy):
         if self.trading_phase == self.TradingPhase.ACCUMULATION:
             if market_condition in [self.MarketCondition.STRONG_BULLISH, self.MarketCondition.BULLISH] and self._can_sell(balance_a, amount):
                 self.accumulation_length -= 1
-                actions.append(Action(action_type=ActionType.SELL_MARKET, price=current_price, amount=amount))
+                actions.append(ValidationPolicy.build_model(Action, action_type=ActionType.SELL_MARKET, price=current_price, amount=amount))
             elif market_condition in [self.MarketCondition.STRONG_BEARISH, self.MarketCondition.BEARISH] and self._can_buy(balance_b, amount, current_price):
                 self.accumulation_length += 1
-                actions.append(Action(action_type=ActionType.BUY_MARKET, price=current_price, amount=amount))
+                actions.append(ValidationPolicy.build_model(Action, action_type=ActionType.BUY_MARKET, price=current_price, amount=amount))
         elif self.trading_phase == self.TradingPhase.DISTRIBUTION:
             if market_condition in [self.MarketCondition.STRONG_BULLISH, self.MarketCondition.BULLISH] and self._can_sell(balance_a, amount):
                 self.distribution_length += 1
-                actions.append(Action(action_type=ActionType.SELL_MARKET, price=current_price, amount=amount))
+                actions.append(ValidationPolicy.build_model(Action, action_type=ActionType.SELL_MARKET, price=current_price, amount=amount))
             elif market_condition in [self.MarketCondition.STRONG_BEARISH, self.MarketCondition.BEARISH] and self._can_buy(balance_b, amount, current_price):
                 self.distribution_length -= 1
-                actions.append(Action(action_type=ActionType.BUY_MARKET, price=current_price, amount=amount))
+                actions.append(ValidationPolicy.build_model(Action, action_type=ActionType.BUY_MARKET, price=current_price, amount=amount))
         else:
-            actions.append(Action(action_type=ActionType.WAIT, price=current_price, amount=np.float64(0)))
-
-        if self.debug:
-            print("time:", str(data['date'].iloc[-1]))
-            print("Market Condition:", market_condition)
-            print("Trading Phase:", self.trading_phase)
-            print("balance_a:", balance_a, "|", "balance_b:", balance_b)
-            print("distribution_n:", self.distribution_length, "accumulation_n:", self.accumulation_length)
-            print("can_sell:", self._can_sell(balance_a, amount), "|", "can_buy:", self._can_buy(balance_b, amount, current_price))
-            print("amount:", amount)
-            print("amount_price:", amount * current_price)
-            print(actions)
+            actions.append(ValidationPolicy.build_model(Action, action_type=ActionType.WAIT, price=current_price, amount=np.float64(0)))
+
+        if self.tracer.enabled_for(DecisionTracer.DEBUG):
+            self._trace_decision(
+                data,
+                market_condition=market_condition,
+                trading_phase=self.trading_phase,
+                balance_a=balance_a,
+                balance_b=balance_b,
+                distribution_length=self.distribution_length,
+                accumulation_length=self.accumulation_length,
+                can_sell=self._can_sell(balance_a, amount),
+                can_buy=self._can_buy(balance_b, amount, current_price),
+                amount=amount,
+                amount_price=amount * current_price,
+                actions=list(actions)
+            )
 
         self.last_condition = market_condition
         return actions
@@ -94,9 +106,7 @@ class MomentumRsiStrategy(Strategy):
         indicators.append(rsi)
         
         # Calculate Moving Averages
-        for window in self.ma_windows:
-            ma = Indicators.calculate_moving_average(data, window)
-            indicators.append(ma)
+        indicators.extend(BatchIndicators.moving_averages(data, self.ma_windows))
         
         # Calculate Velocity and Acceleration
         velocity = Indicators.calculate_velocity(data['close'], self.momentum_window)
@@ -107,15 +117,80 @@ class MomentumRsiStrategy(Strategy):
         
         return indicators
 
+    def calculate_latest_indicators(self, data: MarketData) -> Dict[str, float]:
+        close = data['close'].to_numpy()
+        return {
+            f'rsi_{self.rsi_window}': LatestIndicators.rsi(close, self.rsi_window),
+            **{f'ma_{window}': LatestIndicators.sma(close, window) for window in self.ma_windows},
+            f'velocity_{self.momentum_window}': LatestIndicators.velocity(close, self.momentum_window),
+            f'acceleration_{self.momentum_window}': LatestIndicators.acceleration(close, self.momentum_window),
+        }
+
+    def signal_mask(self, data: MarketData, window_size: int) -> Optional[np.ndarray]:
+        close = data['close'].to_numpy(dtype=np.float64)
+        rsi = SignalSeries.rsi(close, self.rsi_window, window_size)
+        ma_short = SignalSeries.sma(close, self.ma_windows[0])
+        ma_long = SignalSeries.sma(close, self.ma_windows[1])
+        velocity = SignalSeries.velocity(close, self.momentum_window)
+        acceleration = SignalSeries.acceleration(close, self.momentum_window)
+
+        bullish = (close > ma_short) & (ma_short > ma_long) & (velocity > 0)
+        bearish = (close < ma_short) & (ma_short < ma_long) & (velocity < 0)
+        conditions = SignalSeries.select(
+            [
+                bullish & (acceleration > 0) & (rsi > self.rsi_overbought),
+                bearish & (acceleration < 0) & (rsi < self.rsi_oversold),
+                bullish,
+                bearish
+            ],
+            [
+                self.MarketCondition.STRONG_BULLISH,
+                self.MarketCondition.STRONG_BEARISH,
+                self.MarketCondition.BULLISH,
+                self.MarketCondition.BEARISH
+            ],
+            self.MarketCondition.NEUTRAL,
+            len(data)
+        )
+        ambiguous = SignalSeries.ambiguous([(close, ma_short), (ma_short, ma_long), (rsi, self.rsi_overbought), (rsi, self.rsi_oversold)])
+        self._signal_conditions = SignalSeries.resolve(conditions, ambiguous, data, window_size, self._analyze_market_condition)
+
+        if self.trading_phase == self.TradingPhase.NEUTRAL:
+            return np.zeros(len(data), dtype=bool)
+        return conditions != self.MarketCondition.NEUTRAL
+
+    def state_machine(self, data: MarketData, window_size: int) -> Optional[StateMachine]:
+        self.signal_mask(data, window_size)
+        conditions = self._signal_conditions
+        bullish = (conditions == self.MarketCondition.STRONG_BULLISH) | (conditions == self.MarketCondition.BULLISH)
+        bearish = (conditions == self.MarketCondition.STRONG_BEARISH) | (conditions == self.MarketCondition.BEARISH)
+        return StateMachine(
+            signal=np.select([bullish, bearish], [StateMachine.SELL, StateMachine.BUY], StateMachine.NO_SIGNAL).astype(np.int8),
+            phase=StateMachine.phase_codes([self.trading_phase] * len(data)),
+            max_duration=self.max_duration,
+            safety_margin=self.safety_margin,
+            min_purchase=self.min_purchase,
+            counters=('accumulation_length', 'distribution_length')
+        )
+
+    def wait_bars(self, data: MarketData, start: int, stop: int) -> np.ndarray:
+        if self.trading_phase == self.TradingPhase.NEUTRAL:
+            return np.arange(start, stop)
+        return np.empty(0, dtype=np.int64)
+
+    def skip_bars(self, data: MarketData, start: int, stop: int, window_size: int) -> None:
+        self.last_condition = self._signal_conditions[stop - 1]
+
     def _analyze_market_condition(self, data: MarketData) -> MarketCondition:
-        indicators = self.calculate_indicators(data)
+        with LatencyTracker.shared().span('indicators'):
+            latest = self.calculate_latest_indicators(data)
         
         # Get latest values
-        rsi = indicators[0].result.iloc[-1]
-        ma_short = indicators[1].result.iloc[-1]
-        ma_long = indicators[2].result.iloc[-1]
-        velocity = indicators[3].result.iloc[-1]
-        acceleration = indicators[4].result.iloc[-1]
+        rsi = latest[f'rsi_{self.rsi_window}']
+        ma_short = latest[f'ma_{self.ma_windows[0]}']
+        ma_long = latest[f'ma_{self.ma_windows[1]}']
+        velocity = latest[f'velocity_{self.momentum_window}']
+        acceleration = latest[f'acceleration_{self.momentum_window}']
         current_price = data['close'].iloc[-1]
         
         # Strong bullish conditions
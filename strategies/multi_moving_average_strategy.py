@@ -1,11 +1,15 @@
 from enum import Enum, auto
-from typing import Tuple, List
+from typing import Dict, Tuple, List, Optional
 
 import numpy as np
 
 from definitions import Memory, MarketData
-from indicators import Indicators, Indicator
+from indicators import BatchIndicators, LatestIndicators, Indicator
+from validation import ValidationPolicy
+from latency import LatencyTracker
+from decision_trace import DecisionTracer
 from .strategy import Strategy, Action, ActionType
+from .signals import SignalSeries, StateMachine
 
 class MultiMovingAverageStrategy(Strategy):
     class Alignment(Enum):
@@ -24,7 +28,8 @@ class MultiMovingAverageStrategy(Strategy):
             safety_margin: float = 3, 
             windows: List[int] = [10, 50, 100, 200],
             trading_phase: TradingPhase = TradingPhase.NEUTRAL,
-            debug: bool = True
+            debug: bool = False,
+            tracer: Optional[DecisionTracer] = None
         ) -> None:
         self.max_duration = max_duration
         self.min_purchase = min_purchase
@@ -34,6 +39,7 @@ class MultiMovingAverageStrategy(Strategy):
         self.acumulation_length = 0
         self.trading_phase = trading_phase
         self.debug = debug
+        self.tracer = tracer or (DecisionTracer.console() if debug else DecisionTracer.shared())
 
     def run(self, data: MarketData, memory: Memory) -> List[Tuple[Action, float, float]]:
         actions = []
@@ -46,49 +52,99 @@ class MultiMovingAverageStrategy(Strategy):
         if self.trading_phase == self.TradingPhase.ACCUMULATION:
             if alignment == self.Alignment.UP and self._can_sell(balance_a, amount):
                 self.acumulation_length -=1
-                actions.append(Action(action_type=ActionType.SELL_MARKET, price=current_price, amount=amount))
+                actions.append(ValidationPolicy.build_model(Action, action_type=ActionType.SELL_MARKET, price=current_price, amount=amount))
             elif alignment == self.Alignment.DOWN and self._can_buy(balance_b, amount, current_price):
                 self.acumulation_length +=1
-                actions.append(Action(action_type=ActionType.BUY_MARKET, price=current_price, amount=amount))
+                actions.append(ValidationPolicy.build_model(Action, action_type=ActionType.BUY_MARKET, price=current_price, amount=amount))
         elif self.trading_phase == self.TradingPhase.DISTRIBUTION:
             if alignment == self.Alignment.UP and self._can_sell(balance_a, amount):
                 self.distribution_length +=1
-                actions.append(Action(action_type=ActionType.SELL_MARKET, price=current_price, amount=amount))
+                actions.append(ValidationPolicy.build_model(Action, action_type=ActionType.SELL_MARKET, price=current_price, amount=amount))
             elif alignment == self.Alignment.DOWN and self._can_buy(balance_b, amount, current_price):
                 self.distribution_length -=1
-                actions.append(Action(action_type=ActionType.BUY_MARKET, price=current_price, amount=amount))
+                actions.append(ValidationPolicy.build_model(Action, action_type=ActionType.BUY_MARKET, price=current_price, amount=amount))
         else:
-            actions.append(Action(action_type=ActionType.WAIT, price=current_price, amount=np.float64(0)))
-
-        if self.debug:
-            print("time:", str(data['date'].iloc[-1]))
-            print(self.trading_phase)
-            print(alignment)
-            print("blance_a:", balance_a,"|", "balance_b:", balance_b)
-            print("distribution_n:", self.distribution_length, "acumulation_n:", self.acumulation_length)
-            print("can_sell:", self._can_sell(balance_a, amount),"|", "can_buy:", self._can_buy(balance_b, amount, current_price))
-            print("amount:", amount)
-            print("amount_price:", amount * current_price)
-            print(actions)
+            actions.append(ValidationPolicy.build_model(Action, action_type=ActionType.WAIT, price=current_price, amount=np.float64(0)))
+
+        if self.tracer.enabled_for(DecisionTracer.DEBUG):
+            self._trace_decision(
+                data,
+                trading_phase=self.trading_phase,
+                alignment=alignment,
+                balance_a=balance_a,
+                balance_b=balance_b,
+                distribution_length=self.distribution_length,
+                acumulation_length=self.acumulation_length,
+                can_sell=self._can_sell(balance_a, amount),
+                can_buy=self._can_buy(balance_b, amount, current_price),
+                amount=amount,
+                amount_price=amount * current_price,
+                actions=list(actions)
+            )
 
         return actions
     
     def calculate_indicators(self, data: MarketData) -> List[Indicator]:
-        return [Indicators.calculate_moving_average(data, window) for window in self.windows]
+        return BatchIndicators.moving_averages(data, self.windows)
+
+    def calculate_latest_indicators(self, data: MarketData) -> Dict[str, float]:
+        close = data['close'].to_numpy()
+        return {f'ma_{window}': LatestIndicators.sma(close, window) for window in self.windows}
+
+    def signal_mask(self, data: MarketData, window_size: int) -> Optional[np.ndarray]:
+        if self.trading_phase == self.TradingPhase.NEUTRAL:
+            return np.zeros(len(data), dtype=bool)
+        return self._alignments(data, window_size) != self.Alignment.NONE
+
+    def wait_bars(self, data: MarketData, start: int, stop: int) -> np.ndarray:
+        if self.trading_phase == self.TradingPhase.NEUTRAL:
+            return np.arange(start, stop)
+        return np.empty(0, dtype=np.int64)
+
+    def state_machine(self, data: MarketData, window_size: int) -> Optional[StateMachine]:
+        alignments = self._alignments(data, window_size)
+        signal = np.select(
+            [alignments == self.Alignment.UP, alignments == self.Alignment.DOWN],
+            [StateMachine.SELL, StateMachine.BUY],
+            StateMachine.NO_SIGNAL
+        )
+        return StateMachine(
+            signal=signal.astype(np.int8),
+            phase=StateMachine.phase_codes([self.trading_phase] * len(data)),
+            max_duration=self.max_duration,
+            safety_margin=self.safety_margin,
+            min_purchase=self.min_purchase,
+            counters=('acumulation_length', 'distribution_length')
+        )
+
+    def _alignments(self, data: MarketData, window_size: int) -> np.ndarray:
+        """Alignment at every bar, as _determine_alignment would return it."""
+        close = data['close'].to_numpy(dtype=np.float64)
+        chain = [close] + [SignalSeries.sma(close, window) for window in self.windows]
+        pairs = list(zip(chain, chain[1:]))
+        alignment = SignalSeries.select(
+            [np.logical_and.reduce([a > b for a, b in pairs]), np.logical_and.reduce([a < b for a, b in pairs])],
+            [self.Alignment.UP, self.Alignment.DOWN],
+            self.Alignment.NONE,
+            len(data)
+        )
+        return SignalSeries.resolve(alignment, SignalSeries.ambiguous(pairs), data, window_size, self._determine_alignment)
 
     def _determine_alignment(self, data: MarketData) -> Alignment:
-        moving_averages = self.calculate_indicators(data)
+        with LatencyTracker.shared().span('indicators'):
+            latest = self.calculate_latest_indicators(data)
+        moving_averages = [latest[f'ma_{window}'] for window in self.windows]
         current_price = data['close'].iloc[-1]
         
-        if (current_price > moving_averages[0].result.iloc[-1] > 
-            moving_averages[1].result.iloc[-1] > 
-            moving_averages[2].result.iloc[-1] > 
-            moving_averages[3].result.iloc[-1]):
+        if (current_price > moving_averages[0] > 
+            moving_averages[1] > 
+            moving_averages[2] > 
+            moving_averages[3]):
             return self.Alignment.UP
-        elif (current_price < moving_averages[0].result.iloc[-1] < 
-            moving_averages[1].result.iloc[-1] < 
-            moving_averages[2].result.iloc[-1] < 
-            moving_averages[3].result.iloc[-1]):
+        elif (current_price < moving_averages[0] < 
+            moving_averages[1] < 
+            moving_averages[2] < 
+            moving_averages[3]):
             return self.Alignment.DOWN
         return self.Alignment.NONE
 
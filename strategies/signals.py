@@ -0,0 +1,122 @@
+from enum import Enum
+from typing import Callable, Iterable, NamedTuple, Tuple
+
+import numpy as np
+
+from definitions import MarketData
+from indicators import IndicatorKernels
+
+class SignalSeries:
+    """
+    Per-bar values of LatestIndicators over a whole series, for precomputed signal masks.
+
+    Element j is what the LatestIndicators function returns for a backtest window of history
+    bars ending at bar j. Moving sums are computed with prefix sums, so comparisons of these
+    values can differ from the per-bar ones in the last bits: ambiguous() flags the bars where
+    that could change a decision, and resolve() recomputes them with the per-bar code.
+    """
+    # Relative distance under which two compared values are treated as a tie
+    TOLERANCE = 1e-9
+
+    @staticmethod
+    def sma(values: np.ndarray, window: int) -> np.ndarray:
+        """LatestIndicators.sma at every bar."""
+        return IndicatorKernels.rolling_mean(np.asarray(values, dtype=np.float64), window)
+
+    @staticmethod
+    def rsi(values: np.ndarray, window: int, history: int) -> np.ndarray:
+        """LatestIndicators.rsi at every bar, for windows of history bars."""
+        # A window of exactly `window` bars only has window - 1 changes
+        changes = window if history > window else window - 1
+        gains, losses = IndicatorKernels._gains_losses(values, np.float64)
+        gain = IndicatorKernels._rolling_sum(gains, changes)
+        loss = IndicatorKernels._rolling_sum(losses, changes)
+        # Sums of exact zeros may come out as prefix sum residues; they are zero per bar
+        scale = np.finfo(np.float64).eps * 64 * max(np.nanmax(gains, initial=0), np.nanmax(losses, initial=0), 1e-300)
+        gain = np.where(gain <= scale, 0.0, gain)
+        loss = np.where(loss <= scale, np.finfo(float).eps, loss)
+        return 100 - 100 / (1 + gain / loss)
+
+    @staticmethod
+    def velocity(values: np.ndarray, window: int) -> np.ndarray:
+        """LatestIndicators.velocity at every bar (same operations, so bit-identical)."""
+        result = np.full(len(values), np.nan)
+        result[window:] = (values[window:] - values[:-window]) / window
+        return result
+
+    @staticmethod
+    def acceleration(values: np.ndarray, window: int) -> np.ndarray:
+        """LatestIndicators.acceleration at every bar (same operations, so bit-identical)."""
+        result = np.full(len(values), np.nan)
+        result[2 * window:] = (values[2 * window:] - 2 * values[window:-window] + values[:-2 * window]) / window ** 2
+        return result
+
+    @staticmethod
+    def ambiguous(pairs: Iterable[Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+        """Bars where any pair of compared values is within TOLERANCE of a tie."""
+        result = None
+        for a, b in pairs:
+            a, b = np.broadcast_arrays(np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64))
+            near = np.abs(a - b) <= SignalSeries.TOLERANCE * np.maximum(np.abs(a), np.abs(b))
+            result = near if result is None else result | near
+        return result
+
+    @staticmethod
+    def resolve(
+            decisions: np.ndarray,
+            ambiguous: np.ndarray,
+            data: MarketData,
+            history: int,
+            decide: Callable[[MarketData], object]
+        ) -> np.ndarray:
+        """
+        Replace the decision of every ambiguous bar backtested with windows of history bars by
+        the per-bar one, decide(window).
+        """
+        for row in np.flatnonzero(ambiguous[history - 1:]) + history - 1:
+            decisions[row] = decide(data.iloc[row + 1 - history:row + 1])
+        return decisions
+
+    @staticmethod
+    def select(conditions: Iterable[np.ndarray], choices: Iterable[object], default: object, length: int) -> np.ndarray:
+        """Object array with the choice of the first true condition at each bar (np.select for objects)."""
+        result = np.full(length, default, dtype=object)
+        decided = np.zeros(length, dtype=bool)
+        for condition, choice in zip(conditions, choices):
+            condition = condition & ~decided
+            result[condition] = choice
+            decided |= condition
+        return result
+
+
+class StateMachine(NamedTuple):
+    """
+    Trading state machine of a strategy over a backtest, for the compiled simulation.
+
+    The strategies share one machine: on every bar the phase gives the order size and which
+    side is counted, and the signal which side is wanted. Signals and phases are precomputed
+    per bar, so only the balance- and counter-dependent part runs in the bar loop.
+    """
+    # Per-bar signal: SELL when the market is up (MA alignment, bullish conditions), BUY when down
+    signal: np.ndarray
+    # Per-bar trading phase after the bar's update
+    phase: np.ndarray
+    max_duration: float
+    safety_margin: float
+    min_purchase: float
+    # Names of the accumulation and distribution counters of the strategy
+    counters: Tuple[str, str]
+
+    NO_SIGNAL = 0
+    SELL = 1
+    BUY = -1
+
+    NEUTRAL = 0
+    ACCUMULATION = 1
+    DISTRIBUTION = 2
+
+    @staticmethod
+    def phase_codes(phases: Iterable[Enum]) -> np.ndarray:
+        """Codes of a sequence of TradingPhase members of any strategy, matched by name."""
+        codes = {'NEUTRAL': StateMachine.NEUTRAL, 'ACCUMULATION': StateMachine.ACCUMULATION, 'DISTRIBUTION': StateMachine.DISTRIBUTION}
+        return np.array([codes[phase.name] for phase in phases], dtype=np.int8)
@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import List
+from functools import cached_property
+from typing import Dict, List, Optional
 from definitions import Memory, MarketData
 from indicators import Indicator
+from strategies.signals import StateMachine
+from decision_trace import DecisionTracer
 from enum import Enum
 from pydantic import BaseModel, Field
 import numpy as np
+import pandas as pd
 
 class ActionType(Enum):
     BUY_MARKET = "buy_market"
@@ -24,6 +28,10 @@ class Action(BaseModel):
         arbitrary_types_allowed = True
 
 class Strategy(ABC):
+    LOOKBACK_PROBE_BARS = 2000
+    # Decision trace of run; strategies set their own from debug/tracer in __init__
+    tracer: DecisionTracer = DecisionTracer.shared()
+
     @abstractmethod
     def run(self, data: MarketData, memory: Memory) -> List[Action]:
         pass
@@ -31,3 +39,95 @@ class Strategy(ABC):
     @abstractmethod
     def calculate_indicators(data: MarketData) -> List[Indicator]:
         pass
+
+    def calculate_latest_indicators(self, data: MarketData) -> Dict[str, float]:
+        """
+        Latest value of each indicator, keyed by indicator name, for the per-bar decision.
+
+        Strategies override this with LatestIndicators so a bar only costs O(window) per
+        indicator; by default the full indicators are computed and their last values read.
+        """
+        return {indicator.name: indicator.last for indicator in self.calculate_indicators(data)}
+
+    def _trace_decision(self, data: MarketData, **fields) -> None:
+        """Record the decision of run on the last bar of data, at DEBUG level."""
+        self.tracer.record(DecisionTracer.DEBUG, 'decision', strategy=type(self).__name__, bar=data['date'].iloc[-1], **fields)
+
+    def signal_mask(self, data: MarketData, window_size: int) -> Optional[np.ndarray]:
+        """
+        Bars where run can place an order, precomputed over the whole market data.
+
+        Used by the skipping backtest, which only calls run on these bars and hands the others
+        to skip_bars. On every bar left out, run must return no order other than WAIT and only
+        change state that skip_bars brings up to date.
+
+        Args:
+            data: Full market data of the backtest
+            window_size: Bars of history run receives, ending at the evaluated bar
+
+        Returns:
+            Boolean array with one element per bar of data, or None to evaluate every bar
+        """
+        return None
+
+    def state_machine(self, data: MarketData, window_size: int) -> Optional[StateMachine]:
+        """
+        Precomputed signals and phases for the compiled simulation of the backtest.
+
+        Only strategies whose decisions fit the shared StateMachine define it; the compiled
+        backtest calls skip_bars over all the bars afterwards to bring the per-bar state up to date.
+
+        Returns:
+            The StateMachine over the bars of data, or None to run the strategy bar by bar
+        """
+        return None
+
+    def wait_bars(self, data: MarketData, start: int, stop: int) -> np.ndarray:
+        """
+        Bars among start to stop - 1 of data, not evaluated by the skipping backtest, where run
+        would have returned a WAIT action.
+
+        Called before skip_bars for the same bars, so the backtest records the same WAIT
+        orders as the regular loop. Strategies that wait in a phase override it.
+
+        Returns:
+            Row positions in data, in increasing order
+        """
+        return np.empty(0, dtype=np.int64)
+
+    def skip_bars(self, data: MarketData, start: int, stop: int, window_size: int) -> None:
+        """
+        Update the per-bar state for the bars start to stop - 1 of data, which were not evaluated.
+
+        Called by the skipping backtest in bar order, with the data given to signal_mask.
+        """
+        pass
+
+    @cached_property
+    def required_lookback(self) -> int:
+        """
+        Minimum number of bars for every indicator of the strategy to have a value at the last bar.
+
+        Derived from the declared indicators by computing them on a synthetic random walk and
+        taking the latest first valid position, so it follows the windows the strategy was
+        configured with. Computed once per strategy instance. Strategies can override it with
+        a closed form.
+
+        Raises:
+            ValueError: If an indicator has no value within LOOKBACK_PROBE_BARS bars
+        """
+        n_bars = self.LOOKBACK_PROBE_BARS
+        rng = np.random.default_rng(0)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+        probe = pd.DataFrame({
+            'date': pd.date_range('2000-01-01', periods=n_bars, freq='min'),
+            'open': close, 'high': close * 1.001, 'low': close * 0.999, 'close': close,
+            'volume': rng.uniform(1, 2, n_bars)
+        })
+        lookback = 1
+        for indicator in self.calculate_indicators(probe):
+            valid = np.flatnonzero(~np.isnan(np.asarray(indicator.values, dtype=np.float64)))
+            if not len(valid):
+                raise ValueError(f"Indicator {indicator.name} has no value within {n_bars} bars")
+            lookback = max(lookback, int(valid[0]) + 1)
+        return lookback
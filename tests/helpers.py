@@ -0,0 +1,51 @@
+"""
+Synthetic market data shared by the unit tests.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+def marketdata_from_close(
+        close: np.ndarray,
+        volume: Optional[np.ndarray] = None,
+        high: Optional[np.ndarray] = None,
+        low: Optional[np.ndarray] = None
+    ) -> pd.DataFrame:
+    """
+    Build a one-minute OHLCV frame around a close series.
+
+    Args:
+        close: Close prices, also used as open prices
+        volume: Volumes, 1000 per bar by default
+        high: High prices, close + 1 by default
+        low: Low prices, close - 1 by default
+    """
+    n_bars = len(close)
+    return pd.DataFrame({
+        'date': pd.date_range('2023-01-01', periods=n_bars, freq='min'),
+        'open': close,
+        'high': close + 1 if high is None else high,
+        'low': close - 1 if low is None else low,
+        'close': close,
+        'volume': np.full(n_bars, 1000.0) if volume is None else volume
+    })
+
+
+def random_walk_marketdata(n_bars: int = 2500, seed: int = 1) -> pd.DataFrame:
+    """
+    Random walk with a slow sinusoidal trend, so strategies go through every phase and signal.
+
+    Prices are rounded to the cent, so flat stretches and exact ties between bars occur.
+    """
+    rng = np.random.default_rng(seed)
+    trend = 0.0008 * np.sin(np.arange(n_bars) / 300)
+    close = np.round(100 * np.exp(np.cumsum(rng.normal(0, 0.002, n_bars) + trend)), 2)
+    return marketdata_from_close(
+        close,
+        volume=np.round(rng.uniform(1000, 2000, n_bars)),
+        high=close * 1.001,
+        low=close * 0.999
+    )
@@ -0,0 +1,152 @@
+"""
+Unit tests for BacktestProcessor.
+
+The vectorized metrics path is checked against the original merge-based implementation.
+"""
+
+import unittest
+import sys
+import os
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtesting.backtester import BacktestProcessor
+from definitions import Memory, Order
+
+
+def merge_based_metrics(marketdata, memory, initial_balance_a, initial_balance_b):
+    """Original pd.merge + ffill/bfill implementation, kept as a reference."""
+    memory_df = pd.DataFrame.from_records([vars(order) for order in memory.orders])
+    df = pd.merge(marketdata, memory_df, left_on='date', right_on='timestamp', how='left')
+    df.loc[0, 'balance_a'] = initial_balance_a
+    df.loc[0, 'balance_b'] = initial_balance_b
+    for column in ['balance_a', 'balance_b', 'total_value']:
+        df[column] = df[column].ffill()
+        first_valid_index = df[column].first_valid_index()
+        if first_valid_index is not None:
+            df[column] = df[column].fillna(df[column].iloc[first_valid_index])
+    df['hold_value'] = df['balance_a'] * df['close']
+    df['total_value_a'] = df['balance_a'] + df['balance_b'] / df['close']
+    df['total_value_b'] = df['balance_b'] + df['hold_value']
+    df['adjusted_a_balance'] = df['balance_a'] - (df['balance_b'].iloc[0] - df['balance_b']) / df['close']
+    df['adjusted_b_balance'] = df['balance_b'] - (df['balance_a'].iloc[0] - df['balance_a']) * df['close']
+    df['timestamp'] = df['timestamp'].fillna(df['date'])
+    df['pair'] = df['pair'].fillna('A/B')
+    df['type'] = df['type'].fillna('wait')
+    df['price'] = df['price'].fillna(df['close'])
+    df['amount'] = df['amount'].fillna(0)
+    df['fee'] = df['fee'].fillna(0)
+    return df
+
+
+class TestBacktestProcessor(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        n = 50
+        self.marketdata = pd.DataFrame({
+            'date': pd.date_range(start='2023-01-01', periods=n, freq='1min'),
+            'open': np.random.uniform(100, 110, n),
+            'high': np.random.uniform(110, 120, n),
+            'low': np.random.uniform(90, 100, n),
+            'close': np.random.uniform(100, 110, n),
+            'volume': np.random.uniform(1000, 2000, n)
+        })
+
+    def _order(self, bar, order_type, amount, balance_a, balance_b):
+        price = self.marketdata['close'].iloc[bar]
+        return Order(
+            timestamp=self.marketdata['date'].iloc[bar],
+            pair='A/B',
+            type=order_type,
+            price=np.float64(price),
+            amount=np.float64(amount),
+            fee=np.float64(amount * 0.001),
+            total_value=np.float64(price * amount),
+            balance_a=np.float64(balance_a),
+            balance_b=np.float64(balance_b)
+        )
+
+    def _assert_matches_reference(self, memory):
+        result = BacktestProcessor.calculate_metrics(self.marketdata, memory, 1.0, 1000.0)
+        expected = merge_based_metrics(self.marketdata, memory, 1.0, 1000.0)
+        self.assertEqual(list(result.columns), list(expected.columns))
+        assert_frame_equal(
+            pd.DataFrame(result).reset_index(drop=True),
+            expected.reset_index(drop=True),
+            check_dtype=False
+        )
+
+    def test_matches_merge_based_metrics(self):
+        """Orders spread over the data produce the same frame as the merge path."""
+        memory = Memory(
+            orders=[
+                self._order(5, 'buy_market', 1.0, 2.0, 890.0),
+                self._order(20, 'wait', 0.0, 2.0, 890.0),
+                self._order(30, 'sell_market', 0.5, 1.5, 940.0),
+            ],
+            balance_a=np.float64(1.5),
+            balance_b=np.float64(940.0)
+        )
+        self._assert_matches_reference(memory)
+
+    def test_multiple_orders_same_bar(self):
+        """Several orders on one bar are expanded into consecutive rows like the merge."""
+        memory = Memory(
+            orders=[
+                self._order(0, 'buy_market', 1.0, 2.0, 890.0),
+                self._order(10, 'buy_market', 1.0, 3.0, 780.0),
+                self._order(10, 'sell_market', 1.0, 2.0, 885.0),
+            ],
+            balance_a=np.float64(2.0),
+            balance_b=np.float64(885.0)
+        )
+        self._assert_matches_reference(memory)
+
+    def test_orders_outside_data_are_ignored(self):
+        """Orders whose timestamp has no matching bar are dropped."""
+        order = self._order(3, 'buy_market', 1.0, 2.0, 890.0)
+        order.timestamp = order.timestamp + timedelta(days=10)
+        memory = Memory(orders=[order], balance_a=np.float64(2.0), balance_b=np.float64(890.0))
+
+        result = BacktestProcessor.calculate_metrics(self.marketdata, memory, 1.0, 1000.0)
+
+        self.assertEqual(len(result), len(self.marketdata))
+        self.assertTrue((result['balance_a'] == 1.0).all())
+        self.assertTrue((result['type'] == 'wait').all())
+
+    def test_from_arrays_without_validation(self):
+        """The array path accepts raw bar indices and skips schema validation on request."""
+        orders = {
+            'pair': np.array(['A/B', 'A/B'], dtype=object),
+            'type': np.array(['buy_market', 'sell_market'], dtype=object),
+            'price': np.array([100.0, 110.0]),
+            'amount': np.array([1.0, 1.0]),
+            'fee': np.array([0.001, 0.11]),
+            'total_value': np.array([100.0, 110.0]),
+            'balance_a': np.array([0.999, 0.0]),
+            'balance_b': np.array([900.0, 1009.89]),
+        }
+        result = BacktestProcessor.calculate_metrics_from_arrays(
+            marketdata=self.marketdata,
+            order_indices=np.array([40, 10]),
+            orders=orders,
+            initial_balance_a=0.0,
+            initial_balance_b=1000.0,
+            validate=False
+        )
+
+        self.assertIsInstance(result, pd.DataFrame)
+        self.assertEqual(result['type'].iloc[10], 'sell_market')
+        self.assertEqual(result['type'].iloc[40], 'buy_market')
+        self.assertEqual(result['balance_b'].iloc[5], 1000.0)
+        self.assertEqual(result['balance_b'].iloc[25], 1009.89)
+        self.assertEqual(result['balance_b'].iloc[-1], 900.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Unit tests for the live bar ring buffer.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+
+from bar_buffer import BarRingBuffer, LiveBars
+
+MINUTE = 60_000
+
+
+def make_bars(start, count, price=1.0):
+    return [[(start + i) * MINUTE, price + i, price + i + 1, price + i - 0.5, price + i + 0.5, 10.0] for i in range(count)]
+
+
+class TestBarRingBuffer(unittest.TestCase):
+    def test_append_and_view(self):
+        buffer = BarRingBuffer(capacity=5)
+        self.assertEqual(buffer.append(make_bars(0, 3)), 3)
+        view = buffer.view()
+        self.assertEqual(len(view), 3)
+        self.assertEqual(list(view['open']), [1.0, 2.0, 3.0])
+        self.assertEqual(view['date'].iloc[0], pd.Timestamp(0))
+
+    def test_wraps_around_keeping_newest(self):
+        buffer = BarRingBuffer(capacity=5)
+        for start in range(0, 12, 3):
+            buffer.append(make_bars(start, 3, price=start + 1.0))
+        view = buffer.view()
+        self.assertEqual(len(view), 5)
+        self.assertEqual(list(view['open']), [8.0, 9.0, 10.0, 11.0, 12.0])
+        self.assertTrue(view['date'].is_monotonic_increasing)
+        self.assertEqual(buffer.last_timestamp, 11 * MINUTE)
+
+    def test_replaces_forming_bar(self):
+        buffer = BarRingBuffer(capacity=5)
+        buffer.append(make_bars(0, 3))
+        updated = make_bars(2, 2, price=100.0)
+        self.assertEqual(buffer.append(updated), 1)
+        self.assertEqual(list(buffer.view()['open']), [1.0, 2.0, 100.0, 101.0])
+        self.assertEqual(buffer.append(make_bars(0, 1)), 0)
+
+    def test_view_is_zero_copy(self):
+        buffer = BarRingBuffer(capacity=5)
+        buffer.append(make_bars(0, 7))
+        view = buffer.view(size=3)
+        self.assertEqual(len(view), 3)
+        self.assertTrue(np.shares_memory(view['close'].to_numpy(), buffer._values['close']))
+        self.assertTrue(np.shares_memory(view['date'].to_numpy(), buffer._dates))
+
+    def test_large_append_keeps_capacity(self):
+        buffer = BarRingBuffer(capacity=5)
+        self.assertEqual(buffer.append(make_bars(0, 20)), 20)
+        self.assertEqual(list(buffer.view()['open']), [16.0, 17.0, 18.0, 19.0, 20.0])
+
+
+class TestLiveBars(unittest.TestCase):
+    def test_warms_once_then_fetches_since_last_bar(self):
+        exchange_api = MagicMock()
+        exchange_api.get_bars.side_effect = [make_bars(0, 5)[::-1], make_bars(4, 2, price=5.0)[::-1]]
+        live_bars = LiveBars(exchange_api, capacity=5)
+
+        first = live_bars.update('DOG/USDT')
+        self.assertEqual(len(first), 5)
+        self.assertIsNone(exchange_api.get_bars.call_args.kwargs['since'])
+
+        second = live_bars.update('DOG/USDT', now=5 * MINUTE)
+        self.assertEqual(exchange_api.get_bars.call_args.kwargs['since'], 4 * MINUTE)
+        self.assertEqual(list(second['open']), [2.0, 3.0, 4.0, 5.0, 6.0])
+
+    def test_rebuilds_after_gap_longer_than_capacity(self):
+        exchange_api = MagicMock()
+        exchange_api.get_bars.side_effect = [make_bars(0, 5)[::-1], make_bars(16, 5, price=100.0)[::-1]]
+        live_bars = LiveBars(exchange_api, capacity=5)
+        live_bars.update('DOG/USDT', now=4 * MINUTE)
+
+        # 16 bars missed: a fetch since bar 4 would only return bars 4 to 8
+        view = live_bars.update('DOG/USDT', now=20 * MINUTE)
+        self.assertIsNone(exchange_api.get_bars.call_args.kwargs['since'])
+        self.assertEqual(list(view['open']), [100.0, 101.0, 102.0, 103.0, 104.0])
+        self.assertEqual(live_bars.buffers['DOG/USDT'].last_timestamp, 20 * MINUTE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Unit tests for the batched bootstrap intervals.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtesting.bootstrap import BootstrapIntervals
+from backtesting.multi_backtest import MultiBacktest
+
+
+class TestBootstrapIntervals(unittest.TestCase):
+    def setUp(self):
+        BootstrapIntervals.clear_cache()
+        rng = np.random.default_rng(1)
+        rows = []
+        for metric, mean in [('balance_a', 10.0), ('balance_b', -5.0), ('total_value_b', 0.0)]:
+            for value in rng.normal(mean, 1.0, 500):
+                rows.append({'Metric': metric, 'Absolute Change': value, 'Percentage Change': value * 2})
+        # A metric with fewer tests exercises the per-size batching
+        for value in rng.normal(3.0, 1.0, 50):
+            rows.append({'Metric': 'hold_value', 'Absolute Change': value, 'Percentage Change': value})
+        self.df = pd.DataFrame(rows)
+
+    def test_confidence_interval_contains_mean(self):
+        intervals = BootstrapIntervals.calculate(self.df, 'Confidence').set_index('Metric')
+        means = self.df.groupby('Metric')['Absolute Change'].mean()
+        for metric, mean in means.items():
+            self.assertLess(intervals.loc[metric, 'Absolute Lower Confidence'], mean)
+            self.assertGreater(intervals.loc[metric, 'Absolute Upper Confidence'], mean)
+
+    def test_confidence_interval_close_to_t_interval(self):
+        bootstrap = MultiBacktest.calculate_confidence_interval(self.df, method='bootstrap').groupby('Metric').first()
+        t_interval = MultiBacktest.calculate_confidence_interval(self.df).groupby('Metric').first()
+        for column in ['Absolute Lower Confidence', 'Absolute Upper Confidence']:
+            np.testing.assert_allclose(bootstrap[column], t_interval[column], atol=0.05)
+
+    def test_prediction_interval_uses_percentiles(self):
+        intervals = BootstrapIntervals.calculate(self.df, 'Prediction', confidence=0.9).set_index('Metric')
+        values = self.df.loc[self.df['Metric'] == 'balance_a', 'Percentage Change']
+        self.assertAlmostEqual(intervals.loc['balance_a', 'Percentage Lower Prediction'], values.quantile(0.05))
+        self.assertAlmostEqual(intervals.loc['balance_a', 'Percentage Upper Prediction'], values.quantile(0.95))
+
+    def test_results_are_cached(self):
+        first = BootstrapIntervals.calculate(self.df)
+        self.assertEqual(len(BootstrapIntervals._cache), 1)
+        second = BootstrapIntervals.calculate(self.df.copy())
+        self.assertEqual(len(BootstrapIntervals._cache), 1)
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_multiple_group_columns(self):
+        df = pd.concat([self.df.assign(Strategy='a'), self.df.assign(Strategy='b')])
+        intervals = BootstrapIntervals.calculate(df, group_columns=['Strategy', 'Metric'])
+        self.assertEqual(len(intervals), 8)
+        self.assertEqual(list(intervals.columns[:2]), ['Strategy', 'Metric'])
+
+
+if __name__ == '__main__':
+    unittest.main()
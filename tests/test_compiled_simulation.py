@@ -0,0 +1,100 @@
+"""
+Unit tests for the compiled state machine simulation of the Backtester.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtesting.backtester import Backtester
+from backtesting.compiled import CompiledSimulation, ORDER_TYPES
+from strategies import MultiMovingAverageStrategy, MomentumRsiStrategy, AdaptiveMovingAverageStrategy
+from strategies.signals import StateMachine
+from tests.helpers import random_walk_marketdata
+
+
+class TestCompiledSimulation(unittest.TestCase):
+    def test_accumulation_counters(self):
+        close = np.array([1.0, 1.0, 2.0, 2.0, 1.0])
+        machine = StateMachine(
+            signal=np.array([StateMachine.SELL, StateMachine.BUY, StateMachine.SELL, StateMachine.NO_SIGNAL, StateMachine.BUY]),
+            phase=np.array([StateMachine.ACCUMULATION] * 4 + [StateMachine.NEUTRAL]),
+            max_duration=10, safety_margin=1, min_purchase=0.5, counters=('a', 'd')
+        )
+        orders, balance_a, balance_b, accumulation, distribution = CompiledSimulation.run(
+            machine, close, first=0, end=5, balance_a=10, balance_b=10, fee=0.0,
+            accumulation_length=0, distribution_length=0
+        )
+        # No sell before a buy in accumulation; the last bar is neutral and waits
+        self.assertEqual([ORDER_TYPES[t] for t in orders['type']], ['buy_market', 'sell_market', 'wait'])
+        np.testing.assert_array_equal(orders['row'], [1, 2, 4])
+        np.testing.assert_allclose(orders['amount'], [1.0, 0.45, 0.0])
+        self.assertEqual((accumulation, distribution), (0, 0))
+        self.assertAlmostEqual(balance_a, 10.55)
+        self.assertAlmostEqual(balance_b, 9.9)
+
+
+class TestCompiledBacktest(unittest.TestCase):
+    def setUp(self):
+        self.marketdata = random_walk_marketdata(1500, seed=2)
+
+    def run_backtester(self, strategy, compiled):
+        backtester = Backtester(strategy, initial_balance_a=10, initial_balance_b=1000, compiled=compiled)
+        backtester.marketdata = self.marketdata
+        backtester._simulate_real_time_execution()
+        return backtester
+
+    def assert_identical(self, make_strategy, state):
+        regular = self.run_backtester(make_strategy(), compiled=False)
+        compiled = self.run_backtester(make_strategy(), compiled=True)
+
+        self.assertGreater(len(regular.memory.orders), 0)
+        self.assertEqual([o.model_dump() for o in compiled.memory.orders], [o.model_dump() for o in regular.memory.orders])
+        self.assertEqual(compiled.memory.balance_a, regular.memory.balance_a)
+        self.assertEqual(compiled.memory.balance_b, regular.memory.balance_b)
+        for attribute in state:
+            self.assertEqual(getattr(compiled.strategy, attribute), getattr(regular.strategy, attribute), attribute)
+        return regular, compiled
+
+    def test_multi_moving_average(self):
+        for phase in MultiMovingAverageStrategy.TradingPhase:
+            self.assert_identical(
+                lambda: MultiMovingAverageStrategy(max_duration=50, min_purchase=0.1, trading_phase=phase, debug=False),
+                state=('acumulation_length', 'distribution_length')
+            )
+
+    def test_momentum_rsi(self):
+        self.assert_identical(
+            lambda: MomentumRsiStrategy(
+                max_duration=50, min_purchase=0.1, safety_margin=1.5,
+                trading_phase=MomentumRsiStrategy.TradingPhase.ACCUMULATION, debug=False
+            ),
+            state=('accumulation_length', 'distribution_length', 'last_condition')
+        )
+
+    def test_adaptive_moving_average(self):
+        regular, compiled = self.assert_identical(
+            lambda: AdaptiveMovingAverageStrategy(max_duration=50, min_purchase=0.1, debug=False),
+            state=('accumulation_length', 'distribution_length', 'trading_phase')
+        )
+        self.assertEqual(list(compiled.strategy.recent_conditions), list(regular.strategy.recent_conditions))
+
+    def test_strategy_without_state_machine(self):
+        class Custom(MultiMovingAverageStrategy):
+            def state_machine(self, data, window_size):
+                return None
+
+        strategy = Custom(max_duration=50, min_purchase=0.1, debug=False)
+        calls = []
+        run = strategy.run
+        strategy.run = lambda data, memory: calls.append(1) or run(data, memory)
+        backtester = self.run_backtester(strategy, compiled=True)
+        self.assertEqual(len(calls), len(self.marketdata) - backtester.window_size)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -324,6 +324,126 @@ class TestDataManager(unittest.TestCase):
         # Check that prices are normalized
         self.assertLessEqual(market_data['close'].max(), 1.0)
     
+    def test_resample_marketdata(self):
+        """Test OHLCV aggregation into higher timeframe bars."""
+        data = pd.DataFrame({
+            'date': pd.date_range(start='2023-01-01 00:03', periods=10, freq='1min'),
+            'open': np.arange(1, 11, dtype=np.float64),
+            'high': np.arange(1, 11, dtype=np.float64) + 1,
+            'low': np.arange(1, 11, dtype=np.float64) - 0.5,
+            'close': np.arange(1, 11, dtype=np.float64) + 0.5,
+            'volume': np.ones(10)
+        })
+        
+        result = DataManager.resample_marketdata(data, '5m')
+        
+        # Buckets start at 00:00, 00:05 and 00:10
+        self.assertEqual(list(result['date']), list(pd.to_datetime(['2023-01-01 00:00', '2023-01-01 00:05', '2023-01-01 00:10'])))
+        self.assertEqual(list(result['open']), [1.0, 3.0, 8.0])
+        self.assertEqual(list(result['high']), [3.0, 8.0, 11.0])
+        self.assertEqual(list(result['low']), [0.5, 2.5, 7.5])
+        self.assertEqual(list(result['close']), [2.5, 7.5, 10.5])
+        self.assertEqual(list(result['volume']), [2.0, 5.0, 3.0])
+        MarketData.validate(result)
+        
+        with self.assertRaises(ValueError):
+            DataManager.resample_marketdata(data, '5x')
+    
+    def test_align_timeframes(self):
+        """Test that aligned columns only use closed higher timeframe bars."""
+        data = pd.DataFrame({
+            'date': pd.date_range(start='2023-01-01', periods=10, freq='1min'),
+            'open': np.arange(1, 11, dtype=np.float64),
+            'high': np.arange(1, 11, dtype=np.float64),
+            'low': np.arange(1, 11, dtype=np.float64),
+            'close': np.arange(1, 11, dtype=np.float64),
+            'volume': np.ones(10)
+        })
+        
+        result = DataManager.align_timeframes(data, ['5m'])
+        
+        # The first 5m bar closes with the 00:04 bar
+        self.assertTrue(result['close_5m'].iloc[:4].isna().all())
+        self.assertEqual(list(result['close_5m'].iloc[4:9]), [5.0] * 5)
+        self.assertEqual(result['close_5m'].iloc[9], 10.0)
+        self.assertEqual(len(result), len(data))
+    
+    def test_get_marketdata_sample_with_timeframe(self):
+        """Test sampling resampled data and reusing the cached aggregates."""
+        DataManager.clear_timeframe_cache()
+        
+        market_data, metadata = DataManager.get_marketdata_sample(
+            data_path=self.sample_data_path,
+            timeframe='4h'
+        )
+        
+        self.assertEqual(len(market_data), 25)
+        self.assertEqual(metadata['timeframe'], '4h')
+        
+        with patch('data_manager.DataManager._read_marketdata') as mock_read:
+            cached_data, _ = DataManager.get_marketdata_sample(
+                data_path=self.sample_data_path,
+                timeframe='4h',
+                start=5,
+                end=10
+            )
+            mock_read.assert_not_called()
+        self.assertEqual(len(cached_data), 5)
+        pd.testing.assert_frame_equal(cached_data, market_data.iloc[5:10])
+        
+        # Changes to a returned frame do not reach the cache, which is bounded
+        resampled = DataManager._load_marketdata(self.sample_data_path, '4h')
+        resampled['close'] = 0.0
+        self.assertNotEqual(DataManager._load_marketdata(self.sample_data_path, '4h')['close'].iloc[0], 0.0)
+        with patch.object(DataManager, 'MARKETDATA_CACHE_SIZE', 2):
+            for timeframe in ['1h', '2h', '8h']:
+                DataManager._load_marketdata(self.sample_data_path, timeframe)
+            self.assertEqual(list(DataManager._timeframe_cache), [(str(self.sample_data_path), '2h'), (str(self.sample_data_path), '8h')])
+        DataManager.clear_timeframe_cache()
+    
+    def test_read_marketdata_types_and_cache(self):
+        """Test declared column types and reuse of parsed files while they are unchanged."""
+        DataManager.clear_marketdata_cache()
+        
+        data = DataManager._read_marketdata(self.sample_data_path)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(data['date']))
+        self.assertTrue(all(data[col].dtype == np.float64 for col in ['open', 'high', 'low', 'close', 'volume']))
+        pd.testing.assert_series_equal(data['date'], self.sample_data['date'], check_dtype=False)
+        
+        with patch('data_manager.DataManager._parse_marketdata_csv') as mock_parse:
+            cached = DataManager._read_marketdata(self.sample_data_path)
+            mock_parse.assert_not_called()
+        pd.testing.assert_frame_equal(cached, data)
+        
+        # Changes to a returned frame do not reach the cache
+        cached['close'] = 0.0
+        self.assertEqual(DataManager._read_marketdata(self.sample_data_path)['close'].iloc[0], data['close'].iloc[0])
+        
+        # A rewritten file is parsed again
+        self.sample_data.iloc[:10].to_csv(self.sample_data_path, index=False)
+        self.assertEqual(len(DataManager._read_marketdata(self.sample_data_path)), 10)
+        DataManager.clear_marketdata_cache()
+    
+    def test_read_marketdata_formats_and_eviction(self):
+        """Test date format fallback, non-positive prices and the cache size limit."""
+        DataManager.clear_marketdata_cache()
+        
+        other_path = self.test_dir / 'daily.csv'
+        pd.DataFrame({'date': ['2023-01-01', '2023-01-02'], 'close': [1.0, -2.0]}).to_csv(other_path, index=False)
+        data = DataManager._read_marketdata(other_path)
+        self.assertEqual(list(data['date']), list(pd.to_datetime(['2023-01-01', '2023-01-02'])))
+        self.assertEqual(list(data['close']), [3.01, 0.01])
+        
+        with patch.object(DataManager, 'MARKETDATA_CACHE_SIZE', 2):
+            for path in sorted(self.multi_data_dir.glob('*.csv')):
+                DataManager._read_marketdata(path)
+            self.assertEqual(len(DataManager._marketdata_cache), 2)
+            self.assertNotIn(str(other_path), DataManager._marketdata_cache)
+        
+        with self.assertRaises(ValueError):
+            DataManager._read_marketdata(self.test_dir / 'missing.csv')
+        DataManager.clear_marketdata_cache()
+    
     @patch('data_manager.CoinexManager.download_prices')
     def test_download_prices_coinex(self, mock_download):
         """Test download_prices with Coinex source."""
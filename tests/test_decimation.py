@@ -0,0 +1,122 @@
+"""
+Unit tests for plot decimation and batch rendering.
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from drawer import BacktestDrawer, BatchRenderer, Decimator
+from definitions import PlotMode
+
+
+class TestDecimator(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.y = np.cumsum(rng.normal(size=43200))
+
+    def test_short_series_is_kept(self):
+        np.testing.assert_array_equal(Decimator.decimate(self.y[:100], 500), np.arange(100))
+        np.testing.assert_array_equal(Decimator.decimate(self.y), np.arange(len(self.y)))
+
+    def test_minmax_keeps_extremes_and_endpoints(self):
+        rows = Decimator.decimate(self.y, 1000, 'minmax')
+        self.assertLessEqual(len(rows), 1000)
+        self.assertIn(0, rows)
+        self.assertIn(len(self.y) - 1, rows)
+        self.assertIn(np.argmax(self.y), rows)
+        self.assertIn(np.argmin(self.y), rows)
+        self.assertTrue(np.all(np.diff(rows) > 0))
+
+    def test_minmax_ignores_nan(self):
+        y = self.y.copy()
+        y[:5000] = np.nan
+        rows = Decimator.decimate(y, 1000, 'minmax')
+        self.assertIn(np.nanargmax(y), rows)
+
+    def test_lttb(self):
+        rows = Decimator.decimate(self.y, 1000, 'lttb')
+        self.assertEqual(len(rows), 1000)
+        self.assertEqual(rows[0], 0)
+        self.assertEqual(rows[-1], len(self.y) - 1)
+        self.assertTrue(np.all(np.diff(rows) > 0))
+
+    def test_lttb_skips_nan(self):
+        y = self.y.copy()
+        y[:100] = np.nan
+        rows = Decimator.decimate(y, 500, 'lttb')
+        self.assertEqual(rows[0], 100)
+        self.assertTrue(np.isfinite(y[rows]).all())
+
+    def test_nan_gaps_are_kept(self):
+        y = self.y.copy()
+        y[10000:12000] = np.nan
+        for method in Decimator.METHODS:
+            rows = Decimator.decimate(y, 500, method)
+            # The line breaks at the gap instead of bridging it
+            self.assertIn(10000, rows)
+            self.assertEqual(np.isnan(y[rows]).sum(), 1)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            Decimator.decimate(self.y, 100, 'every_nth')
+
+
+class TestBatchRendering(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        n = 5000
+        close = 100 + np.cumsum(np.random.default_rng(1).normal(size=n))
+        types = np.full(n, 'wait', dtype=object)
+        types[[100, 2000]] = ['buy_market', 'sell_market']
+        self.df = pd.DataFrame({
+            'date': pd.date_range(start='2023-01-01', periods=n, freq='1min'),
+            'close': close,
+            'price': close,
+            'type': types,
+            'balance_a': np.ones(n),
+            'total_value_b': close,
+        })
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_draw_with_max_points(self):
+        save_path = self.test_dir / 'backtest.png'
+        extra = [((self.df['date'], pd.Series(self.df['close']).rolling(50).mean()), {'type': 'plot', 'label': 'SMA'})]
+        BacktestDrawer.draw(
+            self.df, [PlotMode.PRICE, PlotMode.BALANCE_A, PlotMode.TOTAL_VALUE_B],
+            extra_plots_price=extra, save_path=save_path, show=False, max_points=500, decimation='lttb'
+        )
+        self.assertTrue(save_path.exists())
+
+    def test_draw_decimates_by_default(self):
+        plotted = []
+        original = BacktestDrawer._draw_balances_lines
+        def record(dates, df, config, decimate):
+            plotted.append(len(decimate(df[config['column']].to_numpy())))
+            return original(dates, df, config, decimate)
+        with patch.object(BacktestDrawer, '_draw_balances_lines', side_effect=record):
+            BacktestDrawer.draw(self.df, [PlotMode.TOTAL_VALUE_B], save_path=self.test_dir / 'default.png', show=False)
+        self.assertLessEqual(plotted[0], BacktestDrawer.MAX_POINTS)
+
+    def test_batch_render_in_workers(self):
+        paths = [self.test_dir / f'plot_{i}.png' for i in range(2)]
+        BatchRenderer.render(
+            [(BacktestDrawer.draw, {'df': self.df, 'plot_modes': [PlotMode.PRICE], 'save_path': path, 'max_points': 500}) for path in paths],
+            max_workers=2
+        )
+        self.assertTrue(all(path.exists() for path in paths))
+
+
+if __name__ == '__main__':
+    unittest.main()
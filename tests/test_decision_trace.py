@@ -0,0 +1,121 @@
+"""
+Unit tests for the strategy decision tracer.
+"""
+
+import unittest
+import sys
+import os
+import io
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from decision_trace import DecisionTracer
+from definitions import Memory
+from strategies import MultiMovingAverageStrategy, MomentumRsiStrategy, AdaptiveMovingAverageStrategy, Action, ActionType
+from tests.helpers import marketdata_from_close
+
+
+class TestDecisionTracer(unittest.TestCase):
+    def test_disabled_records_nothing(self):
+        tracer = DecisionTracer()
+        self.assertFalse(tracer.enabled_for(DecisionTracer.INFO))
+        tracer.record(DecisionTracer.INFO, 'decision', value=1)
+        self.assertIsNone(tracer._writer)
+        self.assertTrue(tracer._queue.empty())
+
+    def test_level_gating_and_serialization(self):
+        stream = io.StringIO()
+        tracer = DecisionTracer(level=DecisionTracer.INFO, sink=stream)
+        tracer.record(DecisionTracer.DEBUG, 'ignored')
+        action = Action(action_type=ActionType.BUY_MARKET, price=np.float64(2), amount=np.float64(0.5))
+        tracer.record(
+            DecisionTracer.INFO, 'decision',
+            phase=MultiMovingAverageStrategy.TradingPhase.DISTRIBUTION,
+            bar=pd.Timestamp('2023-01-01 10:00'), count=np.int64(3), actions=[action]
+        )
+        tracer.close()
+
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(len(records), 1)
+        record = records[0]
+        self.assertEqual(record['level'], 'INFO')
+        self.assertEqual(record['phase'], 'DISTRIBUTION')
+        self.assertEqual(record['bar'], '2023-01-01 10:00:00')
+        self.assertEqual(record['count'], 3)
+        self.assertEqual(record['actions'], [{'action_type': 'buy_market', 'price': 2.0, 'amount': 0.5}])
+
+    def test_file_sink_and_configure(self):
+        directory = Path(tempfile.mkdtemp())
+        try:
+            path = directory / 'trace.jsonl'
+            tracer = DecisionTracer(level=DecisionTracer.DEBUG, sink=path)
+            for i in range(3000):
+                tracer.record(DecisionTracer.DEBUG, 'decision', i=i)
+            tracer.flush()
+            self.assertEqual(len(path.read_text().splitlines()), 3000)
+
+            tracer.configure(None)
+            tracer.record(DecisionTracer.DEBUG, 'decision', i=-1)
+            self.assertIsNone(tracer._writer)
+            self.assertEqual([json.loads(line)['i'] for line in path.read_text().splitlines()], list(range(3000)))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_writers_share_one_exit_hook(self):
+        with patch('decision_trace.atexit.register') as register, patch.object(DecisionTracer, '_atexit_registered', False):
+            tracers = [DecisionTracer(level=DecisionTracer.INFO, sink=io.StringIO()) for _ in range(3)]
+            for tracer in tracers:
+                tracer.record(DecisionTracer.INFO, 'decision')
+            register.assert_called_once_with(DecisionTracer.close_all)
+            self.assertTrue(all(tracer in DecisionTracer._running for tracer in tracers))
+
+            DecisionTracer.close_all()
+            self.assertTrue(all(tracer._writer is None for tracer in tracers))
+            self.assertTrue(all(tracer not in DecisionTracer._running for tracer in tracers))
+            self.assertTrue(all(tracer.sink.getvalue().count('\n') == 1 for tracer in tracers))
+
+
+class TestStrategyTracing(unittest.TestCase):
+    def setUp(self):
+        self.data = marketdata_from_close(100 + 0.1 * np.arange(300))
+        self.memory = Memory(orders=[], balance_a=np.float64(1), balance_b=np.float64(100))
+
+    def test_defaults_to_disabled_shared_tracer(self):
+        for strategy_cls in (MultiMovingAverageStrategy, MomentumRsiStrategy, AdaptiveMovingAverageStrategy):
+            strategy = strategy_cls()
+            self.assertIs(strategy.tracer, DecisionTracer.shared())
+            self.assertFalse(strategy.tracer.enabled_for(DecisionTracer.DEBUG))
+        self.assertEqual(strategy_cls(debug=True).tracer.sink, sys.stdout)
+        # Debugging strategies share one console tracer, and so one writer thread
+        self.assertIs(MultiMovingAverageStrategy(debug=True).tracer, MomentumRsiStrategy(debug=True).tracer)
+
+    def test_run_traces_decision(self):
+        stream = io.StringIO()
+        tracer = DecisionTracer(level=DecisionTracer.DEBUG, sink=stream)
+        strategies = [
+            MultiMovingAverageStrategy(trading_phase=MultiMovingAverageStrategy.TradingPhase.DISTRIBUTION, tracer=tracer),
+            MomentumRsiStrategy(tracer=tracer),
+            AdaptiveMovingAverageStrategy(tracer=tracer),
+        ]
+        for strategy in strategies:
+            strategy.run(self.data, self.memory)
+        tracer.close()
+
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([record['strategy'] for record in records], [type(s).__name__ for s in strategies])
+        self.assertTrue(all(record['bar'] == '2023-01-01 04:59:00' for record in records))
+        self.assertEqual(records[0]['alignment'], 'UP')
+        self.assertEqual(records[0]['actions'][0]['action_type'], 'sell_market')
+        self.assertEqual(records[1]['market_condition'], 'BULLISH')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,11 @@
 import unittest
 from unittest.mock import MagicMock, patch
 import os
+import time
 import ccxt
 
 from exchange_apis import BaseExchangeAPI, BinanceAPI, KrakenAPI, OKXAPI, BitgetAPI
+from request_scheduler import RequestScheduler
 
 class TestBaseExchangeAPI(unittest.TestCase):
     def setUp(self):
@@ -15,6 +17,8 @@ class TestBaseExchangeAPI(unittest.TestCase):
         with patch.object(BaseExchangeAPI, '_initialize_connection'):
             self.api = BaseExchangeAPI('testexchange', 'TEST_API_KEY', 'TEST_API_SECRET', {})
             self.api.exchange = self.mock_exchange
+            # Fast scheduler so tests making several calls are not throttled
+            self.api.scheduler = RequestScheduler(rate=1000)
         
         # Test data
         self.test_pair = 'BTC/USDT'
@@ -30,6 +34,8 @@ class TestBaseExchangeAPI(unittest.TestCase):
         self.mock_exchange.cancel_order.return_value = {'id': self.test_order_id, 'status': 'canceled'}
         self.mock_exchange.fetch_ohlcv.return_value = [[1, 2, 3, 4, 5], [6, 7, 8, 9, 10]]
         self.mock_exchange.fetch_trades.return_value = [{'id': '1'}, {'id': '2'}]
+        self.mock_exchange.load_markets.return_value = {self.test_pair: {'precision': {'amount': 0.0001, 'price': 0.01}}}
+        self.mock_exchange.precisionMode = ccxt.TICK_SIZE
         
         # Attributes for testing
         self.mock_exchange.id = 'testexchange'
@@ -85,6 +91,111 @@ class TestBaseExchangeAPI(unittest.TestCase):
         result = self.api.fetch_trades(self.test_pair)
         self.mock_exchange.fetch_trades.assert_called_once()
         self.assertEqual(len(result), 2)  # Two trades in the mock response
+    
+    def test_get_server_time(self):
+        """Test reading the exchange clock, and the local one without a time endpoint."""
+        self.mock_exchange.fetch_time.return_value = 1700000000123
+        self.mock_exchange.has = {'fetchTime': True}
+        self.assertEqual(self.api.get_server_time(), 1700000000123)
+        
+        self.mock_exchange.has = {}
+        self.mock_exchange.milliseconds.return_value = 1700000000500
+        self.mock_exchange.options = {'timeDifference': 100}
+        self.assertEqual(self.api.get_server_time(), 1700000000400)
+        self.mock_exchange.fetch_time.assert_called_once()
+    
+    def test_balance_cache(self):
+        """Test that every currency is served from one cached balance fetch."""
+        self.assertEqual(self.api.get_account_balance('BTC'), 1.0)
+        self.assertEqual(self.api.get_account_balance('USDT'), 50000.0)
+        self.mock_exchange.fetch_balance.assert_called_once()
+        
+        # Expired cache
+        self.api.balance_ttl = 0
+        self.api.get_account_balance('BTC')
+        self.assertEqual(self.mock_exchange.fetch_balance.call_count, 2)
+    
+    def test_balance_copies(self):
+        """Test that modifying a returned balance does not modify the cached one."""
+        balance = self.api.get_balances()
+        balance['total']['BTC'] = 0.0
+        self.assertEqual(self.api.get_balances()['total']['BTC'], 1.0)
+        self.mock_exchange.fetch_balance.assert_called_once()
+    
+    def test_orders_use_market_precision(self):
+        """Test that order amounts and prices are rounded with the cached market metadata."""
+        self.api.create_order(self.test_pair, 'limit', 'buy', 0.123456, 50000.004)
+        self.api.create_order(self.test_pair, 'limit', 'sell', 0.1, 50000.0)
+        self.mock_exchange.create_order.assert_any_call(self.test_pair, 'limit', 'buy', 0.1234, 50000.0, {})
+        self.mock_exchange.load_markets.assert_called_once_with(False)
+    
+    def test_orders_invalidate_balance_cache(self):
+        """Test that placing and cancelling orders drops the cached balance."""
+        self.api.get_account_balance('BTC')
+        self.api.create_order(self.test_pair, 'market', 'buy', self.test_amount, self.test_price)
+        self.api.get_account_balance('BTC')
+        self.assertEqual(self.mock_exchange.fetch_balance.call_count, 2)
+        
+        self.api.cancel_order(self.test_order_id, self.test_pair)
+        self.api.get_account_balance('BTC')
+        self.assertEqual(self.mock_exchange.fetch_balance.call_count, 3)
+    
+    def test_fills_invalidate_balance_cache(self):
+        """Test that new fills seen through get_order drop the cached balance."""
+        self.mock_exchange.fetch_order.return_value = {'id': self.test_order_id, 'filled': 0.05, 'status': 'open'}
+        self.api.get_account_balance('BTC')
+        self.api.get_order(self.test_order_id, self.test_pair)
+        self.api.get_account_balance('BTC')
+        self.assertEqual(self.mock_exchange.fetch_balance.call_count, 2)
+        
+        # Same fill seen again: the cache stays valid
+        self.api.get_order(self.test_order_id, self.test_pair)
+        self.api.get_account_balance('BTC')
+        self.assertEqual(self.mock_exchange.fetch_balance.call_count, 2)
+    
+    def test_markets_cache_with_background_refresh(self):
+        """Test that markets are loaded once and refreshed in the background when stale."""
+        self.mock_exchange.load_markets.return_value = {self.test_pair: {'precision': {'amount': 4}}}
+        self.assertEqual(self.api.get_market(self.test_pair)['precision']['amount'], 4)
+        self.api.get_markets()
+        self.mock_exchange.load_markets.assert_called_once_with(False)
+        
+        self.api.markets_ttl = 0
+        self.mock_exchange.load_markets.return_value = {self.test_pair: {'precision': {'amount': 6}}}
+        # The stale markets are served while the refresh runs
+        self.assertEqual(self.api.get_market(self.test_pair)['precision']['amount'], 4)
+        for _ in range(100):
+            if not self.api._markets_refreshing:
+                break
+            time.sleep(0.01)
+        self.mock_exchange.load_markets.assert_called_with(True)
+        self.api.markets_ttl = 3600
+        self.assertEqual(self.api.get_market(self.test_pair)['precision']['amount'], 6)
+
+    
+    def test_submit_orders_uses_batch_endpoint(self):
+        """Test that several orders go in one request when the exchange supports it."""
+        self.mock_exchange.has = {'createOrders': True}
+        self.mock_exchange.create_orders.return_value = [{'id': '1'}, {'id': '2'}]
+        orders = [
+            {'symbol': self.test_pair, 'type': 'limit', 'side': 'buy', 'amount': 0.1, 'price': 49000.0},
+            {'symbol': self.test_pair, 'type': 'limit', 'side': 'sell', 'amount': 0.1, 'price': 51000.0},
+        ]
+        result = self.api.create_orders(orders)
+        self.mock_exchange.create_orders.assert_called_once_with(orders)
+        self.mock_exchange.create_order.assert_not_called()
+        self.assertEqual([order['id'] for order in result], ['1', '2'])
+    
+    def test_submit_orders_falls_back_to_concurrent_requests(self):
+        """Test one request per order when there is no batch endpoint."""
+        orders = [
+            {'symbol': self.test_pair, 'type': 'market', 'side': 'buy', 'amount': 0.1, 'price': 50000.0},
+            {'symbol': self.test_pair, 'type': 'market', 'side': 'sell', 'amount': 0.1, 'price': 50000.0, 'params': {'postOnly': False}},
+        ]
+        futures = self.api.submit_orders(orders)
+        self.assertEqual([future.result(timeout=1)['id'] for future in futures], [self.test_order_id] * 2)
+        self.assertEqual(self.mock_exchange.create_order.call_count, 2)
+        self.mock_exchange.create_order.assert_any_call(self.test_pair, 'market', 'sell', 0.1, 50000.0, {'postOnly': False})
 
 
 class TestExchangeImplementations(unittest.TestCase):
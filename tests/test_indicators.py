@@ -10,7 +10,11 @@ import pandas as pd
 import numpy as np
 from pandas.testing import assert_series_equal
 
-from indicators import Indicators, Indicator, IndicatorTypes
+from pydantic import ValidationError
+
+from indicators import Indicators, BatchIndicators, IndicatorKernels, LatestIndicators, Indicator, IndicatorModel, IndicatorTypes
+from strategies import MultiMovingAverageStrategy, MomentumRsiStrategy, AdaptiveMovingAverageStrategy
+from drawer import IndicatorPlotManager
 from definitions import MarketData
 
 
@@ -205,5 +209,242 @@ class TestIndicators(unittest.TestCase):
         self.assertTrue(atr.result.iloc[:window].isna().any())
 
 
+class TestBatchIndicators(unittest.TestCase):
+    """Test cases for the BatchIndicators class against the per-window Indicators."""
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.prices = 100 + np.cumsum(rng.normal(0, 1, (3, 500)), axis=1)
+        self.windows = [1, 5, 14, 50]
+
+    def assert_matches(self, batch, reference):
+        for series in range(self.prices.shape[0]):
+            for index, window in enumerate(self.windows):
+                expected = reference(pd.Series(self.prices[series]), window)
+                np.testing.assert_allclose(batch[series, index], expected, rtol=1e-8, atol=1e-8)
+
+    def test_shapes(self):
+        self.assertEqual(BatchIndicators.rolling_mean(self.prices, self.windows).shape, (3, 4, 500))
+        self.assertEqual(BatchIndicators.rolling_mean(self.prices[0], 20).shape, (1, 1, 500))
+        with self.assertRaises(ValueError):
+            BatchIndicators.rolling_mean(self.prices, [0])
+
+    def test_rolling_mean(self):
+        batch = BatchIndicators.rolling_mean(self.prices, self.windows)
+        self.assert_matches(batch, lambda close, window: close.rolling(window).mean())
+
+    def test_bollinger_bands(self):
+        middle, upper, lower = BatchIndicators.bollinger_bands(self.prices, self.windows, num_std=2.0)
+        self.assert_matches(upper, lambda close, window: close.rolling(window).mean() + 2 * close.rolling(window).std())
+        self.assert_matches(lower, lambda close, window: close.rolling(window).mean() - 2 * close.rolling(window).std())
+
+    def test_rolling_std_on_a_trend(self):
+        # A long climb far from the series mean: the sum-of-squares formula lost most digits here
+        rng = np.random.default_rng(3)
+        steps = rng.normal(0, 1, (2, 100_000)) * 20
+        prices = 20_000 + np.linspace(0, 50_000, 100_000) + np.cumsum(steps, axis=1)
+        batch = BatchIndicators.rolling_std(prices, [5, 20, 200])
+        for series in range(prices.shape[0]):
+            for index, window in enumerate([5, 20, 200]):
+                exact = np.sqrt(TestIndicatorKernels.exact_var(prices[series], window))
+                np.testing.assert_allclose(batch[series, index], exact, rtol=1e-6)
+                # pandas' online update drifts by about 1e-5 on short windows of this series
+                expected = pd.Series(prices[series]).rolling(window).std().to_numpy()
+                np.testing.assert_allclose(batch[series, index], expected, rtol=1e-4)
+                np.testing.assert_array_equal(batch[series, index], IndicatorKernels.rolling_std(prices[series], window))
+
+    def test_rsi(self):
+        batch = BatchIndicators.rsi(self.prices, self.windows)
+        self.assert_matches(batch, lambda close, window: Indicators.calculate_rsi(pd.DataFrame({'close': close}), window).result)
+
+    def test_rsi_matches_kernels_without_losses(self):
+        # Rising prices with a single tiny dip: both decide the zero-loss windows alike
+        prices = 50_000 + np.arange(300, dtype=np.float64)
+        prices[150] -= 1e-8
+        batch = BatchIndicators.rsi(prices, [5, 14])
+        for index, window in enumerate([5, 14]):
+            np.testing.assert_array_equal(batch[0, index], IndicatorKernels.rsi(prices, window))
+
+    def test_velocity(self):
+        batch = BatchIndicators.velocity(self.prices, self.windows)
+        self.assert_matches(batch, lambda close, window: Indicators.calculate_velocity(close, window).result)
+
+    def test_moving_averages(self):
+        data = pd.DataFrame({'close': self.prices[0], 'volume': self.prices[1]})
+        indicators = BatchIndicators.moving_averages(data, [5, 20])
+        self.assertEqual([indicator.name for indicator in indicators], ['ma_5', 'ma_20'])
+        assert_series_equal(indicators[1].result, Indicators.calculate_moving_average(data, 20).result, check_names=False, rtol=1e-10)
+
+        volume = BatchIndicators.moving_averages(data, [20], column='volume')[0]
+        self.assertEqual(volume.name, 'volume_sma_20')
+        self.assertEqual(volume.type, IndicatorTypes.Extra.VOLUME_SMA)
+
+
+class TestIndicatorKernels(unittest.TestCase):
+    """Test cases for the IndicatorKernels class."""
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.close = 1000 + np.cumsum(rng.normal(0, 1, 3000))
+        self.high = self.close + rng.uniform(0, 1, 3000)
+        self.low = self.close - rng.uniform(0, 1, 3000)
+
+    @staticmethod
+    def exact_var(values, window):
+        expected = np.full(len(values), np.nan)
+        windows = np.lib.stride_tricks.sliding_window_view(values, window)
+        expected[window - 1:] = windows.var(axis=1, ddof=1)
+        return expected
+
+    @staticmethod
+    def wilder_reference(values, window):
+        result = np.full(len(values), np.nan)
+        result[window - 1] = values[:window].mean()
+        for t in range(window, len(values)):
+            result[t] = result[t - 1] + (values[t] - result[t - 1]) / window
+        return result
+
+    def test_rolling_var_is_stable(self):
+        # Tiny moves on a high price level: the sum-of-squares formula loses every digit here
+        values = 1e6 + np.cumsum(np.random.default_rng(0).normal(0, 1e-3, 3000))
+        for window in (2, 14, IndicatorKernels.EXACT_WINDOW + 1, 200):
+            expected = self.exact_var(values, window)
+            np.testing.assert_allclose(IndicatorKernels.rolling_var(values, window), expected, rtol=1e-6)
+
+    def test_rolling_var_edges(self):
+        self.assertTrue(np.isnan(IndicatorKernels.rolling_var(self.close, 1)).all())
+        self.assertTrue(np.isnan(IndicatorKernels.rolling_var(self.close[:5], 10)).all())
+        np.testing.assert_allclose(IndicatorKernels.rolling_var(np.full(100, 5.0), 20)[19:], 0.0)
+        with self.assertRaises(ValueError):
+            IndicatorKernels.rolling_var(self.close, 0)
+
+    def test_wilder_rsi(self):
+        delta = np.diff(self.close)
+        gain = self.wilder_reference(np.maximum(delta, 0), 14)
+        loss = self.wilder_reference(np.maximum(-delta, 0), 14)
+        rsi = IndicatorKernels.wilder_rsi(self.close, 14)
+        self.assertTrue(np.isnan(rsi[:14]).all())
+        np.testing.assert_allclose(rsi[1:], 100 - 100 / (1 + gain / loss), rtol=1e-9)
+
+        indicator = Indicators.calculate_wilder_rsi(pd.DataFrame({'close': self.close}), 14)
+        self.assertEqual(indicator.name, 'wilder_rsi_14')
+        np.testing.assert_allclose(indicator.result.to_numpy(), rsi)
+
+    def test_true_range_and_atr(self):
+        high, low, close = pd.Series(self.high), pd.Series(self.low), pd.Series(self.close)
+        expected = pd.concat([high - low, abs(high - close.shift()), abs(low - close.shift())], axis=1).max(axis=1)
+        true_range = IndicatorKernels.true_range(self.high, self.low, self.close)
+        np.testing.assert_allclose(true_range, expected)
+        np.testing.assert_allclose(IndicatorKernels.atr(self.high, self.low, self.close, 14), expected.rolling(14).mean(), rtol=1e-9)
+        np.testing.assert_allclose(IndicatorKernels.atr(self.high, self.low, self.close, 14, wilder=True), self.wilder_reference(true_range, 14), rtol=1e-9)
+
+    def test_rolling_mean_matches_batch(self):
+        for window in (5, 200):
+            # One centering for both, so the results are bit-identical
+            np.testing.assert_array_equal(IndicatorKernels.rolling_mean(self.close, window), BatchIndicators.rolling_mean(self.close, window)[0, 0])
+
+    def test_float32_mode(self):
+        for kernel in (
+            lambda dtype: IndicatorKernels.rolling_std(self.close, 20, dtype=dtype),
+            lambda dtype: IndicatorKernels.rsi(self.close, 14, dtype=dtype),
+            lambda dtype: IndicatorKernels.wilder_rsi(self.close, 14, dtype=dtype),
+            lambda dtype: IndicatorKernels.atr(self.high, self.low, self.close, 14, dtype=dtype),
+        ):
+            result = kernel(np.float32)
+            self.assertEqual(result.dtype, np.float32)
+            np.testing.assert_allclose(result, kernel(np.float64), rtol=1e-3, atol=1e-3)
+
+
+class TestIndicator(unittest.TestCase):
+    """Test cases for the lightweight Indicator container."""
+
+    def test_values_without_series(self):
+        values = np.array([1.0, 2.0, 3.0])
+        indicator = Indicator(name='ma_2', type=IndicatorTypes.Price.SIMPLE_MOVING_AVERAGE, values=values)
+        self.assertFalse(hasattr(indicator, '__dict__'))
+        self.assertEqual(indicator.last, 3.0)
+        self.assertIsNone(indicator._result)
+
+        # The Series is built on demand on top of the same array
+        self.assertTrue(np.shares_memory(indicator.result.to_numpy(), values))
+        self.assertIs(indicator.result, indicator.result)
+
+    def test_series_is_kept(self):
+        series = pd.Series([1.0, 2.0], index=[10, 11], name='close')
+        indicator = Indicator(name='x', type=IndicatorTypes.Extra.VELOCITY, result=series)
+        self.assertIs(indicator.result, series)
+        self.assertEqual(list(indicator.index), [10, 11])
+        with self.assertRaises(ValueError):
+            Indicator(name='empty', type=IndicatorTypes.Extra.VELOCITY)
+
+    def test_to_model_validates(self):
+        indicator = Indicator(name='rsi_14', type=IndicatorTypes.Extra.RELATIVE_STRENGTH_INDEX, values=np.array([50.0]))
+        model = indicator.to_model()
+        self.assertIsInstance(model, IndicatorModel)
+        assert_series_equal(model.result, indicator.result)
+        with self.assertRaises(ValidationError):
+            Indicator(name='bad', type='not a type', values=np.array([1.0])).to_model()
+
+    def test_plot_manager_accepts_indicators(self):
+        data = pd.DataFrame({'date': pd.date_range('2023-01-01', periods=3), 'close': [1.0, 2.0, 3.0]})
+        indicators = [
+            Indicator(name='ma_2', type=IndicatorTypes.Price.SIMPLE_MOVING_AVERAGE, values=np.array([np.nan, 1.5, 2.5])),
+            Indicator(name='rsi_2', type=IndicatorTypes.Extra.RELATIVE_STRENGTH_INDEX, values=np.array([np.nan, 100.0, 100.0])),
+        ]
+        price_plots = IndicatorPlotManager().create_price_plots(data, indicators)
+        technical_plots = IndicatorPlotManager().create_technical_plots(data, indicators)
+        self.assertEqual([style['label'] for _, style in price_plots], ['ma_2'])
+        self.assertEqual([style['label'] for _, style in technical_plots], ['rsi_2'])
+        self.assertEqual(price_plots[0][0][1].iloc[-1], 2.5)
+
+
+class TestLatestIndicators(unittest.TestCase):
+    """Test cases for the last-value indicator API against the full Indicators."""
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        close = 100 + np.cumsum(rng.normal(0, 1, 200))
+        self.data = pd.DataFrame({
+            'date': pd.date_range('2023-01-01', periods=200, freq='min'),
+            'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+            'volume': rng.uniform(1000, 2000, 200)
+        })
+        self.close = close
+
+    def test_matches_full_indicators(self):
+        for window in (5, 14, 50):
+            velocity = Indicators.calculate_velocity(self.data['close'], window)
+            expected = {
+                'sma': Indicators.calculate_moving_average(self.data, window).last,
+                'ema': Indicators.calculate_exponential_moving_average(self.data, window).last,
+                'rsi': Indicators.calculate_rsi(self.data, window).last,
+                'velocity': velocity.last,
+                'acceleration': Indicators.calculate_acceleration(velocity.result, window).last,
+            }
+            for name, value in expected.items():
+                self.assertAlmostEqual(getattr(LatestIndicators, name)(self.close, window), value, places=9, msg=f"{name} {window}")
+
+    def test_short_data(self):
+        self.assertTrue(np.isnan(LatestIndicators.sma(self.close[:4], 5)))
+        self.assertTrue(np.isnan(LatestIndicators.velocity(self.close[:5], 5)))
+        self.assertTrue(np.isnan(LatestIndicators.acceleration(self.close[:10], 5)))
+        # With exactly window values the RSI is defined, as in calculate_rsi
+        rsi = Indicators.calculate_rsi(self.data.iloc[:14], 14).last
+        self.assertAlmostEqual(LatestIndicators.rsi(self.close[:14], 14), rsi, places=9)
+
+    def test_strategies_latest_match_full(self):
+        strategies = [
+            MultiMovingAverageStrategy(debug=False),
+            MomentumRsiStrategy(debug=False),
+            AdaptiveMovingAverageStrategy(debug=False),
+        ]
+        for strategy in strategies:
+            latest = strategy.calculate_latest_indicators(self.data)
+            full = {indicator.name: indicator.last for indicator in strategy.calculate_indicators(self.data)}
+            self.assertEqual(latest.keys(), full.keys())
+            for name, value in full.items():
+                self.assertAlmostEqual(latest[name], value, places=9, msg=f"{type(strategy).__name__} {name}")
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,93 @@
+"""
+Unit tests for the live loop latency instrumentation.
+"""
+
+import shutil
+import tempfile
+import unittest
+import urllib.request
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from latency import LatencyTracker, LatencyHistogram
+from definitions import Memory
+from trader import Trader
+from strategies import Strategy
+from exchange_apis import BaseExchangeAPI
+
+
+class TestLatencyTracker(unittest.TestCase):
+    def setUp(self):
+        self.tracker = LatencyTracker()
+
+    def test_span_records_a_sample(self):
+        with self.tracker.span('bar_fetch'):
+            pass
+        self.tracker.observe('bar_fetch', 0.2)
+
+        summary = self.tracker.summary()['bar_fetch']
+        self.assertEqual(summary['count'], 2)
+        self.assertGreater(summary['p99'], 0.1)
+
+    def test_disabled_tracker_records_nothing(self):
+        tracker = LatencyTracker(enabled=False)
+        with tracker.span('bar_fetch'):
+            pass
+        self.assertEqual(tracker.histograms, {})
+
+    def test_span_records_failures(self):
+        with self.assertRaises(RuntimeError):
+            with self.tracker.span('order_placement'):
+                raise RuntimeError("rejected")
+        self.assertEqual(self.tracker.histograms['order_placement'].count, 1)
+
+    def test_render_prometheus_histogram(self):
+        for seconds in (0.0001, 0.003, 0.003, 7.0):
+            self.tracker.observe('validation', seconds)
+        text = self.tracker.render()
+
+        self.assertIn('# TYPE trading_bot_stage_latency_seconds histogram', text)
+        self.assertIn('trading_bot_stage_latency_seconds_bucket{stage="validation",le="0.0005"} 1', text)
+        self.assertIn('trading_bot_stage_latency_seconds_bucket{stage="validation",le="0.005"} 3', text)
+        self.assertIn('trading_bot_stage_latency_seconds_bucket{stage="validation",le="+Inf"} 4', text)
+        self.assertIn('trading_bot_stage_latency_seconds_count{stage="validation"} 4', text)
+        buckets = [line for line in text.splitlines() if line.startswith('trading_bot_stage_latency_seconds_bucket')]
+        self.assertEqual(len(buckets), len(LatencyHistogram.BUCKETS) + 1)
+
+    def test_write_textfile(self):
+        directory = Path(tempfile.mkdtemp())
+        try:
+            self.tracker.observe('strategy', 0.01)
+            path = directory / 'metrics' / 'bot.prom'
+            self.tracker.write_textfile(path)
+            self.assertEqual(path.read_text(), self.tracker.render())
+            self.assertEqual(list(path.parent.iterdir()), [path])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_serve(self):
+        tracker = LatencyTracker(enabled=False)
+        server = tracker.serve(port=0, host='127.0.0.1')
+        try:
+            self.assertTrue(tracker.enabled)
+            tracker.observe('tick', 0.5)
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode()
+            self.assertIn('trading_bot_stage_latency_seconds_sum{stage="tick"} 0.5', body)
+        finally:
+            tracker.shutdown()
+
+    def test_trader_spans(self):
+        strategy = MagicMock(spec=Strategy)
+        strategy.run.return_value = []
+        trader = Trader(strategy, MagicMock(spec=BaseExchangeAPI), pair='DOG/USDT', latency=self.tracker)
+        trader.execute_strategy(MagicMock(), Memory(orders=[], balance_a=np.float64(1), balance_b=np.float64(1)))
+
+        self.assertEqual(set(self.tracker.histograms), {'strategy', 'order_placement'})
+
+
+if __name__ == '__main__':
+    unittest.main()
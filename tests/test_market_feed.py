@@ -0,0 +1,137 @@
+"""
+Unit tests for the event-driven market data feeds.
+"""
+
+import asyncio
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+
+from market_feed import CcxtProFeed, ReplayFeed
+from bar_buffer import LiveBars
+
+MINUTE = 60_000
+
+
+class TestReplayFeed(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame({
+            'date': pd.date_range(start='2023-01-01', periods=5, freq='1min'),
+            'open': np.arange(1, 6, dtype=np.float64),
+            'high': np.arange(1, 6, dtype=np.float64),
+            'low': np.arange(1, 6, dtype=np.float64),
+            'close': np.arange(1, 6, dtype=np.float64),
+            'volume': np.ones(5)
+        })
+
+    def test_emits_every_closed_bar_and_tick(self):
+        feed = ReplayFeed({'DOG/USDT': self.data})
+        bars, ticks = [], []
+        feed.on_bar(lambda pair, bar: bars.append((pair, bar)))
+        feed.on_tick(lambda pair, price: ticks.append(price))
+        feed.run()
+
+        self.assertEqual([bar[1] for _, bar in bars], [1.0, 2.0, 3.0, 4.0, 5.0])
+        self.assertEqual(bars[0][1][0], int(pd.Timestamp('2023-01-01').value // 10**6))
+        self.assertEqual(ticks, [1.0, 2.0, 3.0, 4.0, 5.0])
+
+    def test_callback_errors_do_not_stop_feed(self):
+        feed = ReplayFeed({'DOG/USDT': self.data})
+        bars = []
+        feed.on_bar(lambda pair, bar: 1 / 0)
+        feed.on_bar(lambda pair, bar: bars.append(bar))
+        feed.run()
+        self.assertEqual(len(bars), 5)
+
+    def test_stop(self):
+        feed = ReplayFeed({'DOG/USDT': self.data})
+        bars = []
+        def on_bar(pair, bar):
+            bars.append(bar)
+            feed.stop()
+        feed.on_bar(on_bar)
+        feed.run()
+        self.assertEqual(len(bars), 1)
+
+    def test_forming_bar_is_emitted_once_closed(self):
+        feed = ReplayFeed({})
+        bars = []
+        feed.on_bar(lambda pair, bar: bars.append(bar))
+        feed._push_bar('DOG/USDT', [0, 1.0, 1.0, 1.0, 1.0, 1.0])
+        feed._push_bar('DOG/USDT', [0, 1.0, 2.0, 1.0, 2.0, 3.0])
+        self.assertEqual(bars, [])
+        feed._push_bar('DOG/USDT', [MINUTE, 2.0, 2.0, 2.0, 2.0, 1.0])
+        self.assertEqual(bars, [[0, 1.0, 2.0, 1.0, 2.0, 3.0]])
+
+
+class TestCcxtProFeed(unittest.TestCase):
+    def test_watch_bars_pushes_closed_bars(self):
+        exchange = MagicMock()
+        updates = [[[0, 1.0, 1.0, 1.0, 1.0, 1.0]], [[0, 1.0, 2.0, 1.0, 2.0, 2.0], [MINUTE, 2.0, 2.0, 2.0, 2.0, 1.0]]]
+        async def watch_ohlcv(pair, timeframe):
+            return updates.pop(0)
+        exchange.watch_ohlcv = watch_ohlcv
+
+        feed = CcxtProFeed('bitget', ['DOG/USDT'])
+        bars = []
+        feed.on_bar(lambda pair, bar: bars.append((pair, bar)))
+        asyncio.run(feed._watch_bars('DOG/USDT', exchange))
+        asyncio.run(feed._watch_bars('DOG/USDT', exchange))
+
+        self.assertEqual(bars, [('DOG/USDT', [0, 1.0, 2.0, 1.0, 2.0, 2.0])])
+
+    def test_callbacks_do_not_block_the_streams(self):
+        feed = CcxtProFeed('bitget', ['DOG/USDT'], watch_ticks=False)
+        updates = [[[i * MINUTE, 1.0, 1.0, 1.0, 1.0, 1.0]] for i in range(4)]
+        streamed_after_close = threading.Event()
+
+        async def watch_ohlcv(pair, timeframe):
+            if len(updates) == 1:
+                # A bar was closed and its callback is still blocked, yet the stream goes on
+                streamed_after_close.set()
+                feed.stop()
+            return updates.pop(0)
+
+        exchange = MagicMock()
+        exchange.watch_ohlcv = watch_ohlcv
+        exchange.close.side_effect = lambda: asyncio.sleep(0)
+
+        bars, threads = [], []
+        def on_bar(pair, bar):
+            threads.append(threading.current_thread())
+            bars.append(bar[0])
+            streamed_after_close.wait(5)
+        feed.on_bar(on_bar)
+
+        with patch('ccxt.pro.bitget', return_value=exchange):
+            feed.run()
+
+        self.assertTrue(streamed_after_close.is_set())
+        self.assertEqual(bars, [0, MINUTE, 2 * MINUTE])
+        self.assertNotIn(threading.main_thread(), threads)
+
+
+class TestLiveBarsPush(unittest.TestCase):
+    def test_push_appends_and_fills_gaps(self):
+        exchange_api = MagicMock()
+        exchange_api.get_bars.side_effect = [
+            [[i * MINUTE, 1.0, 1.0, 1.0, 1.0, 1.0] for i in range(3)][::-1],
+            [[i * MINUTE, 1.0, 1.0, 1.0, 1.0, 1.0] for i in range(3, 7)][::-1],
+        ]
+        live_bars = LiveBars(exchange_api, capacity=10)
+
+        # Empty buffer: warmed through the REST API
+        self.assertEqual(len(live_bars.push('DOG/USDT', [2 * MINUTE, 1.0, 1.0, 1.0, 1.0, 1.0])), 3)
+        # Next bar: appended without a request
+        self.assertEqual(len(live_bars.push('DOG/USDT', [3 * MINUTE, 1.0, 1.0, 1.0, 1.0, 1.0])), 4)
+        self.assertEqual(exchange_api.get_bars.call_count, 1)
+        # Missed bars: fetched since the last stored one
+        self.assertEqual(len(live_bars.push('DOG/USDT', [6 * MINUTE, 1.0, 1.0, 1.0, 1.0, 1.0])), 7)
+        self.assertEqual(exchange_api.get_bars.call_args.kwargs['since'], 3 * MINUTE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Unit tests for the backtest market data window.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtesting.backtester import Backtester
+from backtesting.market_window import MarketWindow
+from indicators import Indicators, BatchIndicators
+from strategies import MultiMovingAverageStrategy, MomentumRsiStrategy
+from tests.helpers import marketdata_from_close
+
+
+class TestMarketWindow(unittest.TestCase):
+    def setUp(self):
+        n_bars = 300
+        rng = np.random.default_rng(5)
+        close = 100 + np.cumsum(rng.normal(0, 1, n_bars))
+        self.marketdata = marketdata_from_close(close, volume=rng.uniform(1000, 2000, n_bars))
+        self.columns = MarketWindow.extract_columns(self.marketdata)
+
+    def window(self, start, stop):
+        return MarketWindow(self.columns, self.marketdata.index, start, stop)
+
+    def test_matches_iloc_slice(self):
+        window = self.window(50, 250)
+        expected = self.marketdata.iloc[50:250]
+
+        self.assertEqual(len(window), 200)
+        self.assertEqual(window.columns, list(expected.columns))
+        self.assertTrue(window.index.equals(expected.index))
+        self.assertEqual(window['close'].iloc[-1], expected['close'].iloc[-1])
+        self.assertEqual(window['close'].iloc[0], expected['close'].iloc[0])
+        self.assertIsInstance(window['date'].iloc[-1], pd.Timestamp)
+        self.assertEqual(window['date'].iloc[-1], expected['date'].iloc[-1])
+        np.testing.assert_array_equal(window['volume'].to_numpy(), expected['volume'].to_numpy())
+        pd.testing.assert_frame_equal(window.to_frame(), expected)
+
+    def test_views_are_zero_copy(self):
+        window = self.window(10, 60)
+        self.assertTrue(np.shares_memory(window['close'].to_numpy(), self.columns['close']))
+        self.assertTrue(np.shares_memory(window['close'].to_numpy(dtype=np.float64), self.columns['close']))
+        self.assertFalse(np.shares_memory(window['close'].to_numpy(copy=True), self.columns['close']))
+
+    def test_series_fallback(self):
+        window = self.window(100, 200)
+        expected = self.marketdata.iloc[100:200]
+
+        pd.testing.assert_series_equal(window['close'].rolling(5).mean(), expected['close'].rolling(5).mean())
+        pd.testing.assert_series_equal(window['close'] - window['open'], expected['close'] - expected['open'])
+        pd.testing.assert_series_equal(window['close'].iloc[-3:], expected['close'].iloc[-3:])
+        self.assertEqual(window['close'].mean(), expected['close'].mean())
+        self.assertEqual(window.shape, expected.shape)
+
+    def test_indicators_accept_window(self):
+        window = self.window(100, 300)
+        expected = self.marketdata.iloc[100:300]
+        for calculate in (Indicators.calculate_rsi, Indicators.calculate_moving_average, Indicators.calculate_atr):
+            pd.testing.assert_series_equal(calculate(window, 14).result, calculate(expected, 14).result)
+        velocity = Indicators.calculate_velocity(window['close'], 10)
+        pd.testing.assert_series_equal(velocity.result, Indicators.calculate_velocity(expected['close'], 10).result)
+        averages = BatchIndicators.moving_averages(window, [10, 50])
+        self.assertTrue(averages[0].result.index.equals(expected.index))
+
+    def test_backtest_matches_dataframe_windows(self):
+        def run(window_type):
+            strategy = MomentumRsiStrategy(
+                max_duration=50, min_purchase=0.1,
+                trading_phase=MomentumRsiStrategy.TradingPhase.DISTRIBUTION, debug=False
+            )
+            backtester = Backtester(strategy, initial_balance_a=10, initial_balance_b=1000)
+            backtester.marketdata = self.marketdata
+            if window_type == 'frame':
+                backtester._window = lambda i, window_size: self.marketdata.iloc[i-window_size:i]
+            backtester._simulate_real_time_execution(window_size=60)
+            return backtester.memory
+
+        frames, windows = run('frame'), run('window')
+        self.assertGreater(len(windows.orders), 0)
+        self.assertEqual([order.timestamp for order in windows.orders], [order.timestamp for order in frames.orders])
+        self.assertEqual(windows.balance_a, frames.balance_a)
+        self.assertEqual(windows.balance_b, frames.balance_b)
+
+
+if __name__ == '__main__':
+    unittest.main()
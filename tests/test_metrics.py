@@ -0,0 +1,141 @@
+"""
+Unit tests for the backtest performance metrics.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtesting.backtester import BacktestProcessor
+from backtesting.metrics import PerformanceMetrics
+from backtesting.multi_backtest import MultiBacktest
+from definitions import PerformanceMetric, PlotMode
+
+
+class TestPerformanceMetrics(unittest.TestCase):
+    def setUp(self):
+        # Price goes 100 -> 120 -> 90 -> 110 over 8 one-minute bars
+        close = np.array([100, 110, 120, 100, 90, 95, 100, 110], dtype=np.float64)
+        self.marketdata = pd.DataFrame({
+            'date': pd.date_range(start='2023-01-01', periods=len(close), freq='1min'),
+            'open': close,
+            'high': close,
+            'low': close,
+            'close': close,
+            'volume': np.full(len(close), 1000.0)
+        })
+        fee = 0.001
+        # Buy 1 at 100 (bar 1), sell 1 * (1 - fee) at 120 (bar 2)
+        bought = 1.0 * (1 - fee)
+        sell_value = 120 * bought
+        self.orders = {
+            'pair': np.array(['A/B', 'A/B'], dtype=object),
+            'type': np.array(['buy_market', 'sell_market'], dtype=object),
+            'price': np.array([100.0, 120.0]),
+            'amount': np.array([1.0, bought]),
+            'fee': np.array([1.0 * fee, sell_value * fee]),
+            'total_value': np.array([100.0, sell_value]),
+            'balance_a': np.array([bought, 0.0]),
+            'balance_b': np.array([0.0, sell_value * (1 - fee)]),
+        }
+        self.df = BacktestProcessor.calculate_metrics_from_arrays(
+            marketdata=self.marketdata,
+            order_indices=np.array([1, 2]),
+            orders=self.orders,
+            initial_balance_a=0.0,
+            initial_balance_b=100.0
+        )
+        self.sell_value = sell_value
+
+    def test_returns_every_metric(self):
+        metrics = PerformanceMetrics.calculate(self.df)
+        self.assertEqual(set(metrics), set(PerformanceMetric))
+
+    def test_trade_level_pnl(self):
+        metrics = PerformanceMetrics.calculate(self.df)
+        # Sold the whole position bought for 100 at 120, minus the sell fee
+        expected_pnl = self.sell_value * (1 - 0.001) - 100.0
+        self.assertAlmostEqual(metrics[PerformanceMetric.TRADE_PNL], expected_pnl)
+        self.assertEqual(metrics[PerformanceMetric.NUM_TRADES], 2)
+        self.assertEqual(metrics[PerformanceMetric.WIN_RATE], 1.0)
+
+    def test_trade_pnl_matches_fifo_loop(self):
+        rng = np.random.default_rng(3)
+        n = 200
+        is_buy = rng.random(n) < 0.5
+        price = 100 + np.cumsum(rng.normal(0, 1, n))
+        amount = rng.uniform(0.1, 2.0, n)
+        fee = np.where(is_buy, amount * 0.001, 0.0)
+        total_value = price * amount
+        fee[~is_buy] = total_value[~is_buy] * 0.001
+
+        # Reference: lots consumed one by one, oversized sells capped at the position
+        lots = [[1.5, 95.0]]
+        expected = []
+        for buy, p, a, f, v in zip(is_buy, price, amount, fee, total_value):
+            if buy:
+                lots.append([a - f, v / (a - f)])
+                continue
+            remaining, cost = a, 0.0
+            while remaining > 1e-12 and lots:
+                used = min(remaining, lots[0][0])
+                cost += used * lots[0][1]
+                remaining -= used
+                lots[0][0] -= used
+                if lots[0][0] <= 1e-12:
+                    lots.pop(0)
+            expected.append(v - f - cost)
+
+        pnl = PerformanceMetrics._trade_pnl(is_buy, price, amount, fee, total_value, 1.5, 95.0)
+        np.testing.assert_allclose(pnl, expected, rtol=1e-9, atol=1e-9)
+
+    def test_fee_drag_and_turnover(self):
+        metrics = PerformanceMetrics.calculate(self.df)
+        fees_b = 0.001 * 100.0 + self.sell_value * 0.001
+        self.assertAlmostEqual(metrics[PerformanceMetric.FEE_DRAG], fees_b / 100.0)
+        equity = self.df['total_value_b'].to_numpy()
+        self.assertAlmostEqual(metrics[PerformanceMetric.TURNOVER], (100.0 + self.sell_value) / equity.mean())
+
+    def test_drawdown(self):
+        equity = pd.Series([100.0, 110.0, 99.0, 88.0, 120.0, 110.0])
+        max_drawdown, duration = PerformanceMetrics._drawdown(equity.to_numpy())
+        self.assertAlmostEqual(max_drawdown, 0.2)
+        self.assertEqual(duration, 2)
+
+    def test_exposure(self):
+        metrics = PerformanceMetrics.calculate(self.df)
+        # Only invested between the buy on bar 1 and the sell on bar 2
+        self.assertAlmostEqual(metrics[PerformanceMetric.EXPOSURE], 1 / 8)
+
+    def test_feeds_confidence_intervals(self):
+        rows = MultiBacktest._calculate_performance_metrics(self.df, [PerformanceMetric.SHARPE_RATIO])
+        results = [(rows, 0.1), (rows, 0.1), (MultiBacktest._calculate_performance_metrics(self.df, [PerformanceMetric.SHARPE_RATIO]), 0.1)]
+        df = MultiBacktest._prepare_dataframe(results, 3, 'test')
+        self.assertTrue(df['Absolute Change'].isna().all())
+        self.assertTrue(df['Value'].notna().all())
+        df = MultiBacktest.calculate_confidence_interval(df)
+        self.assertEqual(list(df['Metric'].unique()), ['sharpe_ratio'])
+        self.assertIn('Value Lower Confidence', df.columns)
+        self.assertTrue(df['Absolute Lower Confidence'].isna().all())
+
+    def test_values_and_changes_share_a_frame(self):
+        results = [
+            ({PlotMode.BALANCE_A: {'absolute': change, 'percentage': change * 10},
+              PerformanceMetric.SHARPE_RATIO: {'value': change / 2}}, 0.1)
+            for change in (1.0, 2.0, 4.0)
+        ]
+        df = MultiBacktest._prepare_dataframe(results, 3, 'test')
+        for method in ('t', 'bootstrap'):
+            intervals = MultiBacktest.calculate_prediction_interval(df, method=method).set_index('Metric')
+            self.assertTrue(np.isfinite(intervals.loc['balance_a', 'Absolute Lower Prediction']).all())
+            self.assertTrue(intervals.loc['balance_a', 'Value Lower Prediction'].isna().all())
+            self.assertTrue(np.isfinite(intervals.loc['sharpe_ratio', 'Value Lower Prediction']).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Unit tests for the local order and fill journal.
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from order_journal import OrderJournal
+from trader import Trader
+from strategies import Strategy, Action, ActionType
+from exchange_apis import BaseExchangeAPI
+
+
+def make_trade(trade_id, timestamp, side='buy', price=100.0, amount=1.0):
+    return {
+        'id': trade_id, 'order': f'order-{trade_id}', 'timestamp': timestamp, 'side': side,
+        'price': price, 'amount': amount, 'cost': price * amount, 'fee': {'cost': 0.1, 'currency': 'USDT'}
+    }
+
+
+class TestOrderJournal(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.path = self.test_dir / 'journal' / 'test.sqlite'
+        self.journal = OrderJournal(self.path)
+
+    def tearDown(self):
+        self.journal.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_uses_wal(self):
+        mode = self.journal._connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, 'wal')
+
+    def test_fills_are_idempotent(self):
+        self.assertTrue(self.journal.record_fill('DOG/USDT', make_trade('1', 1000)))
+        self.assertFalse(self.journal.record_fill('DOG/USDT', make_trade('1', 1000)))
+        self.assertEqual(len(self.journal.get_fills('DOG/USDT')), 1)
+
+    def test_lookups_by_pair_and_time(self):
+        for i in range(5):
+            self.journal.record_fill('DOG/USDT', make_trade(str(i), i * 1000))
+        self.journal.record_fill('BTC/USDT', make_trade('other', 2500))
+
+        fills = self.journal.get_fills('DOG/USDT', since=2000)
+        self.assertEqual([fill['trade_id'] for fill in fills], ['2', '3', '4'])
+        latest = self.journal.get_fills('DOG/USDT', limit=2)
+        self.assertEqual([fill['trade_id'] for fill in latest], ['3', '4'])
+        self.assertEqual(self.journal.last_fill_timestamp('DOG/USDT'), 4000)
+        self.assertIsNone(self.journal.last_fill_timestamp('ETH/USDT'))
+
+        plan = self.journal._connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM fills WHERE pair = ? AND timestamp >= ? ORDER BY timestamp DESC", ('DOG/USDT', 0)
+        ).fetchall()
+        self.assertIn('fills_pair_time', ' '.join(str(tuple(row)) for row in plan))
+
+    def test_order_updates_are_appended(self):
+        self.journal.record_order('DOG/USDT', {'id': '7', 'type': 'limit', 'side': 'buy', 'price': 1.0, 'amount': 5.0, 'status': 'open', 'timestamp': 1000})
+        self.journal.record_order('DOG/USDT', {'id': '7', 'type': 'limit', 'side': 'buy', 'price': 1.0, 'amount': 5.0, 'filled': 5.0, 'status': 'closed', 'timestamp': 2000})
+        orders = self.journal.get_orders('DOG/USDT')
+        self.assertEqual([order['status'] for order in orders], ['open', 'closed'])
+
+    def test_load_memory_survives_reopen(self):
+        self.journal.record_fill('DOG/USDT', make_trade('1', 1000, 'buy'), balance_a=1.0, balance_b=0.0)
+        self.journal.record_fill('DOG/USDT', make_trade('2', 2000, 'sell', price=110.0), balance_a=0.0, balance_b=110.0)
+        self.journal.close()
+
+        self.journal = OrderJournal(self.path)
+        memory = self.journal.load_memory('DOG/USDT', balance_a=0.0, balance_b=110.0)
+        self.assertEqual([order.type for order in memory.orders], ['buy_market', 'sell_market'])
+        self.assertEqual(memory.orders[1].total_value, 110.0)
+        self.assertEqual(memory.balance_b, 110.0)
+
+
+class TestTraderJournal(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.journal = OrderJournal(self.test_dir / 'journal.sqlite')
+
+    def tearDown(self):
+        self.journal.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_trader_records_actions_and_orders(self):
+        strategy = MagicMock(spec=Strategy)
+        exchange_api = MagicMock(spec=BaseExchangeAPI)
+        exchange_api.create_order.return_value = {'id': '1', 'type': 'market', 'side': 'buy', 'status': 'closed'}
+        exchange_api.get_account_balance.return_value = 1000.0
+        strategy.run.return_value = [Action(action_type=ActionType.BUY_MARKET, price=np.float64(10.0), amount=np.float64(1.0))]
+        trader = Trader(strategy, exchange_api, 'DOG/USDT', journal=self.journal)
+
+        trader.execute_strategy(MagicMock(), trader.load_memory())
+
+        self.assertEqual([action['action_type'] for action in self.journal.get_actions('DOG/USDT')], ['buy_market'])
+        self.assertEqual([order['order_id'] for order in self.journal.get_orders('DOG/USDT')], ['1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+Unit tests for the order reconciliation loop.
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from order_journal import OrderJournal
+from order_reconciler import OrderReconciler
+
+
+def make_trade(trade_id, timestamp, order_id, side='buy', price=2.0, amount=1.0, fee=0.0):
+    return {
+        'id': trade_id, 'order': order_id, 'timestamp': timestamp, 'side': side,
+        'price': price, 'amount': amount, 'cost': price * amount, 'fee': {'cost': fee, 'currency': 'USDT'}
+    }
+
+
+class FakeTrades:
+    """fetch_my_trades over a fixed list of trades, honouring since and limit."""
+
+    def __init__(self, trades):
+        self.trades = trades
+        self.calls = []
+
+    def __call__(self, pair, since=None, limit=None):
+        self.calls.append(since)
+        trades = [trade for trade in self.trades if since is None or trade['timestamp'] >= since]
+        return trades[:limit]
+
+
+class TestOrderReconciler(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.journal = OrderJournal(self.test_dir / 'journal.sqlite')
+        self.api = MagicMock()
+        self.api.get_server_time.return_value = 500
+        self.api.get_balances.return_value = {'timestamp': None, 'total': {'DOG': 0.0, 'USDT': 100.0}}
+        self.journal.record_order('DOG/USDT', {'id': 'A', 'type': 'limit', 'side': 'buy', 'price': 2.0, 'amount': 3.0, 'status': 'open', 'timestamp': 500})
+
+    def tearDown(self):
+        self.journal.close()
+        shutil.rmtree(self.test_dir)
+
+    def make_reconciler(self, trades, page_size=2):
+        self.api.fetch_my_trades = FakeTrades(trades)
+        return OrderReconciler(self.api, self.journal, 'DOG/USDT', page_size=page_size)
+
+    def test_pages_from_the_last_fill(self):
+        trades = [make_trade(str(i), 1000 * (i + 1), 'A') for i in range(3)]
+        reconciler = self.make_reconciler(trades)
+
+        new_fills = reconciler.reconcile_once()
+        self.assertEqual([trade['id'] for trade in new_fills], ['0', '1', '2'])
+        self.assertEqual(self.api.fetch_my_trades.calls, [500, 2000, 3000])
+
+        # The next cycle starts at the newest journaled fill and finds nothing new
+        self.assertEqual(reconciler.reconcile_once(), [])
+        self.assertEqual(self.api.fetch_my_trades.calls[-1], 3000)
+        self.assertEqual(len(self.journal.get_fills('DOG/USDT')), 3)
+
+    def test_updates_matched_orders(self):
+        reconciler = self.make_reconciler([make_trade('1', 1000, 'A', amount=1.0)])
+        reconciler.reconcile_once()
+        self.assertEqual(self.journal.get_order('A')['status'], 'open')
+        self.assertEqual(self.journal.get_order('A')['filled'], 1.0)
+
+        self.api.fetch_my_trades.trades.append(make_trade('2', 2000, 'A', amount=2.0))
+        reconciler.reconcile_once()
+        order = self.journal.get_order('A')
+        self.assertEqual(order['status'], 'closed')
+        self.assertEqual(order['filled'], 3.0)
+        self.api.fetch_order.assert_not_called()
+
+    def test_tracks_balances_without_refetching(self):
+        reconciler = self.make_reconciler([
+            make_trade('1', 1000, 'A', side='buy', price=2.0, amount=10.0, fee=0.5),
+            make_trade('2', 2000, 'B', side='sell', price=3.0, amount=4.0),
+        ])
+        reconciler.reconcile_once()
+        reconciler.reconcile_once()
+
+        self.assertAlmostEqual(reconciler.balance_a, 6.0)
+        self.assertAlmostEqual(reconciler.balance_b, 100.0 - 20.0 - 0.5 + 12.0)
+        self.assertEqual(self.api.get_balances.call_count, 1)
+        # Once before the initial balance fetch, once after the new fills
+        self.assertEqual(self.api.invalidate_balance.call_count, 2)
+
+        memory = reconciler.load_memory()
+        self.assertEqual([order.type for order in memory.orders], ['buy_market', 'sell_market'])
+        self.assertAlmostEqual(memory.orders[0].balance_a, 10.0)
+        self.assertAlmostEqual(memory.balance_b, 91.5)
+
+    def test_skips_fills_included_in_the_balance(self):
+        # The fetched balance already includes the buy at 1000
+        self.api.get_server_time.return_value = 1500
+        self.api.get_balances.return_value = {'timestamp': None, 'total': {'DOG': 10.0, 'USDT': 80.0}}
+        reconciler = self.make_reconciler([make_trade('1', 1000, 'A', side='buy', price=2.0, amount=10.0)])
+        reconciler.start()
+        reconciler.stop()
+
+        self.assertEqual(reconciler.reconcile_once(), [])
+        self.assertEqual(self.api.fetch_my_trades.calls, [1500])
+        self.assertAlmostEqual(reconciler.balance_a, 10.0)
+        self.assertAlmostEqual(reconciler.balance_b, 80.0)
+
+        self.api.fetch_my_trades.trades.append(make_trade('2', 2000, 'A', side='buy', price=2.0, amount=1.0))
+        self.assertEqual([trade['id'] for trade in reconciler.reconcile_once()], ['2'])
+        self.assertAlmostEqual(reconciler.balance_a, 11.0)
+        self.assertAlmostEqual(reconciler.balance_b, 78.0)
+
+    def test_fees_in_other_currencies(self):
+        buy = make_trade('1', 1000, 'A', side='buy', price=2.0, amount=10.0)
+        buy['fee'] = {'cost': 0.3, 'currency': 'BGB'}
+        sell = make_trade('2', 2000, 'B', side='sell', price=2.0, amount=1.0)
+        sell['fee'] = {'cost': 0.1, 'currency': 'DOG'}
+        reconciler = self.make_reconciler([buy, sell])
+        reconciler.reconcile_once()
+        self.assertAlmostEqual(reconciler.balance_a, 8.9)
+        self.assertAlmostEqual(reconciler.balance_b, 82.0)
+
+    def test_resync_corrects_drift(self):
+        reconciler = self.make_reconciler([make_trade('1', 1000, 'A', amount=1.0)])
+        reconciler.reconcile_once()
+        self.assertAlmostEqual(reconciler.balance_b, 98.0)
+
+        # A withdrawal the trades do not show
+        self.api.get_server_time.return_value = 1500
+        self.api.get_balances.return_value = {'timestamp': None, 'total': {'DOG': 1.0, 'USDT': 50.0}}
+        with self.assertLogs(reconciler.logger, level='WARNING'):
+            reconciler.resync()
+        self.assertAlmostEqual(reconciler.balance_b, 50.0)
+        self.assertEqual(reconciler.synced_until, 1500)
+
+    def test_cursor_is_the_exchange_time_before_the_fetch(self):
+        reconciler = self.make_reconciler([])
+        reconciler.resync()
+        calls = [name for name, _, _ in self.api.mock_calls if name in ('get_server_time', 'get_balances')]
+        self.assertEqual(calls, ['get_server_time', 'get_balances'])
+        self.assertEqual(reconciler.synced_until, 500)
+
+    def test_pages_past_known_trades_at_the_cursor(self):
+        # Three fills at the cursor are already in the balance, more than a page holds
+        self.api.get_server_time.return_value = 1000
+        known = [make_trade(str(i), 1000, 'A', amount=0.5) for i in range(3)]
+        reconciler = self.make_reconciler(known + [make_trade('3', 2000, 'A', amount=1.0)])
+
+        with self.assertLogs(reconciler.logger, level='WARNING'):
+            new_fills = reconciler.reconcile_once()
+        self.assertEqual([trade['id'] for trade in new_fills], ['3'])
+        self.assertEqual(self.api.fetch_my_trades.calls, [1000, 1001])
+
+
+if __name__ == '__main__':
+    unittest.main()
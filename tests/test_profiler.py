@@ -0,0 +1,117 @@
+"""
+Unit tests for the backtest profiler.
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtesting.backtester import Backtester
+from backtesting.profiler import BacktestProfiler
+from strategies import MultiMovingAverageStrategy, Action, ActionType
+from validation import ValidationPolicy
+
+
+class TestBacktestProfiler(unittest.TestCase):
+    def test_nested_phases(self):
+        profiler = BacktestProfiler(root='test')
+        for _ in range(3):
+            with profiler.phase('bar'):
+                with profiler.phase('slice'):
+                    pass
+                with profiler.phase('execute'):
+                    with profiler.phase('indicators'):
+                        pass
+        profiler.bars = 3
+
+        report = profiler.report()
+        self.assertEqual(report.loc['bar', 'calls'], 3)
+        self.assertEqual(report.loc['indicators', 'calls_per_bar'], 1.0)
+        self.assertEqual(report.index[0], 'bar')
+        self.assertAlmostEqual(report.loc['bar', 'share'], 1.0)
+        self.assertLessEqual(report.loc['execute', 'cumulative_s'], report.loc['bar', 'cumulative_s'])
+        self.assertAlmostEqual(report['self_s'].sum(), profiler.total_time)
+
+        stacks = [line.rsplit(' ', 1)[0] for line in profiler.folded().splitlines()]
+        self.assertEqual(stacks, ['test;bar', 'test;bar;execute', 'test;bar;execute;indicators', 'test;bar;slice'])
+
+    def test_instrument_restores_methods(self):
+        profiler = BacktestProfiler()
+        strategy = MultiMovingAverageStrategy(debug=False)
+        original = ValidationPolicy.__dict__['build_model']
+
+        with profiler.instrument(strategy, 'run', 'strategy.run'), \
+                profiler.instrument(ValidationPolicy, 'build_model', lambda model_cls, **kwargs: model_cls.__name__):
+            self.assertIn('run', vars(strategy))
+            action = ValidationPolicy.build_model(Action, action_type=ActionType.WAIT, price=np.float64(1), amount=np.float64(0))
+
+        self.assertEqual(action.action_type, ActionType.WAIT)
+        self.assertEqual(profiler.calls, {'Action': 1})
+        self.assertNotIn('run', vars(strategy))
+        self.assertIs(ValidationPolicy.__dict__['build_model'], original)
+
+
+class TestBacktesterProfiling(unittest.TestCase):
+    def setUp(self):
+        n_bars = 300
+        close = 100 + 0.1 * np.arange(n_bars)
+        self.marketdata = pd.DataFrame({
+            'date': pd.date_range('2023-01-01', periods=n_bars, freq='min'),
+            'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+            'volume': np.full(n_bars, 1000.0)
+        })
+
+    def make_backtester(self, profile):
+        strategy = MultiMovingAverageStrategy(
+            max_duration=50, min_purchase=0.1,
+            trading_phase=MultiMovingAverageStrategy.TradingPhase.DISTRIBUTION, debug=False
+        )
+        backtester = Backtester(strategy, initial_balance_a=10, initial_balance_b=1000, profile=profile)
+        backtester.marketdata = self.marketdata
+        return backtester
+
+    def test_profile_matches_regular_run(self):
+        regular = self.make_backtester(profile=False)
+        regular._simulate_real_time_execution()
+        profiled = self.make_backtester(profile=True)
+        profiled._profile_real_time_execution()
+
+        self.assertEqual(len(profiled.memory.orders), len(regular.memory.orders))
+        self.assertEqual(profiled.memory.balance_b, regular.memory.balance_b)
+
+        profiler = profiled.profiler
+        self.assertEqual(profiler.bars, 100)
+        report = profiler.report()
+        for phase in ('bar', 'slice', 'execute', 'strategy.run', 'indicators', 'model.Action', 'model.Order', 'memory'):
+            self.assertIn(phase, report.index)
+        self.assertEqual(report.loc['indicators', 'calls'], 100)
+        self.assertTrue(profiler.folded().startswith('MultiMovingAverageStrategy;bar'))
+
+        # Hooks are removed after the run
+        self.assertNotIn('_step', vars(profiled))
+        self.assertNotIn('run', vars(profiled.strategy))
+
+    def test_write_folded(self):
+        backtester = self.make_backtester(profile=True)
+        backtester._profile_real_time_execution()
+        directory = Path(tempfile.mkdtemp())
+        try:
+            path = directory / 'trace.folded'
+            backtester.profiler.write_folded(path)
+            lines = path.read_text().splitlines()
+            self.assertTrue(all(line.rsplit(' ', 1)[1].isdigit() for line in lines))
+            self.assertIn('MultiMovingAverageStrategy;bar;execute;strategy.run;indicators', [line.rsplit(' ', 1)[0] for line in lines])
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Unit tests for the rate-limit-aware request scheduler.
+"""
+
+import time
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+import ccxt
+
+from request_scheduler import RequestScheduler, RequestPriority
+
+
+class TestRequestScheduler(unittest.TestCase):
+    def test_token_bucket_throttles(self):
+        scheduler = RequestScheduler(rate=50, capacity=1)
+        start = time.monotonic()
+        for _ in range(6):
+            scheduler.execute('op', lambda: None)
+        # The first request uses the bucket, the other five wait 1/50 s each
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_orders_go_before_queued_data_requests(self):
+        scheduler = RequestScheduler(rate=20, capacity=1)
+        scheduler.execute('drain', lambda: None)
+        executed = []
+        threads = [
+            threading.Thread(target=scheduler.execute, args=('data', executed.append, 'data'), kwargs={'priority': RequestPriority.DATA})
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.01)
+        order = threading.Thread(target=scheduler.execute, args=('order', executed.append, 'order'), kwargs={'priority': RequestPriority.ORDER})
+        order.start()
+        for thread in threads + [order]:
+            thread.join()
+        self.assertEqual(executed[0], 'order')
+        self.assertEqual(len(executed), 4)
+
+    @patch('request_scheduler.time.sleep')
+    def test_backoff_with_jitter(self, mock_sleep):
+        scheduler = RequestScheduler(rate=1000)
+        func = MagicMock(side_effect=[ccxt.NetworkError('down'), ccxt.NetworkError('down'), 'ok'])
+        self.assertEqual(scheduler.execute('op', func, max_retries=3, base_delay=1.0), 'ok')
+        delays = [call.args[0] for call in mock_sleep.call_args_list]
+        self.assertEqual(len(delays), 2)
+        self.assertTrue(0.5 <= delays[0] <= 1.0)
+        self.assertTrue(1.0 <= delays[1] <= 2.0)
+
+    @patch('request_scheduler.time.sleep')
+    def test_rate_limit_error_drains_bucket(self, mock_sleep):
+        scheduler = RequestScheduler(rate=5, capacity=10)
+        func = MagicMock(side_effect=[ccxt.RateLimitExceeded('429'), 'ok'])
+        scheduler.execute('op', func)
+        self.assertLess(scheduler._tokens, 1)
+
+    @patch('request_scheduler.time.sleep')
+    def test_gives_up_after_max_retries(self, mock_sleep):
+        scheduler = RequestScheduler(rate=1000)
+        func = MagicMock(side_effect=ccxt.ExchangeError('error'))
+        with self.assertRaises(ccxt.ExchangeError):
+            scheduler.execute('op', func, max_retries=2)
+        self.assertEqual(func.call_count, 2)
+        # No backoff after the last attempt
+        self.assertEqual(mock_sleep.call_count, 1)
+
+    @patch('request_scheduler.time.sleep')
+    def test_non_idempotent_requests_are_not_retried_after_timeouts(self, mock_sleep):
+        scheduler = RequestScheduler(rate=1000)
+        func = MagicMock(side_effect=ccxt.RequestTimeout('timeout'))
+        with self.assertRaises(ccxt.RequestTimeout):
+            scheduler.execute('create_order', func, idempotent=False)
+        func.assert_called_once()
+
+        # A rate limit rejection was not executed, so it is retried
+        func = MagicMock(side_effect=[ccxt.RateLimitExceeded('429'), 'ok'])
+        self.assertEqual(scheduler.execute('create_order', func, idempotent=False), 'ok')
+
+    def test_interrupted_waiter_leaves_the_line(self):
+        scheduler = RequestScheduler(rate=1000, capacity=1)
+        scheduler._tokens = 0
+        with patch.object(scheduler._condition, 'wait', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                scheduler.execute('op', lambda: None)
+        self.assertEqual(scheduler._waiting, [])
+        self.assertIsNone(scheduler.execute('op', lambda: None))
+
+    def test_other_errors_are_not_retried(self):
+        scheduler = RequestScheduler(rate=1000)
+        func = MagicMock(side_effect=ValueError('bad'))
+        with self.assertRaises(ValueError):
+            scheduler.execute('op', func)
+        func.assert_called_once()
+
+    def test_coalesces_identical_requests(self):
+        scheduler = RequestScheduler(rate=1000)
+        calls = []
+        def fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return 42
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(scheduler.execute('op', fetch, coalesce_key='ticker'))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [42] * 4)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(scheduler._inflight, {})
+
+    def test_shared_per_account(self):
+        RequestScheduler._registry.clear()
+        first = RequestScheduler.for_account('bitget', 'KEY', 50)
+        self.assertIs(first, RequestScheduler.for_account('bitget', 'KEY', 50))
+        self.assertIsNot(first, RequestScheduler.for_account('bitget', 'OTHER_KEY', 50))
+        self.assertEqual(first.rate, 20)
+        RequestScheduler._registry.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Unit tests for signal masks and the idle-bar skipping backtest.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtesting.backtester import Backtester, BacktestProcessor
+from indicators import LatestIndicators
+from strategies import MultiMovingAverageStrategy, MomentumRsiStrategy, AdaptiveMovingAverageStrategy
+from strategies.signals import SignalSeries
+from tests.helpers import random_walk_marketdata
+
+
+class TestSignalSeries(unittest.TestCase):
+    def test_matches_latest_indicators(self):
+        close = random_walk_marketdata(600)['close'].to_numpy()
+        for history in (14, 50):
+            series = {
+                'sma': SignalSeries.sma(close, 10),
+                'rsi': SignalSeries.rsi(close, 14, history),
+                'velocity': SignalSeries.velocity(close, 10),
+                'acceleration': SignalSeries.acceleration(close, 10),
+            }
+            for row in range(history - 1, len(close)):
+                window = close[row + 1 - history:row + 1]
+                self.assertAlmostEqual(series['sma'][row], LatestIndicators.sma(window, 10), places=9)
+                self.assertAlmostEqual(series['rsi'][row], LatestIndicators.rsi(window, 14), places=6)
+                if history > 20:
+                    self.assertEqual(series['velocity'][row], LatestIndicators.velocity(window, 10))
+                    self.assertEqual(series['acceleration'][row], LatestIndicators.acceleration(window, 10))
+
+    def test_ambiguous_and_select(self):
+        a = np.array([1.0, 2.0, 3.0, np.nan])
+        b = np.array([1.0 + 1e-12, 1.0, 3.5, 1.0])
+        np.testing.assert_array_equal(SignalSeries.ambiguous([(a, b), (a, 3.0)]), [True, False, True, False])
+
+        choices = SignalSeries.select([a > 1.5, a > 2.5], ['up', 'high'], 'none', 4)
+        self.assertEqual(list(choices), ['none', 'up', 'up', 'none'])
+
+
+class TestSkipIdleBars(unittest.TestCase):
+    def setUp(self):
+        self.marketdata = random_walk_marketdata()
+
+    def run_backtester(self, strategy_cls, skip_idle_bars, marketdata=None, **kwargs):
+        strategy = strategy_cls(max_duration=50, min_purchase=0.1, debug=False, **kwargs)
+        backtester = Backtester(strategy, initial_balance_a=10, initial_balance_b=1000, skip_idle_bars=skip_idle_bars)
+        backtester.marketdata = self.marketdata if marketdata is None else marketdata
+        evaluated = []
+        run = strategy.run
+        strategy.run = lambda data, memory: evaluated.append(data['date'].iloc[-1]) or run(data, memory)
+        backtester._simulate_real_time_execution()
+        del strategy.run
+        return backtester, evaluated
+
+    def assert_same_run(self, strategy_cls, state=(), marketdata=None, **kwargs):
+        regular, regular_bars = self.run_backtester(strategy_cls, False, marketdata, **kwargs)
+        skipping, skipping_bars = self.run_backtester(strategy_cls, True, marketdata, **kwargs)
+
+        # WAIT orders included: they set the bars of the Backtest frame that values are carried from
+        orders = lambda memory: [o.model_dump() for o in memory.orders]
+        self.assertTrue(any(o.type != 'wait' for o in regular.memory.orders))
+        self.assertEqual(orders(skipping.memory), orders(regular.memory))
+        frame = lambda backtester: BacktestProcessor.calculate_metrics(backtester.marketdata, backtester.memory, 10, 1000)
+        pd.testing.assert_frame_equal(frame(skipping), frame(regular))
+        self.assertEqual(skipping.memory.balance_a, regular.memory.balance_a)
+        self.assertEqual(skipping.memory.balance_b, regular.memory.balance_b)
+        for attribute in state:
+            self.assertEqual(getattr(skipping.strategy, attribute), getattr(regular.strategy, attribute), attribute)
+        self.assertLess(len(skipping_bars), len(regular_bars))
+        return regular, skipping
+
+    def test_multi_moving_average(self):
+        for phase in (MultiMovingAverageStrategy.TradingPhase.ACCUMULATION, MultiMovingAverageStrategy.TradingPhase.DISTRIBUTION):
+            self.assert_same_run(MultiMovingAverageStrategy, state=('acumulation_length', 'distribution_length'), trading_phase=phase)
+
+    def test_momentum_rsi(self):
+        self.assert_same_run(
+            MomentumRsiStrategy,
+            state=('accumulation_length', 'distribution_length', 'last_condition'),
+            trading_phase=MomentumRsiStrategy.TradingPhase.DISTRIBUTION
+        )
+
+    def test_adaptive_moving_average(self):
+        regular, skipping = self.assert_same_run(
+            AdaptiveMovingAverageStrategy,
+            state=('accumulation_length', 'distribution_length', 'trading_phase')
+        )
+        self.assertEqual(list(skipping.strategy.recent_conditions), list(regular.strategy.recent_conditions))
+        self.assertEqual(list(skipping.strategy.recent_volumes), list(regular.strategy.recent_volumes))
+
+    def test_adaptive_moving_average_waits_in_neutral_phases(self):
+        for seed in (3, 5, 7):
+            with self.subTest(seed=seed):
+                _, skipping = self.assert_same_run(AdaptiveMovingAverageStrategy, marketdata=random_walk_marketdata(1500, seed=seed))
+                self.assertTrue(any(o.type == 'wait' for o in skipping.memory.orders))
+
+    def test_neutral_phase_evaluates_nothing(self):
+        backtester, evaluated = self.run_backtester(MultiMovingAverageStrategy, True)
+        self.assertEqual(evaluated, [])
+        # Every bar still gets the WAIT order run would have returned
+        self.assertEqual(len(backtester.memory.orders), len(self.marketdata) - backtester.window_size)
+        self.assertTrue(all(o.type == 'wait' for o in backtester.memory.orders))
+
+    def test_without_mask_evaluates_every_bar(self):
+        class Unmasked(MultiMovingAverageStrategy):
+            def signal_mask(self, data, window_size):
+                return None
+
+        backtester, evaluated = self.run_backtester(Unmasked, True)
+        self.assertEqual(len(evaluated), len(self.marketdata) - backtester.window_size)
+        self.assertEqual(evaluated[0], self.marketdata['date'].iloc[backtester.window_size - 1])
+
+    def test_window_shorter_than_lookback(self):
+        backtester = Backtester(MomentumRsiStrategy(debug=False), 10, 1000, window_size=20, skip_idle_bars=True)
+        backtester.marketdata = self.marketdata
+        with self.assertRaises(ValueError):
+            backtester._simulate_real_time_execution()
+
+
+if __name__ == '__main__':
+    unittest.main()
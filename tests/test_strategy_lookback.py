@@ -0,0 +1,81 @@
+"""
+Unit tests for the strategy lookback and the Backtester history window.
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtesting.backtester import Backtester
+from indicators import Indicators
+from strategies import MultiMovingAverageStrategy, MomentumRsiStrategy, AdaptiveMovingAverageStrategy
+from tests.helpers import marketdata_from_close
+
+
+class TestRequiredLookback(unittest.TestCase):
+    def test_follows_indicator_windows(self):
+        self.assertEqual(MultiMovingAverageStrategy(debug=False).required_lookback, 200)
+        self.assertEqual(MultiMovingAverageStrategy(windows=[5, 10, 20, 40], debug=False).required_lookback, 40)
+        self.assertEqual(AdaptiveMovingAverageStrategy(debug=False).required_lookback, 200)
+        self.assertEqual(MomentumRsiStrategy(debug=False).required_lookback, 50)
+        # Acceleration averages a difference of averaged differences: 2 * window + 1 bars
+        self.assertEqual(MomentumRsiStrategy(ma_windows=[5, 10], momentum_window=10, debug=False).required_lookback, 21)
+
+    def test_every_latest_indicator_is_defined(self):
+        for strategy in (MomentumRsiStrategy(debug=False), AdaptiveMovingAverageStrategy(debug=False)):
+            n_bars = strategy.required_lookback
+            data = marketdata_from_close(100 + np.sin(np.arange(n_bars)))
+            latest = strategy.calculate_latest_indicators(data)
+            self.assertFalse(any(np.isnan(value) for value in latest.values()), latest)
+            shorter = strategy.calculate_latest_indicators(data.iloc[1:])
+            self.assertTrue(any(np.isnan(value) for value in shorter.values()))
+
+    def test_computed_once(self):
+        strategy = MomentumRsiStrategy(debug=False)
+        with patch.object(strategy, 'calculate_indicators', wraps=strategy.calculate_indicators) as calculate:
+            self.assertEqual(strategy.required_lookback, 50)
+            self.assertEqual(strategy.required_lookback, 50)
+        calculate.assert_called_once()
+
+    def test_indicator_without_values(self):
+        class NeverValid(MultiMovingAverageStrategy):
+            def calculate_indicators(self, data):
+                return [Indicators.calculate_moving_average(data, len(data) + 1)]
+
+        with self.assertRaises(ValueError):
+            NeverValid(debug=False).required_lookback
+
+
+class TestBacktesterWindow(unittest.TestCase):
+    def setUp(self):
+        self.marketdata = marketdata_from_close(100 + 0.1 * np.arange(300))
+
+    def run_backtester(self, strategy, **kwargs):
+        backtester = Backtester(strategy, initial_balance_a=10, initial_balance_b=1000, **kwargs)
+        backtester.marketdata = self.marketdata
+        lengths = []
+        run = strategy.run
+        strategy.run = lambda data, memory: lengths.append(len(data)) or run(data, memory)
+        backtester._simulate_real_time_execution()
+        return backtester, lengths
+
+    def test_defaults_to_required_lookback(self):
+        backtester, lengths = self.run_backtester(MomentumRsiStrategy(debug=False))
+        self.assertEqual(backtester.window_size, 50)
+        self.assertEqual(len(lengths), 250)
+        self.assertEqual(set(lengths), {50})
+
+    def test_override(self):
+        backtester, lengths = self.run_backtester(MultiMovingAverageStrategy(debug=False), window_size=250)
+        self.assertEqual(backtester.window_size, 250)
+        self.assertEqual(len(lengths), 50)
+        self.assertEqual(set(lengths), {250})
+
+
+if __name__ == '__main__':
+    unittest.main()
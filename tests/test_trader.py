@@ -1,5 +1,6 @@
 import unittest
 from unittest.mock import MagicMock, patch
+from concurrent.futures import Future
 import numpy as np
 from datetime import datetime
 
@@ -212,5 +213,76 @@ class TestTrader(unittest.TestCase):
         # Verify that an attempt was made to call the create_order method
         self.mock_exchange_api.create_order.assert_called_once()
 
+    def _completed_futures(self, orders):
+        futures = []
+        for index, order in enumerate(orders):
+            future = Future()
+            future.set_result({'id': str(index), 'side': order['side']})
+            futures.append(future)
+        return futures
+
+    def test_execute_strategy_batch(self):
+        """Test submitting all actions of a tick as one batch."""
+        trader = Trader(self.mock_strategy, self.mock_exchange_api, 'BTC/USDT', batch_orders=True)
+        self.mock_exchange_api.submit_orders.side_effect = self._completed_futures
+        self.mock_strategy.run.return_value = [
+            Action(action_type=ActionType.BUY_LIMIT, price=np.float64(self.test_price), amount=np.float64(self.test_amount)),
+            Action(action_type=ActionType.STOP_LOSS, price=np.float64(45000.0), amount=np.float64(self.test_amount)),
+        ]
+        
+        trader.execute_strategy(self.market_data, self.memory)
+        
+        self.mock_exchange_api.submit_orders.assert_called_once_with([
+            {'symbol': 'BTC/USDT', 'type': 'limit', 'side': 'buy', 'amount': self.test_amount, 'price': self.test_price, 'params': {}},
+            {'symbol': 'BTC/USDT', 'type': 'stop_loss', 'side': 'sell', 'amount': self.test_amount, 'price': 45000.0, 'params': {'stopPrice': 45000.0}},
+        ])
+        self.mock_exchange_api.create_order.assert_not_called()
+        self.assertEqual([ack['id'] for ack in trader.wait_for_acks(timeout=1)], ['0', '1'])
+        self.assertEqual(trader.pending_orders, {})
+
+    def test_execute_strategy_batch_cumulative_balance(self):
+        """Test that the balance check accounts for the earlier orders of the batch."""
+        trader = Trader(self.mock_strategy, self.mock_exchange_api, 'BTC/USDT', batch_orders=True)
+        self.mock_exchange_api.submit_orders.side_effect = self._completed_futures
+        # Each sell uses 0.6 BTC of the 1 BTC available: only the first fits
+        sell_action = Action(action_type=ActionType.SELL_MARKET, price=np.float64(self.test_price), amount=np.float64(0.6))
+        self.mock_strategy.run.return_value = [sell_action, sell_action]
+        
+        trader.execute_strategy(self.market_data, self.memory)
+        
+        orders = self.mock_exchange_api.submit_orders.call_args.args[0]
+        self.assertEqual(len(orders), 1)
+
+    def test_execute_strategy_batch_failed_ack(self):
+        """Test that failed orders are dropped from the acknowledgements."""
+        trader = Trader(self.mock_strategy, self.mock_exchange_api, 'BTC/USDT', batch_orders=True)
+        failed = Future()
+        failed.set_exception(Exception("API error"))
+        self.mock_exchange_api.submit_orders.return_value = [failed]
+        self.mock_strategy.run.return_value = [
+            Action(action_type=ActionType.BUY_MARKET, price=np.float64(self.test_price), amount=np.float64(self.test_amount))
+        ]
+        
+        trader.execute_strategy(self.market_data, self.memory)
+        
+        self.assertEqual(trader.wait_for_acks(timeout=1), [])
+        self.assertEqual(trader.pending_orders, {})
+
+    def test_order_acks_are_bounded(self):
+        """Test that acknowledgements nobody collects do not grow without bound."""
+        with patch.object(Trader, 'MAX_ORDER_ACKS', 3):
+            trader = Trader(self.mock_strategy, self.mock_exchange_api, 'BTC/USDT', batch_orders=True)
+        self.mock_exchange_api.submit_orders.side_effect = self._completed_futures
+        self.mock_strategy.run.return_value = [
+            Action(action_type=ActionType.BUY_LIMIT, price=np.float64(self.test_price), amount=np.float64(0.001))
+        ]
+        
+        for _ in range(5):
+            trader.execute_strategy(self.market_data, self.memory)
+        
+        self.assertEqual(len(trader.order_acks), 3)
+        self.assertEqual(len(trader.wait_for_acks(timeout=1)), 3)
+        self.assertEqual(len(trader.order_acks), 0)
+
 if __name__ == '__main__':
     unittest.main()
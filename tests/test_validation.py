@@ -0,0 +1,119 @@
+"""
+Unit tests for the validation policy module.
+"""
+
+import os
+import threading
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from pandera.errors import SchemaError
+from pydantic import ValidationError
+
+from validation import ValidationPolicy, ValidationMode, _mode_from_env
+from definitions import MarketData
+from strategies import Action, ActionType
+
+
+class TestValidationPolicy(unittest.TestCase):
+    def setUp(self):
+        self.previous_env = os.environ.get('VALIDATION_MODE')
+        ValidationPolicy.reset_stats()
+        self.valid_data = pd.DataFrame({
+            'date': pd.date_range(start='2023-01-01', periods=20, freq='1min'),
+            'open': np.linspace(1, 2, 20),
+            'high': np.linspace(1, 2, 20),
+            'low': np.linspace(1, 2, 20),
+            'close': np.linspace(1, 2, 20),
+            'volume': np.linspace(10, 20, 20)
+        })
+        self.invalid_data = self.valid_data.copy()
+        self.invalid_data.loc[5, 'close'] = -1.0
+
+    def tearDown(self):
+        ValidationPolicy.configure(mode=ValidationMode.FULL, sample_rows=1000, model_sample_rate=100)
+        if self.previous_env is None:
+            os.environ.pop('VALIDATION_MODE', None)
+        else:
+            os.environ['VALIDATION_MODE'] = self.previous_env
+        ValidationPolicy.reset_stats()
+
+    def test_full_mode_validates_everything(self):
+        ValidationPolicy.configure(mode=ValidationMode.FULL)
+        with self.assertRaises(SchemaError):
+            ValidationPolicy.validate_frame(MarketData, self.invalid_data)
+        with self.assertRaises(ValidationError):
+            ValidationPolicy.build_model(Action, action_type=ActionType.BUY_MARKET, price=np.float64(-1), amount=np.float64(1))
+
+    def test_off_mode_skips_everything(self):
+        ValidationPolicy.configure(mode=ValidationMode.OFF)
+        result = ValidationPolicy.validate_frame(MarketData, self.invalid_data, boundary=True)
+        self.assertIs(result, self.invalid_data)
+        action = ValidationPolicy.build_model(Action, action_type=ActionType.BUY_MARKET, price=np.float64(-1), amount=np.float64(1))
+        self.assertEqual(action.price, -1)
+
+    def test_boundary_mode_only_checks_boundaries(self):
+        ValidationPolicy.configure(mode=ValidationMode.BOUNDARY)
+        ValidationPolicy.validate_frame(MarketData, self.invalid_data, boundary=False)
+        with self.assertRaises(SchemaError):
+            ValidationPolicy.validate_frame(MarketData, self.invalid_data, boundary=True)
+
+        action = ValidationPolicy.build_model(Action, action_type=ActionType.BUY_MARKET, price=np.float64(-1), amount=np.float64(1))
+        with self.assertRaises(ValidationError):
+            ValidationPolicy.check_model(action, boundary=True)
+
+    def test_sampled_mode_validates_one_model_in_n(self):
+        ValidationPolicy.configure(mode=ValidationMode.SAMPLED, model_sample_rate=10)
+        for _ in range(100):
+            ValidationPolicy.build_model(Action, action_type=ActionType.WAIT, price=np.float64(1), amount=np.float64(0))
+
+        report = ValidationPolicy.report().set_index('Name')
+        self.assertEqual(report.loc['Action', 'Validated'], 10)
+        self.assertEqual(report.loc['Action', 'Skipped'], 90)
+
+    def test_sampled_mode_checks_row_sample(self):
+        ValidationPolicy.configure(mode=ValidationMode.SAMPLED, sample_rows=4)
+        # Row 5 is outside the head/tail rows and the random sample is small, but dtype checks still run
+        result = ValidationPolicy.validate_frame(MarketData, self.valid_data)
+        self.assertEqual(len(result), len(self.valid_data))
+
+    def test_report_records_time(self):
+        ValidationPolicy.validate_frame(MarketData, self.valid_data)
+        report = ValidationPolicy.report()
+        self.assertEqual(list(report['Name']), ['MarketData'])
+        self.assertEqual(report['Validated'].iloc[0], 1)
+        self.assertGreater(report['Total Seconds'].iloc[0], 0)
+
+    def test_configure_exports_mode_to_environment(self):
+        ValidationPolicy.configure(mode=ValidationMode.BOUNDARY)
+        self.assertEqual(os.environ['VALIDATION_MODE'], 'boundary')
+
+    def test_unknown_environment_mode_falls_back_to_full(self):
+        with patch.dict(os.environ, {'VALIDATION_MODE': 'sampeld'}):
+            with self.assertLogs('validation', level='WARNING'):
+                self.assertEqual(_mode_from_env(), ValidationMode.FULL)
+        with patch.dict(os.environ, {'VALIDATION_MODE': ' Boundary '}):
+            self.assertEqual(_mode_from_env(), ValidationMode.BOUNDARY)
+
+    def test_sampled_counts_are_thread_safe(self):
+        ValidationPolicy.configure(mode=ValidationMode.SAMPLED, model_sample_rate=10)
+
+        def build():
+            for _ in range(1000):
+                ValidationPolicy.build_model(Action, action_type=ActionType.WAIT, price=np.float64(1), amount=np.float64(0))
+
+        threads = [threading.Thread(target=build) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        report = ValidationPolicy.report().set_index('Name')
+        self.assertEqual(report.loc['Action', 'Validated'], 400)
+        self.assertEqual(report.loc['Action', 'Skipped'], 3600)
+
+
+if __name__ == '__main__':
+    unittest.main()
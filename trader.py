@@ -1,9 +1,18 @@
 import logging
-from typing import Dict, Any, Optional
+import threading
+from collections import deque
+from concurrent.futures import Future, wait
+from typing import Deque, Dict, Any, List, Optional, Tuple
+
+import numpy as np
+from pydantic import ValidationError
 
 from exchange_apis import BaseExchangeAPI
 from definitions import MarketData, Memory
 from strategies import Strategy, ActionType
+from validation import ValidationPolicy
+from order_journal import OrderJournal
+from latency import LatencyTracker
 
 # Basic logging configuration
 logging.basicConfig(
@@ -16,8 +25,28 @@ class Trader:
     Class that acts as an orchestrator between trading strategies and exchange APIs.
     Executes actions generated by strategies, translating these actions into concrete orders.
     """
+    # Order type, side and extra parameters of each action (the price is filled in for triggers)
+    ORDER_SPECS: Dict[ActionType, Tuple[str, str, Optional[str]]] = {
+        ActionType.BUY_MARKET: ('market', 'buy', None),
+        ActionType.SELL_MARKET: ('market', 'sell', None),
+        ActionType.BUY_LIMIT: ('limit', 'buy', None),
+        ActionType.SELL_LIMIT: ('limit', 'sell', None),
+        ActionType.STOP_LOSS: ('stop_loss', 'sell', 'stopPrice'),
+        ActionType.TAKE_PROFIT: ('take_profit', 'sell', 'triggerPrice'),
+    }
+    # Acknowledgements kept for wait_for_acks; the live loop never collects them and they are
+    # already journaled, so only the most recent ones are kept
+    MAX_ORDER_ACKS = 1000
     
-    def __init__(self, strategy: Strategy, exchange_api: BaseExchangeAPI, pair: str = 'BTC/USD') -> None:
+    def __init__(
+            self,
+            strategy: Strategy,
+            exchange_api: BaseExchangeAPI,
+            pair: str = 'BTC/USD',
+            batch_orders: bool = False,
+            journal: Optional[OrderJournal] = None,
+            latency: Optional[LatencyTracker] = None
+        ) -> None:
         """
         Initializes the Trader with a strategy, an exchange API and a trading pair.
         
@@ -25,10 +54,20 @@ class Trader:
             strategy: Strategy that will generate trading actions
             exchange_api: Exchange API to execute orders
             pair: Trading pair (default 'BTC/USD')
+            batch_orders: Submit all actions of a tick together without waiting for each
+                acknowledgement (see execute_strategy)
+            journal: Journal where actions and order responses are recorded
+            latency: Tracker for the strategy and order placement spans; the shared one if None
         """
         self.strategy = strategy
         self.exchange_api = exchange_api
         self.pair = pair
+        self.batch_orders = batch_orders
+        self.journal = journal
+        self.latency = latency or LatencyTracker.shared()
+        self.pending_orders: Dict[Future, Dict[str, Any]] = {}
+        self.order_acks: Deque[Dict[str, Any]] = deque(maxlen=self.MAX_ORDER_ACKS)
+        self._acks_lock = threading.Lock()
         self.logger = logging.getLogger(f"Trader-{pair}")
 
     def execute_strategy(self, data: MarketData, memory: Memory) -> None:
@@ -36,6 +75,10 @@ class Trader:
         Executes the strategy with the provided market data and memory.
         Processes each action generated by the strategy and executes it on the exchange.
         
+        With batch_orders the valid actions of the tick are submitted together, through the
+        exchange batch endpoint when available, and their acknowledgements are tracked in
+        pending_orders instead of being awaited one by one.
+        
         Args:
             data: Market data for the strategy
             memory: Current state of memory (balances, orders, etc.)
@@ -45,36 +88,167 @@ class Trader:
         """
         try:
             self.logger.info(f"Executing strategy for {self.pair}")
-            actions = self.strategy.run(data, memory)
-            
-            for action in actions:
-                self.logger.info(f"Processing action: {action.action_type.value} - Price: {action.price} - Amount: {action.amount}")
-                
-                # Validate sufficient balance for the action
-                if action.action_type in [ActionType.BUY_MARKET, ActionType.BUY_LIMIT] and action.amount * action.price > memory.balance_b:
-                    self.logger.warning(f"Insufficient balance for buy. Required: {action.amount * action.price}, Available: {memory.balance_b}")
-                    continue
-                
-                if action.action_type in [ActionType.SELL_MARKET, ActionType.SELL_LIMIT] and action.amount > memory.balance_a:
-                    self.logger.warning(f"Insufficient balance for sell. Required: {action.amount}, Available: {memory.balance_a}")
-                    continue
-                
-                # Execute the corresponding action
-                try:
-                    match action.action_type:
-                        case ActionType.BUY_MARKET: self.buy_market(action.price, action.amount)
-                        case ActionType.SELL_MARKET: self.sell_market(action.price, action.amount)
-                        case ActionType.BUY_LIMIT: self.buy_limit(action.price, action.amount)
-                        case ActionType.SELL_LIMIT: self.sell_limit(action.price, action.amount)
-                        case ActionType.STOP_LOSS: self.set_stop_loss(action.price, action.amount)
-                        case ActionType.TAKE_PROFIT: self.set_take_profit(action.price, action.amount)
-                        case _: raise ValueError(f"Unrecognized action: {action}")
-                except Exception as e:
-                    self.logger.error(f"Error executing action {action.action_type.value}: {str(e)}")
+            with self.latency.span('strategy'):
+                actions = self.strategy.run(data, memory)
+            
+            with self.latency.span('order_placement'):
+                self._place_orders(actions, memory)
         except Exception as e:
             self.logger.error(f"Error executing strategy: {str(e)}")
             raise
 
+    def _place_orders(self, actions, memory: Memory) -> None:
+        if self.batch_orders:
+            self._submit_batch(actions, memory)
+            return
+        
+        for action in actions:
+            # Actions are about to reach the exchange, so they are checked as a boundary
+            try:
+                action = ValidationPolicy.check_model(action, boundary=True)
+            except ValidationError as e:
+                self.logger.error(f"Discarding invalid action: {str(e)}")
+                continue
+
+            self.logger.info(f"Processing action: {action.action_type.value} - Price: {action.price} - Amount: {action.amount}")
+            if self.journal:
+                self.journal.record_action(self.pair, action)
+            
+            # Validate sufficient balance for the action
+            if action.action_type in [ActionType.BUY_MARKET, ActionType.BUY_LIMIT] and action.amount * action.price > memory.balance_b:
+                self.logger.warning(f"Insufficient balance for buy. Required: {action.amount * action.price}, Available: {memory.balance_b}")
+                continue
+            
+            if action.action_type in [ActionType.SELL_MARKET, ActionType.SELL_LIMIT] and action.amount > memory.balance_a:
+                self.logger.warning(f"Insufficient balance for sell. Required: {action.amount}, Available: {memory.balance_a}")
+                continue
+            
+            # Execute the corresponding action
+            try:
+                match action.action_type:
+                    case ActionType.BUY_MARKET: result = self.buy_market(action.price, action.amount)
+                    case ActionType.SELL_MARKET: result = self.sell_market(action.price, action.amount)
+                    case ActionType.BUY_LIMIT: result = self.buy_limit(action.price, action.amount)
+                    case ActionType.SELL_LIMIT: result = self.sell_limit(action.price, action.amount)
+                    case ActionType.STOP_LOSS: result = self.set_stop_loss(action.price, action.amount)
+                    case ActionType.TAKE_PROFIT: result = self.set_take_profit(action.price, action.amount)
+                    case _: raise ValueError(f"Unrecognized action: {action}")
+                if self.journal:
+                    self.journal.record_order(self.pair, result)
+            except Exception as e:
+                self.logger.error(f"Error executing action {action.action_type.value}: {str(e)}")
+
+    def wait_for_acks(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Waits for the acknowledgements of the orders submitted in batch mode.
+        
+        Args:
+            timeout: Maximum seconds to wait, or None to wait for all of them
+            
+        Returns:
+            Exchange responses of the orders acknowledged since the last call (at most
+            MAX_ORDER_ACKS of the most recent ones); failed orders are logged and skipped
+        """
+        with self._acks_lock:
+            pending = list(self.pending_orders)
+        wait(pending, timeout=timeout)
+        with self._acks_lock:
+            acks = list(self.order_acks)
+            self.order_acks.clear()
+        return acks
+
+    def _submit_batch(self, actions, memory: Memory) -> List[Future]:
+        """
+        Validates the actions of a tick and submits them as one batch.
+        
+        Balances are checked against the cumulative amounts of the batch, since all of its
+        orders reach the exchange before any of them is acknowledged.
+        
+        Args:
+            actions: Actions generated by the strategy
+            memory: Current state of memory (balances, orders, etc.)
+            
+        Returns:
+            One future per submitted order
+        """
+        available_a, available_b = memory.balance_a, memory.balance_b
+        orders = []
+        for action in actions:
+            try:
+                action = ValidationPolicy.check_model(action, boundary=True)
+            except ValidationError as e:
+                self.logger.error(f"Discarding invalid action: {str(e)}")
+                continue
+            
+            if self.journal:
+                self.journal.record_action(self.pair, action)
+            
+            if action.action_type not in self.ORDER_SPECS:
+                if action.action_type != ActionType.WAIT:
+                    self.logger.error(f"Unrecognized action: {action}")
+                continue
+            
+            if action.action_type in [ActionType.BUY_MARKET, ActionType.BUY_LIMIT]:
+                if action.amount * action.price > available_b:
+                    self.logger.warning(f"Insufficient balance for buy. Required: {action.amount * action.price}, Available: {available_b}")
+                    continue
+                available_b -= action.amount * action.price
+            elif action.action_type in [ActionType.SELL_MARKET, ActionType.SELL_LIMIT]:
+                if action.amount > available_a:
+                    self.logger.warning(f"Insufficient balance for sell. Required: {action.amount}, Available: {available_a}")
+                    continue
+                available_a -= action.amount
+            
+            order_type, side, trigger_param = self.ORDER_SPECS[action.action_type]
+            orders.append({
+                'symbol': self.pair,
+                'type': order_type,
+                'side': side,
+                'amount': action.amount,
+                'price': action.price,
+                'params': {trigger_param: action.price} if trigger_param else {}
+            })
+        
+        if not orders:
+            return []
+        self.logger.info(f"Submitting {len(orders)} orders in batch")
+        futures = self.exchange_api.submit_orders(orders)
+        for future, order in zip(futures, orders):
+            with self._acks_lock:
+                self.pending_orders[future] = order
+            future.add_done_callback(self._on_order_ack)
+        return futures
+
+    def _on_order_ack(self, future: Future) -> None:
+        error = future.exception()
+        with self._acks_lock:
+            order = self.pending_orders.pop(future, {})
+            if error is None:
+                self.order_acks.append(future.result())
+        if error is not None:
+            self.logger.error(f"Error executing {order.get('side')} {order.get('type')} order: {str(error)}")
+        else:
+            self.logger.info(f"{order.get('side')} {order.get('type')} order acknowledged: {future.result().get('id', 'N/A')}")
+            if self.journal:
+                self.journal.record_order(self.pair, future.result())
+
+    def load_memory(self, limit: int = 200) -> Memory:
+        """
+        Builds the strategy memory from the current balances and the journaled fills.
+        
+        Args:
+            limit: Number of recent fills to load as orders
+            
+        Returns:
+            Memory with the current balances and, if there is a journal, the recent fills
+        """
+        base, quote = self.pair.split('/')
+        balance_a = self.exchange_api.get_account_balance(base)
+        balance_b = self.exchange_api.get_account_balance(quote)
+        if self.journal:
+            return self.journal.load_memory(self.pair, balance_a, balance_b, limit=limit)
+        return Memory(orders=[], balance_a=np.float64(balance_a), balance_b=np.float64(balance_b))
+
     def buy_market(self, price: float, amount: float) -> Dict[str, Any]:
         """
         Executes a market buy order.
@@ -0,0 +1,227 @@
+"""
+Validation policy module.
+
+This module centralizes how much pandera and pydantic validation is performed on the hot paths
+of the system (data loading, backtesting and live trading). A single global policy decides, for
+every DataFrame schema check and every model construction, whether the check runs in full, on a
+sample of rows, only at system boundaries or not at all. The time spent validating is recorded so
+its cost can be reported.
+
+Modes:
+1. FULL: every frame and every model is validated (default, used by the tests)
+2. SAMPLED: frames are validated on a sample of rows, models on one of every N constructions
+3. BOUNDARY: only data entering the system is validated (loaded samples, exchange input,
+   actions before they reach the exchange); internal per-bar objects are not
+4. OFF: no validation at all
+
+The mode can be set with the VALIDATION_MODE environment variable, which is also how
+worker processes spawned by parameter sweeps inherit it. An unknown value logs a warning and
+falls back to FULL instead of failing the import.
+"""
+
+import os
+import logging
+import threading
+from time import perf_counter
+from enum import Enum
+from typing import Any, Dict, Optional, Type, TypeVar
+
+import pandas as pd
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
+
+
+class ValidationMode(Enum):
+    """Amount of validation performed on hot paths."""
+    FULL = 'full'
+    SAMPLED = 'sampled'
+    BOUNDARY = 'boundary'
+    OFF = 'off'
+
+
+def _mode_from_env() -> ValidationMode:
+    """Read the mode from VALIDATION_MODE, falling back to FULL on an unknown value."""
+    value = os.getenv('VALIDATION_MODE', ValidationMode.FULL.value)
+    try:
+        return ValidationMode(value.strip().lower())
+    except ValueError:
+        logger.warning(f"Unknown VALIDATION_MODE {value!r}, falling back to {ValidationMode.FULL.value}")
+        return ValidationMode.FULL
+
+
+class ValidationPolicy:
+    """
+    Global validation policy shared by DataManager, Backtester and Trader.
+
+    All methods are class methods acting on process-wide state, so the policy only has to be
+    configured once at the start of a script.
+
+    Attributes:
+        mode: Current validation mode
+        sample_rows: Number of rows checked per frame in SAMPLED mode
+        model_sample_rate: In SAMPLED mode, one of every model_sample_rate models is validated
+    """
+    mode: ValidationMode = _mode_from_env()
+    sample_rows: int = 1000
+    model_sample_rate: int = 100
+
+    _model_counter: int = 0
+    _stats: Dict[str, Dict[str, float]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(
+        cls,
+        mode: Optional[ValidationMode] = None,
+        sample_rows: Optional[int] = None,
+        model_sample_rate: Optional[int] = None
+    ) -> None:
+        """
+        Change the global validation policy.
+
+        Args:
+            mode: New validation mode, also exported to VALIDATION_MODE for child processes
+            sample_rows: Number of rows checked per frame in SAMPLED mode
+            model_sample_rate: Validate one of every N models in SAMPLED mode
+        """
+        if mode is not None:
+            cls.mode = ValidationMode(mode)
+            os.environ['VALIDATION_MODE'] = cls.mode.value
+        if sample_rows is not None:
+            cls.sample_rows = sample_rows
+        if model_sample_rate is not None:
+            cls.model_sample_rate = max(1, model_sample_rate)
+        logger.info(f"Validation policy set to {cls.mode.value} (sample_rows={cls.sample_rows}, model_sample_rate={cls.model_sample_rate})")
+
+    @classmethod
+    def validate_frame(cls, schema, df: pd.DataFrame, boundary: bool = False) -> pd.DataFrame:
+        """
+        Validate a DataFrame against a pandera schema according to the policy.
+
+        Args:
+            schema: pandera DataFrameModel to validate against
+            df: DataFrame to validate
+            boundary: Whether the frame is entering the system (always checked in BOUNDARY mode)
+
+        Returns:
+            The validated frame, or the frame unchanged if validation was skipped
+
+        Raises:
+            SchemaError: If the checked rows do not conform to the schema
+        """
+        if not cls._should_validate(boundary, sampled=True):
+            cls._record(schema.__name__, skipped=True)
+            return df
+
+        start = perf_counter()
+        try:
+            if cls.mode == ValidationMode.SAMPLED and not boundary and len(df) > cls.sample_rows:
+                edge_rows = cls.sample_rows // 4
+                return schema.validate(
+                    df,
+                    head=edge_rows,
+                    tail=edge_rows,
+                    sample=cls.sample_rows - 2 * edge_rows,
+                    random_state=0
+                )
+            return schema.validate(df)
+        finally:
+            cls._record(schema.__name__, elapsed=perf_counter() - start)
+
+    @classmethod
+    def build_model(cls, model_cls: Type[ModelT], boundary: bool = False, **fields: Any) -> ModelT:
+        """
+        Construct a pydantic model, validating it only if the policy requires it.
+
+        Args:
+            model_cls: pydantic model class to build
+            boundary: Whether the object is crossing a system boundary
+            **fields: Field values for the model
+
+        Returns:
+            The model instance, built with model_construct when validation is skipped
+        """
+        if not cls._should_validate(boundary):
+            cls._record(model_cls.__name__, skipped=True)
+            return model_cls.model_construct(**fields)
+
+        start = perf_counter()
+        try:
+            return model_cls(**fields)
+        finally:
+            cls._record(model_cls.__name__, elapsed=perf_counter() - start)
+
+    @classmethod
+    def check_model(cls, instance: ModelT, boundary: bool = True) -> ModelT:
+        """
+        Validate an already built model, e.g. one created with validation skipped.
+
+        Args:
+            instance: Model instance to check
+            boundary: Whether the object is crossing a system boundary
+
+        Returns:
+            A validated copy of the instance, or the instance itself if the check was skipped
+        """
+        return cls.build_model(type(instance), boundary=boundary, **dict(instance))
+
+    @classmethod
+    def report(cls) -> pd.DataFrame:
+        """
+        Report how much time has been spent validating, per schema or model.
+
+        Returns:
+            DataFrame with validated/skipped counts and total and mean time per name
+        """
+        with cls._lock:
+            stats_by_name = {name: dict(stats) for name, stats in cls._stats.items()}
+        rows = [
+            {
+                'Name': name,
+                'Validated': int(stats['validated']),
+                'Skipped': int(stats['skipped']),
+                'Total Seconds': stats['seconds'],
+                'Mean Milliseconds': 1000 * stats['seconds'] / stats['validated'] if stats['validated'] else 0.0
+            }
+            for name, stats in stats_by_name.items()
+        ]
+        return pd.DataFrame(rows, columns=['Name', 'Validated', 'Skipped', 'Total Seconds', 'Mean Milliseconds'])
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        """Clear the recorded validation timings."""
+        with cls._lock:
+            cls._stats = {}
+            cls._model_counter = 0
+
+    @classmethod
+    def _should_validate(cls, boundary: bool, sampled: bool = False) -> bool:
+        if cls.mode == ValidationMode.FULL:
+            return True
+        if cls.mode == ValidationMode.OFF:
+            return False
+        if boundary:
+            return True
+        if cls.mode == ValidationMode.BOUNDARY:
+            return False
+        # SAMPLED: frames are always checked (on a sample of rows), models one in N
+        if sampled:
+            return True
+        with cls._lock:
+            cls._model_counter += 1
+            return cls._model_counter % cls.model_sample_rate == 0
+
+    @classmethod
+    def _record(cls, name: str, elapsed: float = 0.0, skipped: bool = False) -> None:
+        with cls._lock:
+            stats = cls._stats.get(name)
+            if stats is None:
+                stats = cls._stats[name] = {'validated': 0, 'skipped': 0, 'seconds': 0.0}
+            if skipped:
+                stats['skipped'] += 1
+            else:
+                stats['validated'] += 1
+                stats['seconds'] += elapsed